@@ -21,9 +21,10 @@ import shutil
 import time
 import typing
 import uuid
-from collections import Iterable
+import weakref
+from collections import Iterable, OrderedDict
 from concurrent.futures import ProcessPoolExecutor as Executor
-from contextlib import ExitStack
+from contextlib import ExitStack, contextmanager
 from functools import partial
 from heapq import heapify, heappop, heapreplace
 from operator import is_not
@@ -54,6 +55,9 @@ class Table(object):
         self._name = name
         self._partitions = partitions
         self._session = session
+        # pending narrow operations, table is materialized only if plan is None
+        self._plan: typing.Optional[_NarrowPlan] = None
+        self._destroyed = False
 
     @property
     def partitions(self):
@@ -78,6 +82,14 @@ class Table(object):
         return self.__str__()
 
     def destroy(self):
+        if self._plan is not None:
+            # nothing written yet, lazy tables planned on this one now fuse its ops from further up
+            self._plan = None
+            self._destroyed = True
+            return
+
+        self._persist_dependents()
+
         for p in range(self._partitions):
             with self._get_env_for_partition(p, write=True) as env:
                 db = env.open_db()
@@ -122,6 +134,7 @@ class Table(object):
                     _, _, _, it = heappop(entries)
 
     def reduce(self, func):
+        self.persist()
         # noinspection PyProtectedMember
         rs = self._session._submit_unary(
             func, _do_reduce, self._partitions, self._name, self._namespace
@@ -138,7 +151,7 @@ class Table(object):
         return self._unary(func, _do_map)
 
     def mapValues(self, func):
-        return self._unary(func, _do_map_values)
+        return self._narrow(_MAP_VALUES, func)
 
     def flatMap(self, func):
         _flat_mapped = self._unary(func, _do_flat_map)
@@ -201,7 +214,7 @@ class Table(object):
         return self._unary((fraction, seed), _do_sample)
 
     def filter(self, func):
-        return self._unary(func, _do_filter)
+        return self._narrow(_FILTER, func)
 
     def join(self, other: "Table", func):
         return self._binary(other, func, _do_join)
@@ -213,8 +226,74 @@ class Table(object):
     def union(self, other: "Table", func=lambda v1, v2: v1):
         return self._binary(other, func, _do_union)
 
+    def persist(self):
+        """
+        materialize pending mapValues/filter operations in one pass over the source partitions
+        """
+        if self._plan is None:
+            return self
+        plan = self._plan
+        source, ops = plan.source, plan.ops
+        # a lazy table this one was derived from may still be observed, materialize it first and
+        # continue from its data, so that nondeterministic ops are run only once for both of them
+        for ancestor_ref, num_ops in reversed(plan.ancestors):
+            ancestor = ancestor_ref()
+            if ancestor is not None and not ancestor._destroyed:
+                source, ops = ancestor.persist(), plan.ops[num_ops:]
+                break
+        # noinspection PyProtectedMember
+        self._session._submit_unary(
+            ops,
+            _do_narrow_ops,
+            self._partitions,
+            source.name,
+            source.namespace,
+            function_id=self._name,
+        )
+        _put_to_meta_table(f"{self._namespace}.{self._name}", self._partitions)
+        self._plan = None
+        for upstream in [plan.source] + [ancestor_ref() for ancestor_ref, _ in plan.ancestors]:
+            dependents = _lazy_dependents.get(upstream) if upstream is not None else None
+            if dependents is not None:
+                dependents.discard(self)
+        return self
+
+    def _persist_dependents(self):
+        # lazy tables planned on this one should see its data before being modified or destroyed
+        for dependent in list(_lazy_dependents.pop(self, ())):
+            dependent.persist()
+
+    def _narrow(self, op, func):
+        """
+        record a key-preserving per-partition operation lazily, consecutive ones are fused into a single pass
+        which is done at first action on the result table, such as count, collect, join or save_as.
+        func is pickled here so that later changes to objects it refers to don't affect the result.
+        """
+        function_bytes = f_pickle.dumps(func)
+        op = (op, function_bytes)
+        if self._plan is None:
+            plan = _NarrowPlan(self, [op])
+        else:
+            plan = _NarrowPlan(
+                self._plan.source,
+                self._plan.ops + [op],
+                self._plan.ancestors + [(weakref.ref(self), len(self._plan.ops))],
+            )
+        table = Table(
+            session=self._session,
+            namespace=self._session.session_id,
+            name=str(uuid.uuid1()),
+            partitions=self._partitions,
+        )
+        table._plan = plan
+        for upstream in [plan.source] + [ancestor_ref() for ancestor_ref, _ in plan.ancestors]:
+            if upstream is not None:
+                _lazy_dependents.setdefault(upstream, weakref.WeakSet()).add(table)
+        return table
+
     # noinspection PyProtectedMember
     def _map_reduce(self, mapper, reducer):
+        self.persist()
         results = self._session._submit_map_reduce(
             mapper, reducer, self._partitions, self._name, self._namespace
         )
@@ -228,6 +307,7 @@ class Table(object):
         )
 
     def _unary(self, func, do_func):
+        self.persist()
         # noinspection PyProtectedMember
         results = self._session._submit_unary(
             func, do_func, self._partitions, self._name, self._namespace
@@ -242,6 +322,8 @@ class Table(object):
         )
 
     def _binary(self, other: "Table", func, do_func):
+        self.persist()
+        other.persist()
         session_id = self._session.session_id
         left, right = self, other
         if left._partitions != right._partitions:
@@ -282,9 +364,11 @@ class Table(object):
         return dup
 
     def _get_env_for_partition(self, p: int, write=False):
+        self.persist()
         return _get_env(self._namespace, self._name, str(p), write=write)
 
     def put(self, k, v):
+        self._persist_dependents()
         k_bytes, v_bytes = _kv_to_bytes(k=k, v=v)
         p = _hash_key_to_partition(k_bytes, self._partitions)
         with self._get_env_for_partition(p, write=True) as env:
@@ -292,6 +376,7 @@ class Table(object):
                 return txn.put(k_bytes, v_bytes)
 
     def put_all(self, kv_list: Iterable):
+        self._persist_dependents()
         txn_map = {}
         is_success = True
         with ExitStack() as s:
@@ -321,6 +406,7 @@ class Table(object):
                 )
 
     def delete(self, k):
+        self._persist_dependents()
         k_bytes = _k_to_bytes(k=k)
         p = _hash_key_to_partition(k_bytes, self._partitions)
         with self._get_env_for_partition(p, write=True) as env:
@@ -391,10 +477,10 @@ class Session(object):
     def kill(self):
         self._pool.shutdown()
 
-    def _submit_unary(self, func, _do_func, partitions, name, namespace):
+    def _submit_unary(self, func, _do_func, partitions, name, namespace, function_id=None):
         task_info = _TaskInfo(
             self.session_id,
-            function_id=str(uuid.uuid1()),
+            function_id=str(uuid.uuid1()) if function_id is None else function_id,
             function_bytes=f_pickle.dumps(func),
         )
         futures = []
@@ -596,6 +682,9 @@ class Federation(object):
 
 _meta_table: typing.Optional[Table] = None
 
+# source table -> lazy tables planned on it, materialized before the source is destroyed
+_lazy_dependents: "weakref.WeakKeyDictionary[Table, weakref.WeakSet]" = weakref.WeakKeyDictionary()
+
 _SESSION = Session(uuid.uuid1().hex)
 
 
@@ -719,6 +808,18 @@ class _MapReduceTaskInfo:
         return f_pickle.loads(self.reduce_function_bytes)
 
 
+_MAP_VALUES = "mapValues"
+_FILTER = "filter"
+
+
+class _NarrowPlan:
+    def __init__(self, source: Table, ops: list, ancestors: list = None):
+        self.source = source
+        self.ops = ops
+        # (weakref to lazy table, number of ops it applies) for each lazy table in between source and this one
+        self.ancestors = [] if ancestors is None else ancestors
+
+
 class _Operand:
     def __init__(self, namespace, name, partition):
         self.namespace = namespace
@@ -726,7 +827,8 @@ class _Operand:
         self.partition = partition
 
     def as_env(self, write=False):
-        return _get_env(self.namespace, self.name, str(self.partition), write=write)
+        # operands are only accessed in worker processes
+        return _get_worker_env(self.namespace, self.name, str(self.partition))
 
 
 class _UnaryProcess:
@@ -803,6 +905,63 @@ def _open_env(path, write=False):
     raise lmdb.Error(f"No such file or directory: {path}, with {t} times retry")
 
 
+# lmdb environments opened by a worker process are kept for its later tasks instead of being reopened by each one.
+# they are opened with lock, so that reading and writing tasks share one environment per path in a process
+_WORKER_ENV_CACHE_SIZE = 64
+# path -> [env, identity of data file, number of tasks using it]
+_worker_envs = OrderedDict()
+
+
+def _get_worker_env(*args):
+    return _cached_env(_get_storage_dir(*args))
+
+
+def _data_file_identity(path):
+    try:
+        stat = path.joinpath("data.mdb").stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_dev, stat.st_ino
+
+
+def _close_worker_env(key):
+    env, _, _ = _worker_envs.pop(key)
+    env.close()
+
+
+@contextmanager
+def _cached_env(path):
+    """
+    an environment is reopened if its data file is removed or replaced, e.g. the table is destroyed and created again.
+    environments in use are never closed, the least recently used idle ones are closed to open new ones beyond cache size
+    """
+    key = path.as_posix()
+    identity = _data_file_identity(path)
+    entry = _worker_envs.get(key)
+    if entry is not None and (identity is None or entry[1] != identity):
+        if entry[2] > 0:
+            raise lmdb.Error(f"{path} replaced while in use")
+        _close_worker_env(key)
+        entry = None
+    if entry is None:
+        # drop idle environments of removed tables, which keep their disk space while open
+        for stale in [k for k, (_, ident, used) in _worker_envs.items()
+                      if used == 0 and _data_file_identity(Path(k)) != ident]:
+            _close_worker_env(stale)
+        idle = [k for k, (_, _, used) in _worker_envs.items() if used == 0]
+        for k in idle[:max(len(_worker_envs) + 1 - _WORKER_ENV_CACHE_SIZE, 0)]:
+            _close_worker_env(k)
+        env = _open_env(path, write=True)
+        entry = [env, _data_file_identity(path), 0]
+        _worker_envs[key] = entry
+    _worker_envs.move_to_end(key)
+    entry[2] += 1
+    try:
+        yield entry[0]
+    finally:
+        entry[2] -= 1
+
+
 def _hash_key_to_partition(key, partitions):
     _key = hashlib.sha1(key).digest()
     if isinstance(_key, bytes):
@@ -829,14 +988,15 @@ def _do_map(p: _UnaryProcess):
         txn_map = {}
         for partition in range(partitions):
             env = s.enter_context(
-                _get_env(rtn.namespace, rtn.name, str(partition), write=True)
+                _get_worker_env(rtn.namespace, rtn.name, str(partition))
             )
             txn_map[partition] = s.enter_context(env.begin(write=True))
         source_txn = s.enter_context(source_env.begin())
         cursor = s.enter_context(source_txn.cursor())
+        func = p.get_func()
         for k_bytes, v_bytes in cursor:
             k, v = deserialize(k_bytes), deserialize(v_bytes)
-            k1, v1 = p.get_func()(k, v)
+            k1, v1 = func(k, v)
             k1_bytes, v1_bytes = serialize(k1), serialize(v1)
             partition = _hash_key_to_partition(k1_bytes, partitions)
             txn_map[partition].put(k1_bytes, v1_bytes)
@@ -894,7 +1054,7 @@ def _do_map_reduce_in_partitions(p: _MapReduceProcess):
         txn_map = {}
         for partition in range(partitions):
             env = s.enter_context(
-                _get_env(rtn.namespace, rtn.name, str(partition), write=True)
+                _get_worker_env(rtn.namespace, rtn.name, str(partition))
             )
             txn_map[partition] = s.enter_context(env.begin(write=True))
         source_txn = s.enter_context(source_env.begin())
@@ -918,8 +1078,11 @@ def _do_map_reduce_in_partitions(p: _MapReduceProcess):
     return rtn
 
 
-def _do_map_values(p: _UnaryProcess):
+def _do_narrow_ops(p: _UnaryProcess):
     rtn = p.output_operand()
+    ops = [(op, f_pickle.loads(function_bytes)) for op, function_bytes in p.get_func()]
+    need_key = any(op == _FILTER for op, _ in ops)
+    value_changed = any(op == _MAP_VALUES for op, _ in ops)
     with ExitStack() as s:
         source_env = s.enter_context(p.operand.as_env())
         dst_env = s.enter_context(rtn.as_env(write=True))
@@ -929,9 +1092,15 @@ def _do_map_values(p: _UnaryProcess):
 
         cursor = s.enter_context(source_txn.cursor())
         for k_bytes, v_bytes in cursor:
+            k = deserialize(k_bytes) if need_key else None
             v = deserialize(v_bytes)
-            v1 = p.get_func()(v)
-            dst_txn.put(k_bytes, serialize(v1))
+            for op, func in ops:
+                if op == _MAP_VALUES:
+                    v = func(v)
+                elif not func(k, v):
+                    break
+            else:
+                dst_txn.put(k_bytes, serialize(v) if value_changed else v_bytes)
     return rtn
 
 
@@ -945,10 +1114,11 @@ def _do_flat_map(p: _UnaryProcess):
         dst_txn = s.enter_context(dst_env.begin(write=True))
 
         cursor = s.enter_context(source_txn.cursor())
+        func = p.get_func()
         for k_bytes, v_bytes in cursor:
             k = deserialize(k_bytes)
             v = deserialize(v_bytes)
-            map_result = p.get_func()(k, v)
+            map_result = func(k, v)
             for result_k, result_v in map_result:
                 dst_txn.put(serialize(result_k), serialize(result_v))
     return rtn
@@ -960,12 +1130,13 @@ def _do_reduce(p: _UnaryProcess):
         source_env = s.enter_context(p.operand.as_env())
         source_txn = s.enter_context(source_env.begin())
         cursor = s.enter_context(source_txn.cursor())
+        func = p.get_func()
         for k_bytes, v_bytes in cursor:
             v = deserialize(v_bytes)
             if value is None:
                 value = v
             else:
-                value = p.get_func()(value, v)
+                value = func(value, v)
     return value
 
 
@@ -1009,24 +1180,6 @@ def _do_sample(p: _UnaryProcess):
     return rtn
 
 
-def _do_filter(p: _UnaryProcess):
-    rtn = p.output_operand()
-    with ExitStack() as s:
-        source_env = s.enter_context(p.operand.as_env())
-        dst_env = s.enter_context(rtn.as_env(write=True))
-
-        source_txn = s.enter_context(source_env.begin())
-        dst_txn = s.enter_context(dst_env.begin(write=True))
-
-        cursor = s.enter_context(source_txn.cursor())
-        for k_bytes, v_bytes in cursor:
-            k = c_pickle.loads(k_bytes)
-            v = c_pickle.loads(v_bytes)
-            if p.get_func()(k, v):
-                dst_txn.put(k_bytes, v_bytes)
-    return rtn
-
-
 def _do_subtract_by_key(p: _BinaryProcess):
     rtn = p.output_operand()
     with ExitStack() as s:
@@ -1060,13 +1213,14 @@ def _do_join(p: _BinaryProcess):
         dst_txn = s.enter_context(dst_env.begin(write=True))
 
         cursor = s.enter_context(left_txn.cursor())
+        func = p.get_func()
         for k_bytes, v1_bytes in cursor:
             v2_bytes = right_txn.get(k_bytes)
             if v2_bytes is None:
                 continue
             v1 = deserialize(v1_bytes)
             v2 = deserialize(v2_bytes)
-            v3 = p.get_func()(v1, v2)
+            v3 = func(v1, v2)
             dst_txn.put(k_bytes, serialize(v3))
     return rtn
 
@@ -1082,6 +1236,7 @@ def _do_union(p: _BinaryProcess):
         right_txn = s.enter_context(right_env.begin())
         dst_txn = s.enter_context(dst_env.begin(write=True))
 
+        func = p.get_func()
         # process left op
         with left_txn.cursor() as left_cursor:
             for k_bytes, left_v_bytes in left_cursor:
@@ -1091,7 +1246,7 @@ def _do_union(p: _BinaryProcess):
                 else:
                     left_v = deserialize(left_v_bytes)
                     right_v = deserialize(right_v_bytes)
-                    final_v = p.get_func()(left_v, right_v)
+                    final_v = func(left_v, right_v)
                     dst_txn.put(k_bytes, serialize(final_v))
 
         # process right op
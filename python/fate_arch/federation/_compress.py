@@ -0,0 +1,145 @@
+#
+#  Copyright 2019 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+
+import pickle
+import typing
+import zlib
+
+# payloads smaller than this are sent as is, compression rarely pays off for them
+DEFAULT_COMPRESS_THRESHOLD = 64 * 1024
+
+
+def _zlib_codec():
+    return lambda data, level: zlib.compress(data, 6 if level is None else level), zlib.decompress
+
+
+def _lz4_codec():
+    import lz4.frame
+
+    def _compress(data, level):
+        return lz4.frame.compress(data, compression_level=0 if level is None else level)
+
+    return _compress, lz4.frame.decompress
+
+
+def _zstd_codec():
+    import zstandard
+
+    def _compress(data, level):
+        return zstandard.ZstdCompressor(level=3 if level is None else level).compress(data)
+
+    def _decompress(data):
+        return zstandard.ZstdDecompressor().decompress(data)
+
+    return _compress, _decompress
+
+
+_CODEC_LOADERS = {
+    "zlib": _zlib_codec,
+    "lz4": _lz4_codec,
+    "zstd": _zstd_codec,
+}
+_codecs = {}
+
+
+def _get_codec(name):
+    if name not in _codecs:
+        if name not in _CODEC_LOADERS:
+            raise ValueError(f"compress codec {name} not supported, should be one of {list(_CODEC_LOADERS)}")
+        try:
+            _codecs[name] = _CODEC_LOADERS[name]()
+        except ImportError as e:
+            raise ValueError(f"compress codec {name} is not available: {e}")
+    return _codecs[name]
+
+
+def decompress(codec, data: bytes) -> bytes:
+    """
+    decode payload encoded by `Compressor.compress`, `codec` None means the payload is raw
+    """
+    if not codec:
+        return data
+    return _get_codec(codec)[1](data)
+
+
+class Compressor(object):
+    """
+    per-message codec used by federation engines when remote objects and table batches
+
+    A payload is compressed only if it's not smaller than `threshold` bytes and the compressed one is
+    actually smaller, and the codec name travels with the message, so receivers need no configuration.
+    """
+
+    def __init__(self, codec: typing.Optional[str] = None, threshold: int = DEFAULT_COMPRESS_THRESHOLD,
+                 level: typing.Optional[int] = None):
+        if codec is not None:
+            # fail fast on unknown or not installed codec
+            _get_codec(codec)
+        self._codec = codec
+        self._threshold = threshold
+        self._level = level
+
+    @staticmethod
+    def from_conf(run_conf: typing.Optional[dict]) -> "Compressor":
+        """
+        build from engine runtime conf, such as `rabbitmq_run`, with keys:
+            compress_codec: one of zlib, lz4, zstd, default None means no compression
+            compress_threshold: minimum payload size in bytes to compress
+            compress_level: codec specific compression level
+        """
+        run_conf = run_conf or {}
+        return Compressor(codec=run_conf.get("compress_codec"),
+                          threshold=run_conf.get("compress_threshold", DEFAULT_COMPRESS_THRESHOLD),
+                          level=run_conf.get("compress_level"))
+
+    @property
+    def enabled(self):
+        return self._codec is not None
+
+    def compress(self, data: bytes) -> typing.Tuple[typing.Optional[str], bytes]:
+        """
+        returns (codec, payload), codec is None if payload is left uncompressed
+        """
+        if self._codec is None or len(data) < self._threshold:
+            return None, data
+        compressed = _get_codec(self._codec)[0](data, self._level)
+        if len(compressed) >= len(data):
+            return None, data
+        return self._codec, compressed
+
+    def wrap(self, obj):
+        """
+        wrap a python object for transports which pickle objects themselves
+        """
+        if self._codec is None:
+            return obj
+        codec, payload = self.compress(pickle.dumps(obj, protocol=4))
+        if codec is None:
+            return obj
+        return CompressedObject(codec, payload)
+
+
+class CompressedObject(object):
+    def __init__(self, codec, payload):
+        self._codec = codec
+        self._payload = payload
+
+    def unwrap(self):
+        return pickle.loads(decompress(self._codec, self._payload))
+
+
+def is_compressed_obj(obj):
+    return isinstance(obj, CompressedObject)
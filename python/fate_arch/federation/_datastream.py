@@ -0,0 +1,62 @@
+#
+#  Copyright 2019 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+
+import io
+import struct
+from pickle import loads as p_loads
+
+
+# BinaryDatastream is a wraper of BytesIO, it receives pickled kv pairs and frames them with length prefixes:
+# [len(k)][len(v)][k][v][len(k)][len(v)][k][v]...
+class BinaryDatastream(object):
+    _header = struct.Struct(">II")
+
+    def __init__(self):
+        self._bytes = io.BytesIO()
+
+    def get_size(self):
+        return self._bytes.tell()
+
+    def get_data(self):
+        return self._bytes.getvalue()
+
+    @classmethod
+    def record_size(cls, k_bytes, v_bytes):
+        return cls._header.size + len(k_bytes) + len(v_bytes)
+
+    def append(self, k_bytes, v_bytes):
+        self._bytes.write(self._header.pack(len(k_bytes), len(v_bytes)))
+        self._bytes.write(k_bytes)
+        self._bytes.write(v_bytes)
+
+    def clear(self):
+        self._bytes.close()
+        self.__init__()
+
+    @classmethod
+    def load(cls, data):
+        kvs = []
+        view = memoryview(data)
+        offset = 0
+        while offset < len(view):
+            k_len, v_len = cls._header.unpack_from(view, offset)
+            offset += cls._header.size
+            k = p_loads(view[offset: offset + k_len])
+            offset += k_len
+            v = p_loads(view[offset: offset + v_len])
+            offset += v_len
+            kvs.append((k, v))
+        return kvs
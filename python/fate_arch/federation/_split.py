@@ -19,6 +19,8 @@ import pickle
 
 import typing
 
+from fate_arch.federation._compress import decompress
+
 __FATE_BIG_OBJ_MAX_PART_SIZE = "__fate_big_obj_max_part_size"
 
 
@@ -50,32 +52,115 @@ def _attr_injected_meta_class(**attrs):
     return _AttrInjected
 
 
-def _get_splits(obj) -> typing.Tuple[typing.Any, typing.Iterable]:
-    obj_bytes = pickle.dumps(obj, protocol=4)
-    byte_size = len(obj_bytes)
-    num_slice = (byte_size - 1) // getattr(obj, __FATE_BIG_OBJ_MAX_PART_SIZE) + 1
+def _get_splits(obj, compressor=None, out_of_band=False) -> typing.Tuple[typing.Any, typing.Iterable]:
+    buffers, codec = _dumps(obj, compressor, out_of_band)
+    byte_size = sum(len(buf) for buf in buffers)
+    _max_size = getattr(obj, __FATE_BIG_OBJ_MAX_PART_SIZE)
+    num_slice = (byte_size - 1) // _max_size + 1
     if num_slice <= 1:
         return obj, ()
     else:
-        head = _SplitHead(num_slice)
-        _max_size = getattr(obj, __FATE_BIG_OBJ_MAX_PART_SIZE)
-        kv = [(i, obj_bytes[slice(i * _max_size, (i + 1) * _max_size)]) for i in range(num_slice)]
-        return head, kv
+        head = _SplitHead(num_slice, codec, [len(buf) for buf in buffers])
+        return head, enumerate(_iter_parts(buffers, _max_size))
+
+
+def _dumps(obj, compressor=None, out_of_band=False):
+    """
+    pickle obj into a list of buffers: the pickle stream followed by out-of-band buffers (protocol 5)
+    if `out_of_band` is enabled, so that large contiguous data such as numpy arrays are sliced in place
+    rather than copied into the stream.
+    Receivers of previous version could only read one protocol 4 stream, which is the default.
+    """
+    if compressor is not None and compressor.enabled:
+        codec, obj_bytes = compressor.compress(pickle.dumps(obj, protocol=4))
+        return [memoryview(obj_bytes)], codec
+
+    if not out_of_band or pickle.HIGHEST_PROTOCOL < 5:
+        return [memoryview(pickle.dumps(obj, protocol=4))], None
+
+    out_of_band = []
+    stream = pickle.dumps(obj, protocol=5, buffer_callback=out_of_band.append)
+    return [memoryview(stream)] + [buf.raw() for buf in out_of_band], None
+
+
+def _iter_parts(buffers, max_size):
+    """
+    lazily cut the concatenation of buffers into parts of `max_size` bytes,
+    only the part being yielded is copied
+    """
+    part = bytearray()
+    for buf in buffers:
+        offset = 0
+        while offset < len(buf):
+            n = min(max_size - len(part), len(buf) - offset)
+            part += buf[offset: offset + n]
+            offset += n
+            if len(part) == max_size:
+                yield bytes(part)
+                part = bytearray()
+    if part:
+        yield bytes(part)
 
 
 def _is_split_head(obj):
     return isinstance(obj, _SplitHead)
 
 
-def _split_get(splits):
-    obj_bytes = b''.join(splits)
-    obj = pickle.loads(obj_bytes)
-    return obj
+class _SplitAssembler(object):
+    """
+    reassemble parts received into a preallocated buffer, parts could be dropped as soon as they are appended
+    """
+
+    def __init__(self, head):
+        self._codec = head.codec()
+        self._sizes = head.sizes()
+        if self._sizes is None:
+            # head sent by previous version, total size unknown
+            self._parts = []
+        else:
+            self._buffer = bytearray(sum(self._sizes))
+            self._offset = 0
+
+    def append(self, part):
+        if self._sizes is None:
+            self._parts.append(part)
+        else:
+            self._buffer[self._offset: self._offset + len(part)] = part
+            self._offset += len(part)
+
+    def get(self):
+        if self._sizes is None:
+            return pickle.loads(decompress(self._codec, b''.join(self._parts)))
+        if self._offset != len(self._buffer):
+            raise ValueError(f"split object incomplete, got {self._offset} of {len(self._buffer)} bytes")
+        if self._codec is not None:
+            return pickle.loads(decompress(self._codec, self._buffer))
+
+        if len(self._sizes) == 1:
+            return pickle.loads(self._buffer)
+
+        view = memoryview(self._buffer)
+        buffers = []
+        offset = 0
+        for size in self._sizes:
+            buffers.append(view[offset: offset + size])
+            offset += size
+        return pickle.loads(buffers[0], buffers=buffers[1:])
 
 
 class _SplitHead(object):
-    def __init__(self, num_split):
+    def __init__(self, num_split, codec=None, sizes=None):
         self._num_split = num_split
+        self._codec = codec
+        self._sizes = sizes
 
     def num_split(self):
         return self._num_split
+
+    def codec(self):
+        # heads pickled by previous version have no codec
+        return getattr(self, "_codec", None)
+
+    def sizes(self):
+        # sizes of pickle stream and out-of-band buffers, None for heads pickled by previous version
+        return getattr(self, "_sizes", None)
@@ -24,14 +24,16 @@ from eggroll.roll_site.roll_site import RollSiteContext
 from fate_arch.abc import FederationABC
 from fate_arch.common.log import getLogger
 from fate_arch.computing.eggroll import Table
-from fate_arch.federation._split import _is_split_head, _split_get, _is_splitable_obj, _get_splits
+from fate_arch.federation._compress import Compressor, is_compressed_obj
+from fate_arch.federation._split import _is_split_head, _SplitAssembler, _is_splitable_obj, _get_splits
 
 LOGGER = getLogger()
 
 
 class Federation(FederationABC):
 
-    def __init__(self, rp_ctx, rs_session_id, party, proxy_endpoint):
+    def __init__(self, rp_ctx, rs_session_id, party, proxy_endpoint, compressor: Compressor = None,
+                 split_out_of_band=False):
         LOGGER.debug(f"[federation.eggroll]init federation: "
                      f"rp_session_id={rp_ctx.session_id}, rs_session_id={rs_session_id}, "
                      f"party={party}, proxy_endpoint={proxy_endpoint}")
@@ -42,6 +44,9 @@ class Federation(FederationABC):
             'proxy_endpoint': proxy_endpoint
         }
         self._rsc = RollSiteContext(rs_session_id, rp_ctx=rp_ctx, options=options)
+        self._compressor = compressor if compressor is not None else Compressor()
+        # split objects with out-of-band buffers could only be read by parties of the same version
+        self._split_out_of_band = split_out_of_band
         LOGGER.debug(f"[federation.eggroll]init federation context done")
 
     def get(self, name, tag, parties, gc):
@@ -54,10 +59,10 @@ class Federation(FederationABC):
             # noinspection PyProtectedMember
             v = v._rp
         parties = [(party.role, party.party_id) for party in parties]
-        _remote(v, name, tag, parties, self._rsc, gc)
+        _remote(v, name, tag, parties, self._rsc, gc, self._compressor, self._split_out_of_band)
 
 
-def _remote(v, name, tag, parties, rsc, gc):
+def _remote(v, name, tag, parties, rsc, gc, compressor=None, split_out_of_band=False):
     log_str = f"federation.eggroll.remote.{name}.{tag}{parties})"
     if v is None:
         raise ValueError(f"[{log_str}]remote `None` to {parties}")
@@ -74,16 +79,18 @@ def _remote(v, name, tag, parties, rsc, gc):
 
     if t == _FederationValueType.SPLIT_OBJECT:
         LOGGER.debug(f"[{log_str}]remote split object with type: {type(v)}")
-        head, tails = _get_splits(v)
+        head, tails = _get_splits(v, compressor, split_out_of_band)
         _push_with_exception_handle(rsc, head, name, tag, parties)
 
-        for k, tail in enumerate(tails):
+        for k, tail in tails:
             _push_with_exception_handle(rsc, tail, name, f"{tag}.__part_{k}", parties)
 
         return
 
     if t == _FederationValueType.OBJECT:
         LOGGER.debug(f"[{log_str}]remote object with type: {type(v)}")
+        if compressor is not None:
+            v = compressor.wrap(v)
         _push_with_exception_handle(rsc, v, name, tag, parties)
         return
 
@@ -182,16 +189,22 @@ def _get_value_post_process(v, name, tag, party, rsc, gc):
     if _is_split_head(v):
         num_split = v.num_split()
         LOGGER.debug(f"[{log_str}]is split object, num_split={num_split}")
-        split_objs = []
+        assembler = _SplitAssembler(v)
         for k in range(num_split):
-            split_obj = _split_rs = rsc.load(name, tag=f"{tag}.__part_{k}").pull([party])[0].result()
+            split_obj = rsc.load(name, tag=f"{tag}.__part_{k}").pull([party])[0].result()
             LOGGER.debug(f"[{log_str}]got split ({k}/{num_split})")
-            split_objs.append(split_obj)
-        obj = _split_get(split_objs)
+            assembler.append(split_obj)
+        obj = assembler.get()
 
         LOGGER.debug(f"[{log_str}] got split object with type: {type(obj)}")
         return obj
 
+    # got compressed object
+    if is_compressed_obj(v):
+        obj = v.unwrap()
+        LOGGER.debug(f"[{log_str}] got compressed object with type: {type(obj)}")
+        return obj
+
     # others
     LOGGER.debug(f"[{log_str}] got object with type: {type(v)}")
     return v
@@ -19,12 +19,15 @@ from eggroll.roll_pair.roll_pair import RollPairContext
 from eggroll.roll_site.roll_site import RollSiteContext
 from fate_arch.abc import GarbageCollectionABC
 from fate_arch.common import Party
+from fate_arch.federation._compress import Compressor
 
 
 class Federation(object):
 
-    def __init__(self, rp_ctx: RollPairContext, rs_session_id: str, party: Party, proxy_endpoint: str):
+    def __init__(self, rp_ctx: RollPairContext, rs_session_id: str, party: Party, proxy_endpoint: str,
+                 compressor: Compressor = None):
         self._rsc: RollSiteContext = ...
+        self._compressor: Compressor = ...
         ...
 
     def get(self: Federation, name: str, tag: str, parties: typing.List[Party],
@@ -39,7 +42,8 @@ def _remote(v,
             tag: str,
             parties: typing.List[typing.Tuple[str, str]],
             rsc: RollSiteContext,
-            gc: GarbageCollectionABC) -> typing.NoReturn: ...
+            gc: GarbageCollectionABC,
+            compressor: Compressor = None) -> typing.NoReturn: ...
 
 
 def _get(name: str,
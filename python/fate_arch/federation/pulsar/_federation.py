@@ -3,9 +3,7 @@
 # SPDX-License-Identifier: Apache-2.0                  #
 ########################################################
 
-import io
 import json
-import sys
 import time
 import typing
 import random
@@ -22,6 +20,8 @@ from fate_arch.common import Party
 from fate_arch.common.log import getLogger
 from fate_arch.computing.spark import get_storage_level, Table
 from fate_arch.computing.spark._materialize import materialize
+from fate_arch.federation._compress import Compressor, decompress
+from fate_arch.federation._datastream import BinaryDatastream
 from fate_arch.federation.pulsar._mq_channel import (
     MQChannel,
     DEFAULT_TENANT,
@@ -29,7 +29,6 @@ from fate_arch.federation.pulsar._mq_channel import (
     DEFAULT_SUBSCRIPTION_NAME,
 )
 from fate_arch.federation.pulsar._pulsar_manager import PulsarManager
-from fate_arch.federation.rabbitmq._federation import Datastream
 
 
 LOGGER = getLogger()
@@ -101,6 +100,7 @@ class Federation(FederationABC):
         max_message_size = pulsar_run.get(
             "max_message_size", DEFAULT_MESSAGE_MAX_SIZE)
         LOGGER.debug(f"set max message size to {max_message_size} Bytes")
+        compressor = Compressor.from_conf(pulsar_run)
 
         # topic ttl could be overwritten by run time config
         topic_ttl = int(pulsar_run.get("topic_ttl", topic_ttl))
@@ -134,6 +134,7 @@ class Federation(FederationABC):
             topic_ttl,
             cluster,
             tenant,
+            compressor,
         )
 
     def __init__(
@@ -146,6 +147,7 @@ class Federation(FederationABC):
         topic_ttl,
         cluster,
         tenant,
+        compressor: Compressor = None,
     ):
         self._session_id = session_id
         self._party = party
@@ -161,6 +163,7 @@ class Federation(FederationABC):
         self._topic_ttl = topic_ttl
         self._cluster = cluster
         self._tenant = tenant
+        self._compressor = compressor if compressor is not None else Compressor()
 
     def __getstate__(self):
         pass
@@ -312,6 +315,7 @@ class Federation(FederationABC):
                 mq=self._mq,
                 maximun_message_size=self._max_message_size,
                 conf=self._pulsar_manager.runtime_config,
+                compressor=self._compressor,
             )
             # noinspection PyProtectedMember
             v._rdd.mapPartitionsWithIndex(send_func).count()
@@ -660,6 +664,7 @@ class Federation(FederationABC):
         return channel_infos
 
     def _send_obj(self, name, tag, data, channel_infos):
+        codec, data = self._compressor.compress(data)
         for info in channel_infos:
             # selfmade properties
             properties = {
@@ -668,6 +673,8 @@ class Federation(FederationABC):
                 "message_id": name,
                 "correlation_id": tag,
             }
+            if codec is not None:
+                properties["content_encoding"] = codec
             LOGGER.debug(f"[pulsar._send_obj]properties:{properties}.")
             info.basic_publish(body=data, properties=properties)
 
@@ -703,7 +710,9 @@ class Federation(FederationABC):
             )
             # object
             if properties["content_type"] == "text/plain":
-                self._message_cache[cache_key] = p_loads(body)
+                self._message_cache[cache_key] = p_loads(
+                    decompress(properties.get("content_encoding"), body)
+                )
                 # TODO: handle ack failure
                 channel_info.basic_ack(message.message_id())
                 if cache_key == wish_cache_key:
@@ -719,8 +728,19 @@ class Federation(FederationABC):
                 )
 
     def _send_kv(
-        self, name, tag, data, channel_infos, partition_size, partitions, message_key
+        self,
+        name,
+        tag,
+        data,
+        channel_infos,
+        partition_size,
+        partitions,
+        message_key,
+        compressor=None,
     ):
+        codec = None
+        if compressor is not None:
+            codec, data = compressor.compress(data)
         headers = json.dumps(
             {
                 "partition_size": partition_size,
@@ -731,12 +751,14 @@ class Federation(FederationABC):
 
         for info in channel_infos:
             properties = {
-                "content_type": "application/json",
+                "content_type": "application/octet-stream",
                 "app_id": info.party_id,
                 "message_id": name,
                 "correlation_id": tag,
                 "headers": headers,
             }
+            if codec is not None:
+                properties["content_encoding"] = codec
             LOGGER.debug(
                 f"[pulsar._send_kv]info: {info}, properties: {properties}.")
             info.basic_publish(body=data, properties=properties)
@@ -750,6 +772,7 @@ class Federation(FederationABC):
         mq,
         maximun_message_size,
         conf: dict,
+        compressor=None,
     ):
         def _fn(index, kvs):
             return self._partition_send(
@@ -762,6 +785,7 @@ class Federation(FederationABC):
                 mq,
                 maximun_message_size,
                 conf,
+                compressor,
             )
 
         return _fn
@@ -777,12 +801,13 @@ class Federation(FederationABC):
         mq,
         maximun_message_size,
         conf: dict,
+        compressor=None,
     ):
         channel_infos = self._get_channels_index(
             index=index, party_topic_infos=party_topic_infos, mq=mq, conf=conf
         )
         # reuse datastream here incase message size has limitation in pulsar
-        datastream = Datastream()
+        datastream = BinaryDatastream()
         base_message_key = str(index)
         message_key_idx = 0
         count = 0
@@ -790,11 +815,10 @@ class Federation(FederationABC):
         for k, v in kvs:
             count += 1
             internal_count += 1
-            el = {"k": p_dumps(k).hex(), "v": p_dumps(v).hex()}
-            # roughly caculate the size of package to avoid serialization ;)
+            k_bytes, v_bytes = p_dumps(k), p_dumps(v)
             if (
-                datastream.get_size() +
-                sys.getsizeof(el["k"]) + sys.getsizeof(el["v"])
+                datastream.get_size() > 0
+                and datastream.get_size() + datastream.record_size(k_bytes, v_bytes)
                 >= maximun_message_size
             ):
                 LOGGER.debug(
@@ -810,14 +834,15 @@ class Federation(FederationABC):
                 self._send_kv(
                     name=name,
                     tag=tag,
-                    data=datastream.get_data().encode(),
+                    data=datastream.get_data(),
                     channel_infos=channel_infos,
                     partition_size=-1,
                     partitions=partitions,
                     message_key=message_key,
+                    compressor=compressor,
                 )
                 datastream.clear()
-            datastream.append(el)
+            datastream.append(k_bytes, v_bytes)
 
         message_key_idx += 1
         message_key = _SPLIT_.join([base_message_key, str(message_key_idx)])
@@ -825,11 +850,12 @@ class Federation(FederationABC):
         self._send_kv(
             name=name,
             tag=tag,
-            data=datastream.get_data().encode(),
+            data=datastream.get_data(),
             channel_infos=channel_infos,
             partition_size=count,
             partitions=partitions,
             message_key=message_key,
+            compressor=compressor,
         )
 
         return [1]
@@ -859,7 +885,7 @@ class Federation(FederationABC):
                 message = channel_info.consume()
                 properties = message.properties()
                 # must get bytes
-                body = message.data().decode()
+                body = message.data()
                 LOGGER.debug(
                     f"[pulsar._partition_receive] properties: {properties}.")
                 if (
@@ -873,7 +899,7 @@ class Federation(FederationABC):
                     )
                     continue
 
-                if properties["content_type"] == "application/json":
+                if properties["content_type"] in ("application/octet-stream", "application/json"):
                     # headers here is json bytes string
                     header = json.loads(properties["headers"])
                     message_key = header.get("message_key")
@@ -889,20 +915,25 @@ class Federation(FederationABC):
                     if header.get("partition_size") >= 0:
                         partition_size = header.get("partition_size")
 
-                    data = json.loads(body)
-                    data_iter = (
-                        (
-                            p_loads(bytes.fromhex(el["k"])),
-                            p_loads(bytes.fromhex(el["v"])),
+                    if properties["content_type"] == "application/octet-stream":
+                        data = BinaryDatastream.load(
+                            decompress(properties.get("content_encoding"), body)
                         )
-                        for el in data
-                    )
+                    else:
+                        # json format sent by previous version
+                        data = [
+                            (
+                                p_loads(bytes.fromhex(el["k"])),
+                                p_loads(bytes.fromhex(el["v"])),
+                            )
+                            for el in json.loads(body.decode())
+                        ]
                     count += len(data)
                     LOGGER.debug(
                         f"[pulsar._partition_receive] count: {len(data)}")
                     LOGGER.debug(
                         f"[pulsar._partition_receive]total count: {count}")
-                    all_data.extend(data_iter)
+                    all_data.extend(data)
                     channel_info.basic_ack(message.message_id())
                     if partition_size != -1:
                         if count == partition_size:
@@ -914,7 +945,8 @@ class Federation(FederationABC):
                             )
                 else:
                     raise ValueError(
-                        f"[pulsar._partition_receive]properties.content_type is {properties.content_type}, but must be application/json"
+                        f"[pulsar._partition_receive]properties.content_type is {properties['content_type']}, "
+                        f"but must be application/octet-stream or application/json"
                     )
             except Exception as e:
                 LOGGER.error(
@@ -14,9 +14,7 @@
 #  limitations under the License.
 #
 
-import io
 import json
-import sys
 import time
 import typing
 from pickle import dumps as p_dumps, loads as p_loads
@@ -32,6 +30,8 @@ from fate_arch.common import Party
 from fate_arch.common.log import getLogger
 from fate_arch.computing.spark import get_storage_level, Table
 from fate_arch.computing.spark._materialize import materialize
+from fate_arch.federation._compress import Compressor, decompress
+from fate_arch.federation._datastream import BinaryDatastream
 from fate_arch.federation.rabbitmq._mq_channel import MQChannel
 from fate_arch.federation.rabbitmq._rabbit_manager import RabbitManager
 
@@ -44,30 +44,6 @@ NAME_DTYPE_TAG = "<dtype>"
 _SPLIT_ = "^"
 
 
-# Datastream is a wraper of StringIO, it receives kv pairs and dump it to json string
-class Datastream(object):
-    def __init__(self):
-        self._string = io.StringIO()
-        self._string.write("[")
-
-    def get_size(self):
-        return sys.getsizeof(self._string.getvalue())
-
-    def get_data(self):
-        self._string.write("]")
-        return self._string.getvalue()
-
-    def append(self, kv: dict):
-        # add ',' if not the first element
-        if self._string.getvalue() != "[":
-            self._string.write(",")
-        json.dump(kv, self._string)
-
-    def clear(self):
-        self._string.close()
-        self.__init__()
-
-
 class FederationDataType(object):
     OBJECT = "obj"
     TABLE = "Table"
@@ -147,6 +123,7 @@ class Federation(FederationABC):
             "max_message_size", DEFAULT_MESSAGE_MAX_SIZE
         )
         LOGGER.debug(f"set max message size to {max_message_size} Bytes")
+        compressor = Compressor.from_conf(rabbitmq_run)
 
         rabbit_manager = RabbitManager(
             base_user, base_password, f"{host}:{mng_port}", rabbitmq_run
@@ -158,7 +135,7 @@ class Federation(FederationABC):
         route_table = file_utils.load_yaml_conf(conf_path=route_table_path)
         mq = MQ(host, port, union_name, policy_id, route_table)
         return Federation(
-            federation_session_id, party, mq, rabbit_manager, max_message_size
+            federation_session_id, party, mq, rabbit_manager, max_message_size, compressor
         )
 
     def __init__(
@@ -168,6 +145,7 @@ class Federation(FederationABC):
         mq: MQ,
         rabbit_manager: RabbitManager,
         max_message_size,
+        compressor: Compressor = None,
     ):
         self._session_id = session_id
         self._party = party
@@ -180,6 +158,7 @@ class Federation(FederationABC):
         self._name_dtype_map = {}
         self._message_cache = {}
         self._max_message_size = max_message_size
+        self._compressor = compressor if compressor is not None else Compressor()
 
     def __getstate__(self):
         pass
@@ -327,6 +306,7 @@ class Federation(FederationABC):
                 connection_conf=self._rabbit_manager.runtime_config.get(
                     "connection", {}
                 ),
+                compressor=self._compressor,
             )
             # noinspection PyProtectedMember
             v._rdd.mapPartitionsWithIndex(send_func).count()
@@ -507,9 +487,11 @@ class Federation(FederationABC):
         return channel_infos
 
     def _send_obj(self, name, tag, data, channel_infos):
+        codec, data = self._compressor.compress(data)
         for info in channel_infos:
             properties = pika.BasicProperties(
                 content_type="text/plain",
+                content_encoding=codec,
                 app_id=info.party_id,
                 message_id=name,
                 correlation_id=tag,
@@ -545,7 +527,9 @@ class Federation(FederationABC):
             )
             # object
             if properties.content_type == "text/plain":
-                self._message_cache[cache_key] = p_loads(body)
+                self._message_cache[cache_key] = p_loads(
+                    decompress(properties.content_encoding, body)
+                )
                 channel_info.basic_ack(delivery_tag=method.delivery_tag)
                 if cache_key == wish_cache_key:
                     channel_info.cancel()
@@ -559,8 +543,19 @@ class Federation(FederationABC):
                 )
 
     def _send_kv(
-        self, name, tag, data, channel_infos, partition_size, partitions, message_key
+        self,
+        name,
+        tag,
+        data,
+        channel_infos,
+        partition_size,
+        partitions,
+        message_key,
+        compressor=None,
     ):
+        codec = None
+        if compressor is not None:
+            codec, data = compressor.compress(data)
         headers = {
             "partition_size": partition_size,
             "partitions": partitions,
@@ -568,7 +563,8 @@ class Federation(FederationABC):
         }
         for info in channel_infos:
             properties = pika.BasicProperties(
-                content_type="application/json",
+                content_type="application/octet-stream",
+                content_encoding=codec,
                 app_id=info.party_id,
                 message_id=name,
                 correlation_id=tag,
@@ -587,6 +583,7 @@ class Federation(FederationABC):
         mq,
         maximun_message_size,
         connection_conf: dict,
+        compressor=None,
     ):
         def _fn(index, kvs):
             return self._partition_send(
@@ -599,6 +596,7 @@ class Federation(FederationABC):
                 mq,
                 maximun_message_size,
                 connection_conf,
+                compressor,
             )
 
         return _fn
@@ -614,22 +612,23 @@ class Federation(FederationABC):
         mq,
         maximun_message_size,
         connection_conf: dict,
+        compressor=None,
     ):
         channel_infos = self._get_channels_index(
             index=index, mq_names=mq_names, mq=mq, connection_conf=connection_conf
         )
 
-        datastream = Datastream()
+        datastream = BinaryDatastream()
         base_message_key = str(index)
         message_key_idx = 0
         count = 0
 
         for k, v in kvs:
             count += 1
-            el = {"k": p_dumps(k).hex(), "v": p_dumps(v).hex()}
-            # roughly caculate the size of package to avoid serialization ;)
+            k_bytes, v_bytes = p_dumps(k), p_dumps(v)
             if (
-                datastream.get_size() + sys.getsizeof(el["k"]) + sys.getsizeof(el["v"])
+                datastream.get_size() > 0
+                and datastream.get_size() + datastream.record_size(k_bytes, v_bytes)
                 >= maximun_message_size
             ):
                 print(
@@ -645,9 +644,10 @@ class Federation(FederationABC):
                     partition_size=-1,
                     partitions=partitions,
                     message_key=message_key,
+                    compressor=compressor,
                 )
                 datastream.clear()
-            datastream.append(el)
+            datastream.append(k_bytes, v_bytes)
 
         message_key_idx += 1
         message_key = _SPLIT_.join([base_message_key, str(message_key_idx)])
@@ -660,6 +660,7 @@ class Federation(FederationABC):
             partition_size=count,
             partitions=partitions,
             message_key=message_key,
+            compressor=compressor,
         )
 
         return [1]
@@ -716,7 +717,7 @@ class Federation(FederationABC):
                 )
                 continue
 
-            if properties.content_type == "application/json":
+            if properties.content_type in ("application/octet-stream", "application/json"):
                 message_key = properties.headers["message_key"]
                 if message_key in message_key_cache:
                     print(
@@ -730,14 +731,19 @@ class Federation(FederationABC):
                 if properties.headers["partition_size"] >= 0:
                     partition_size = properties.headers["partition_size"]
 
-                data = json.loads(body)
-                data_iter = (
-                    (p_loads(bytes.fromhex(el["k"])), p_loads(bytes.fromhex(el["v"])))
-                    for el in data
-                )
+                if properties.content_type == "application/octet-stream":
+                    data = BinaryDatastream.load(
+                        decompress(properties.content_encoding, body)
+                    )
+                else:
+                    # json format sent by previous version
+                    data = [
+                        (p_loads(bytes.fromhex(el["k"])), p_loads(bytes.fromhex(el["v"])))
+                        for el in json.loads(body)
+                    ]
                 count += len(data)
                 print(f"[rabbitmq._partition_receive] count: {count}")
-                all_data.extend(data_iter)
+                all_data.extend(data)
                 channel_info.basic_ack(delivery_tag=method.delivery_tag)
 
                 if count == partition_size:
@@ -745,5 +751,6 @@ class Federation(FederationABC):
                     return all_data
             else:
                 ValueError(
-                    f"[rabbitmq._partition_receive]properties.content_type is {properties.content_type}, but must be application/json"
+                    f"[rabbitmq._partition_receive]properties.content_type is {properties.content_type}, "
+                    f"but must be application/octet-stream or application/json"
                 )
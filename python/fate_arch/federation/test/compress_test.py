@@ -0,0 +1,100 @@
+#
+#  Copyright 2019 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+
+import importlib
+import os
+import pickle
+import unittest
+
+from fate_arch.federation._compress import Compressor, decompress, is_compressed_obj
+
+
+def _codec_available(module):
+    try:
+        importlib.import_module(module)
+        return True
+    except ImportError:
+        return False
+
+
+class TestCompressor(unittest.TestCase):
+    def setUp(self):
+        # compressible payload well above the default threshold
+        self.data = pickle.dumps([{"id": i, "features": [i % 7] * 16} for i in range(5000)])
+        self.obj = {"weights": [0.5] * 50000, "name": "model"}
+
+    def _check_codec(self, codec):
+        compressor = Compressor(codec=codec)
+        self.assertTrue(compressor.enabled)
+
+        used, payload = compressor.compress(self.data)
+        self.assertEqual(used, codec)
+        self.assertLess(len(payload), len(self.data))
+        self.assertEqual(decompress(used, payload), self.data)
+
+        wrapped = compressor.wrap(self.obj)
+        self.assertTrue(is_compressed_obj(wrapped))
+        self.assertEqual(wrapped.unwrap(), self.obj)
+
+    def test_zlib(self):
+        self._check_codec("zlib")
+
+    @unittest.skipUnless(_codec_available("lz4.frame"), "lz4 not installed")
+    def test_lz4(self):
+        self._check_codec("lz4")
+
+    @unittest.skipUnless(_codec_available("zstandard"), "zstandard not installed")
+    def test_zstd(self):
+        self._check_codec("zstd")
+
+    def test_zlib_level(self):
+        used, payload = Compressor(codec="zlib", level=1).compress(self.data)
+        self.assertEqual(decompress(used, payload), self.data)
+
+    def test_disabled(self):
+        compressor = Compressor()
+        self.assertFalse(compressor.enabled)
+        self.assertEqual(compressor.compress(self.data), (None, self.data))
+        self.assertIs(compressor.wrap(self.obj), self.obj)
+        self.assertEqual(decompress(None, self.data), self.data)
+
+    def test_below_threshold(self):
+        compressor = Compressor(codec="zlib", threshold=len(self.data) + 1)
+        self.assertEqual(compressor.compress(self.data), (None, self.data))
+        small = {"loss": 0.5}
+        self.assertIs(Compressor(codec="zlib").wrap(small), small)
+
+    def test_incompressible(self):
+        data = os.urandom(256 * 1024)
+        self.assertEqual(Compressor(codec="zlib").compress(data), (None, data))
+        self.assertEqual(decompress(None, data), data)
+
+    def test_from_conf(self):
+        self.assertFalse(Compressor.from_conf(None).enabled)
+        compressor = Compressor.from_conf({"compress_codec": "zlib", "compress_threshold": 0, "compress_level": 9})
+        used, payload = compressor.compress(b"a" * 100)
+        self.assertEqual(used, "zlib")
+        self.assertEqual(decompress(used, payload), b"a" * 100)
+
+    def test_unknown_codec(self):
+        with self.assertRaises(ValueError):
+            Compressor(codec="snappy")
+        with self.assertRaises(ValueError):
+            decompress("snappy", b"")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+#
+#  Copyright 2019 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+
+import unittest
+from pickle import dumps as p_dumps
+
+import numpy as np
+
+from fate_arch.federation._datastream import BinaryDatastream
+
+
+class TestBinaryDatastream(unittest.TestCase):
+    def setUp(self):
+        self.kvs = [(i, {"value": i * 0.5, "label": str(i)}) for i in range(100)]
+        self.kvs.append(("empty", b""))
+        self.kvs.append((("tuple", "key"), np.arange(1000)))
+
+    def _dump(self, kvs):
+        datastream = BinaryDatastream()
+        for k, v in kvs:
+            datastream.append(p_dumps(k), p_dumps(v))
+        return datastream
+
+    def test_round_trip(self):
+        datastream = self._dump(self.kvs)
+        loaded = BinaryDatastream.load(datastream.get_data())
+        self.assertEqual(len(loaded), len(self.kvs))
+        for (k, v), (loaded_k, loaded_v) in zip(self.kvs[:-1], loaded[:-1]):
+            self.assertEqual(k, loaded_k)
+            self.assertEqual(v, loaded_v)
+        self.assertEqual(loaded[-1][0], self.kvs[-1][0])
+        self.assertTrue(np.array_equal(loaded[-1][1], self.kvs[-1][1]))
+
+    def test_size(self):
+        datastream = BinaryDatastream()
+        self.assertEqual(datastream.get_size(), 0)
+        expected = 0
+        for k, v in self.kvs:
+            k_bytes, v_bytes = p_dumps(k), p_dumps(v)
+            expected += BinaryDatastream.record_size(k_bytes, v_bytes)
+            datastream.append(k_bytes, v_bytes)
+            self.assertEqual(datastream.get_size(), expected)
+        self.assertEqual(len(datastream.get_data()), expected)
+
+    def test_clear(self):
+        datastream = self._dump(self.kvs)
+        datastream.clear()
+        self.assertEqual(datastream.get_size(), 0)
+        self.assertEqual(BinaryDatastream.load(datastream.get_data()), [])
+
+        datastream.append(p_dumps("k"), p_dumps("v"))
+        self.assertEqual(BinaryDatastream.load(datastream.get_data()), [("k", "v")])
+
+    def test_load_from_memoryview(self):
+        data = self._dump(self.kvs[:10]).get_data()
+        self.assertEqual(BinaryDatastream.load(memoryview(data)), self.kvs[:10])
+        self.assertEqual(BinaryDatastream.load(bytearray(data)), self.kvs[:10])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,128 @@
+#
+#  Copyright 2019 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+
+import pickle
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from fate_arch.federation import segment_transfer_enabled
+from fate_arch.federation._compress import Compressor
+from fate_arch.federation._split import _dumps, _get_splits, _is_split_head, _iter_parts, _SplitAssembler, \
+    _SplitHead
+
+MAX_PART_SIZE = 1000
+
+
+class BigObject(metaclass=segment_transfer_enabled(max_part_size=MAX_PART_SIZE)):
+    def __init__(self, arrays, values):
+        self.arrays = arrays
+        self.values = values
+
+
+class TestSplit(unittest.TestCase):
+    def setUp(self):
+        self.obj = BigObject(arrays=[np.random.rand(100), np.arange(333, dtype=np.int32), np.zeros((7, 11))],
+                             values=[str(i) for i in range(500)])
+
+    def _transfer(self, obj, compressor=None, out_of_band=False):
+        head, parts = _get_splits(obj, compressor, out_of_band)
+        self.assertTrue(_is_split_head(head))
+        sent = []
+        assembler = _SplitAssembler(pickle.loads(pickle.dumps(head)))
+        for k, part in parts:
+            self.assertLessEqual(len(part), MAX_PART_SIZE)
+            sent.append(k)
+            assembler.append(part)
+        self.assertEqual(sent, list(range(head.num_split())))
+        return assembler.get()
+
+    def _check_equal(self, obj):
+        self.assertIsInstance(obj, BigObject)
+        self.assertEqual(len(obj.arrays), len(self.obj.arrays))
+        for array, expected in zip(obj.arrays, self.obj.arrays):
+            self.assertEqual(array.dtype, expected.dtype)
+            self.assertTrue(np.array_equal(array, expected))
+        self.assertEqual(obj.values, self.obj.values)
+
+    def test_out_of_band_buffers(self):
+        buffers, codec = _dumps(self.obj, out_of_band=True)
+        self.assertIsNone(codec)
+        if pickle.HIGHEST_PROTOCOL >= 5:
+            self.assertEqual(len(buffers), 1 + len(self.obj.arrays))
+        self._check_equal(self._transfer(self.obj, out_of_band=True))
+
+    def test_protocol_4_fallback(self):
+        with mock.patch.object(pickle, "HIGHEST_PROTOCOL", 4):
+            buffers, codec = _dumps(self.obj, out_of_band=True)
+            self.assertEqual(len(buffers), 1)
+            self.assertIsNone(codec)
+            received = self._transfer(self.obj, out_of_band=True)
+        self._check_equal(received)
+
+    def test_readable_by_previous_version(self):
+        # by default, parts are one protocol 4 stream, which previous version joins and unpickles
+        head, parts = _get_splits(self.obj)
+        self.assertEqual(len(head.sizes()), 1)
+        self._check_equal(pickle.loads(b''.join(part for _, part in parts)))
+        self._check_equal(self._transfer(self.obj))
+
+    def test_compressed(self):
+        compressor = Compressor(codec="zlib", threshold=0)
+        buffers, codec = _dumps(self.obj, compressor)
+        self.assertEqual(len(buffers), 1)
+        self.assertEqual(codec, "zlib")
+        self._check_equal(self._transfer(self.obj, compressor))
+
+    def test_head_of_previous_version(self):
+        # previous version sent one protocol 4 stream and a head without codec and sizes
+        head = _SplitHead.__new__(_SplitHead)
+        stream = pickle.dumps(self.obj, protocol=4)
+        parts = list(_iter_parts([stream], MAX_PART_SIZE))
+        head._num_split = len(parts)
+        assembler = _SplitAssembler(head)
+        for part in parts:
+            assembler.append(part)
+        self._check_equal(assembler.get())
+
+    def test_small_object_not_split(self):
+        obj = BigObject(arrays=[], values=[1])
+        head, parts = _get_splits(obj)
+        self.assertIs(head, obj)
+        self.assertEqual(list(parts), [])
+
+    def test_iter_parts(self):
+        buffers = [b"a" * 10, b"", b"b" * 25, b"c" * 5]
+        parts = list(_iter_parts(buffers, 10))
+        self.assertEqual([len(part) for part in parts], [10, 10, 10, 10])
+        self.assertEqual(b"".join(parts), b"".join(buffers))
+        self.assertEqual(list(_iter_parts([b"x" * 3], 10)), [b"xxx"])
+        self.assertEqual(list(_iter_parts([], 10)), [])
+
+    def test_incomplete(self):
+        head, parts = _get_splits(self.obj)
+        assembler = _SplitAssembler(head)
+        for k, part in parts:
+            if k == head.num_split() - 1:
+                break
+            assembler.append(part)
+        with self.assertRaises(ValueError):
+            assembler.get()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -123,15 +123,19 @@ class Session(object):
         if self._federation_type == FederationEngine.EGGROLL:
             from fate_arch.computing.eggroll import CSession
             from fate_arch.federation.eggroll import Federation
+            from fate_arch.federation._compress import Compressor
 
             if not self.is_computing_valid or not isinstance(self._computing_session, CSession):
                 raise RuntimeError(
                     f"require computing with type {ComputingEngine.EGGROLL} valid")
 
+            eggroll_run = (runtime_conf or {}).get("job_parameters", {}).get("eggroll_run") or {}
             self._federation_session = Federation(rp_ctx=self._computing_session.get_rpc(),
                                                   rs_session_id=federation_session_id,
                                                   party=parties_info.local_party,
-                                                  proxy_endpoint=f"{service_conf['host']}:{service_conf['port']}")
+                                                  proxy_endpoint=f"{service_conf['host']}:{service_conf['port']}",
+                                                  compressor=Compressor.from_conf(eggroll_run),
+                                                  split_out_of_band=eggroll_run.get("split_out_of_band", False))
             return self
 
         if self._federation_type == FederationEngine.RABBITMQ:
@@ -132,7 +132,8 @@ class StorageTable(StorageTableBase):
         from pyspark.sql import SparkSession
         session = SparkSession.builder.enableHiveSupport().getOrCreate()
         session.sql("use {}".format(self._address.database))
-        spark_df = session.createDataFrame(kv_pd)
+        from pyspark.sql import DataFrame
+        spark_df = kv_pd if isinstance(kv_pd, DataFrame) else session.createDataFrame(kv_pd)
         spark_df.write.saveAsTable(self._address.name, format="orc")
 
     def destroy(self):
@@ -0,0 +1,143 @@
+#
+#  Copyright 2019 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+
+import random
+import shutil
+import tempfile
+import unittest
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from unittest import mock
+
+from fate_arch import _standalone
+from fate_arch._standalone import Session
+
+
+class TestStandaloneTable(unittest.TestCase):
+    def setUp(self):
+        self.session = Session(f"test_standalone_{uuid.uuid1()}")
+
+    def tearDown(self):
+        self.session.stop()
+
+    def test_map_values(self):
+        table = self.session.parallelize(range(100), partition=4)
+        self.assertEqual(dict(table.mapValues(lambda v: v * 2).collect()), {i: i * 2 for i in range(100)})
+        self.assertEqual(dict(table.filter(lambda k, v: v % 3 == 0).collect()),
+                         {i: i for i in range(0, 100, 3)})
+        self.assertEqual(table.reduce(lambda a, b: a + b), sum(range(100)))
+
+    def test_function_state_not_shared_between_tasks(self):
+        counter = [0]
+
+        def count(v):
+            counter[0] += 1
+            return counter[0]
+
+        table = self.session.parallelize(range(10), partition=1)
+        for _ in range(3):
+            self.assertEqual(sorted(v for _, v in table.mapValues(count).collect()), list(range(1, 11)))
+            self.assertEqual(sorted(v for _, v in table.map(lambda k, v: (k, count(v))).collect()),
+                             list(range(1, 11)))
+
+    def test_lazy_child_of_nondeterministic_table(self):
+        table = self.session.parallelize(range(100), partition=4)
+        noise = table.mapValues(lambda v: random.random())
+        negative = noise.mapValues(lambda v: -v)
+        residual = noise.join(negative, lambda a, b: a + b)
+        self.assertTrue(all(v == 0 for _, v in residual.collect()))
+
+        noise = table.mapValues(lambda v: random.random())
+        negative = noise.mapValues(lambda v: -v).filter(lambda k, v: k % 2 == 0)
+        self.assertEqual(negative.count(), 50)
+        self.assertTrue(all(v + noise.get(k) == 0 for k, v in negative.collect()))
+
+    def test_lazy_chain_after_parent_modified(self):
+        table = self.session.parallelize(range(10), partition=2)
+        parent = table.mapValues(lambda v: v + 1)
+        child = parent.mapValues(lambda v: v * 2)
+        parent.put(0, 100)
+        self.assertEqual(dict(child.collect()), {i: (i + 1) * 2 for i in range(10)})
+        self.assertEqual(parent.get(0), 100)
+
+    def test_lazy_chain_with_destroyed_parent(self):
+        table = self.session.parallelize(range(10), partition=2)
+        child = table.mapValues(lambda v: v + 1).mapValues(lambda v: v * 2)
+        parent = table.mapValues(lambda v: v - 1)
+        grandchild = parent.mapValues(lambda v: v * 3)
+        parent.destroy()
+        self.assertEqual(dict(child.collect()), {i: (i + 1) * 2 for i in range(10)})
+        self.assertEqual(dict(grandchild.collect()), {i: (i - 1) * 3 for i in range(10)})
+
+    def test_recreated_table_read_by_same_worker(self):
+        # one worker, so that it reuses the environment of the destroyed table if it's not checked
+        self.session._pool.shutdown()
+        self.session._pool = ProcessPoolExecutor(max_workers=1)
+        name, namespace = str(uuid.uuid1()), self.session.session_id
+        saved = self.session.parallelize(range(10), partition=2).save_as(name, namespace, need_cleanup=False)
+        self.assertEqual(dict(saved.mapValues(lambda v: v + 1).collect()), {i: i + 1 for i in range(10)})
+        saved.destroy()
+
+        recreated = self.session.parallelize(((i, i * 10) for i in range(5)), partition=2, include_key=True) \
+            .save_as(name, namespace)
+        self.assertEqual(dict(recreated.mapValues(lambda v: v + 1).collect()), {i: i * 10 + 1 for i in range(5)})
+
+
+class TestWorkerEnvCache(unittest.TestCase):
+    def setUp(self):
+        self.data_dir = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        for key in list(_standalone._worker_envs):
+            _standalone._close_worker_env(key)
+        shutil.rmtree(self.data_dir)
+
+    def env(self, name):
+        return _standalone._cached_env(self.data_dir.joinpath(name))
+
+    def test_reused(self):
+        with self.env("a") as env:
+            with env.begin(write=True) as txn:
+                txn.put(b"k", b"v")
+        with self.env("a") as reused:
+            self.assertIs(reused, env)
+            with reused.begin() as txn:
+                self.assertEqual(txn.get(b"k"), b"v")
+
+    def test_reopened_if_replaced(self):
+        with self.env("a") as env:
+            with env.begin(write=True) as txn:
+                txn.put(b"k", b"v")
+        shutil.rmtree(self.data_dir.joinpath("a"))
+        with self.env("a") as reopened:
+            self.assertIsNot(reopened, env)
+            with reopened.begin() as txn:
+                self.assertIsNone(txn.get(b"k"))
+
+    def test_bounded(self):
+        with mock.patch.object(_standalone, "_WORKER_ENV_CACHE_SIZE", 2):
+            with self.env("a"), self.env("b"), self.env("c"):
+                # environments in use are kept beyond cache size
+                self.assertEqual(len(_standalone._worker_envs), 3)
+            with self.env("b"):
+                pass
+            with self.env("d"):
+                self.assertListEqual([Path(k).name for k in _standalone._worker_envs], ["b", "d"])
+
+
+if __name__ == '__main__':
+    unittest.main()
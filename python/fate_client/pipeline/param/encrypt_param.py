@@ -36,12 +36,18 @@ class EncryptParam(BaseParam):
     key_length : int, default: 1024
         Used to specify the length of key in this encryption method.
 
+    fixed_base_obfuscator : bool, default: False
+        Only for Paillier. If True, random obfuscators of encryption are generated as hs ** a mod n^2
+        (Damgard-Jurik-Nielsen variant) from a precomputed fixed-base table, instead of r ** n mod n^2,
+        which replaces a full modular exponentiation by a few modular multiplications per encryption.
+
     """
 
-    def __init__(self, method=consts.PAILLIER, key_length=1024):
+    def __init__(self, method=consts.PAILLIER, key_length=1024, fixed_base_obfuscator=False):
         super(EncryptParam, self).__init__()
         self.method = method
         self.key_length = key_length
+        self.fixed_base_obfuscator = fixed_base_obfuscator
 
     def check(self):
         if self.method is not None and type(self.method).__name__ != "str":
@@ -69,4 +75,9 @@ class EncryptParam(BaseParam):
             raise ValueError(
                 "encrypt_param's key_length must be greater or equal to 1")
 
+        if type(self.fixed_base_obfuscator).__name__ != "bool":
+            raise ValueError(
+                "encrypt_param's fixed_base_obfuscator {} not supported, should be bool type".format(
+                    self.fixed_base_obfuscator))
+
         return True
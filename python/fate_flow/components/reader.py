@@ -18,8 +18,8 @@
 import os
 import numpy as np
 
-from fate_arch import storage
-from fate_arch.abc import StorageTableABC, StorageTableMetaABC, AddressABC
+from fate_arch import session, storage
+from fate_arch.abc import StorageTableABC, StorageTableMetaABC, AddressABC, CTableABC
 from fate_arch.common import log, EngineType
 from fate_arch.computing import ComputingEngine
 from fate_arch.storage import StorageTableMeta, StorageEngine, Relationship
@@ -29,6 +29,8 @@ from fate_flow.components.component_base import ComponentBase
 
 LOGGER = log.getLogger()
 MAX_NUM = int(os.getenv('FATE_FLOW_UPLOAD_MAX_NUM', 10000))
+# computing engines which copy tables partition by partition on their own workers
+DISTRIBUTED_COPY_COMPUTING_ENGINES = {ComputingEngine.EGGROLL, ComputingEngine.SPARK}
 
 
 class Reader(ComponentBase):
@@ -88,7 +90,7 @@ class Reader(ComponentBase):
                                                                      name=output_table_name,
                                                                      namespace=output_table_namespace,
                                                                      partitions=input_table_meta.partitions)
-                    self.copy_table(src_table=input_table, dest_table=output_table)
+                    self.copy_table(src_table=input_table, dest_table=output_table, computing_engine=computing_engine)
                     # update real count to meta info
                     output_table.count()
                     output_table_meta = StorageTableMeta(name=output_table.get_name(), namespace=output_table.get_namespace())
@@ -183,37 +185,31 @@ class Reader(ComponentBase):
 
     def deal_linkis_hive(self, src_table: StorageTableABC, dest_table: StorageTableABC):
         from pyspark.sql import SparkSession
-        import functools
+        from pyspark.sql.functions import col, udf
+        from pyspark.sql.types import StringType
         session = SparkSession.builder.enableHiveSupport().getOrCreate()
         src_data = session.sql(f"select * from {src_table.get_address().database}.{src_table.get_address().name}")
         LOGGER.info(f"database:{src_table.get_address().database}, name:{src_table.get_address().name}")
-        LOGGER.info(f"src data: {src_data}")
-        # src_data = src_table.collect(is_spark=1)
-        src_data = src_data.toPandas().astype(str)
-        LOGGER.info(f"columns: {src_data.columns}")
         header_source_item = list(src_data.columns)
+        LOGGER.info(f"columns: {header_source_item}")
 
         id_delimiter = src_table.get_meta().get_id_delimiter()
         LOGGER.info(f"id_delimiter: {id_delimiter}")
-        LOGGER.info(f"src_data: {src_data}")
-        src_data.applymap(lambda x: str(x))
-        f = functools.partial(self.convert_join, delimitor=id_delimiter)
-        src_data["result"] = src_data.agg(f, axis=1)
-        dest_data = src_data.iloc[:,[0,-1]]
-        dest_data.columns = ["key", "value"]
-        LOGGER.info(f"dest_data: {dest_data}")
+
+        # values are joined and serialized on spark executors, rows never come to this process
+        def _convert_join(*values):
+            import pickle
+            return pickle.dumps(id_delimiter.join([str(value) for value in values])).hex()
+
+        convert_join = udf(_convert_join, StringType())
+        dest_data = src_data.select(col(header_source_item[0]).cast(StringType()).alias("key"),
+                                    convert_join(*[col(c) for c in header_source_item[1:]]).alias("value"))
         LOGGER.info(f"database:{dest_table.get_address().database}, name:{dest_table.get_address().name}")
         dest_table.put_all(dest_data)
         schema = {'header': id_delimiter.join(header_source_item[1:]).strip(), 'sid': header_source_item[0].strip()}
         dest_table.get_meta().update_metas(schema=schema)
 
-    def convert_join(self, x, delimitor=","):
-        import pickle
-        x = [str(i) for i in x]
-        return pickle.dumps(delimitor.join(x[1:])).hex()
-
-
-    def copy_table(self, src_table: StorageTableABC, dest_table: StorageTableABC):
+    def copy_table(self, src_table: StorageTableABC, dest_table: StorageTableABC, computing_engine=None):
         count = 0
         data_temp = []
         part_of_data = []
@@ -223,6 +219,10 @@ class Reader(ComponentBase):
             f"source table name: {src_table.get_name()} namespace: {src_table.get_namespace()} engine: {src_table.get_engine()}")
         LOGGER.info(
             f"destination table name: {dest_table.get_name()} namespace: {dest_table.get_namespace()} engine: {dest_table.get_engine()}")
+        if src_table_meta.get_in_serialized() and computing_engine in DISTRIBUTED_COPY_COMPUTING_ENGINES:
+            if self.copy_table_on_computing(src_table=src_table, dest_table=dest_table):
+                LOGGER.info("copy successfully")
+                return
         schema = {}
         if not src_table_meta.get_in_serialized():
             if src_table_meta.get_have_head():
@@ -249,6 +249,31 @@ class Reader(ComponentBase):
         LOGGER.info("copy successfully")
         dest_table.get_meta().update_metas(schema=schema, part_of_data=part_of_data)
 
+    def copy_table_on_computing(self, src_table: StorageTableABC, dest_table: StorageTableABC):
+        """
+        copy by loading source table on computing engine and saving it to destination address,
+        returns False if the computing engine can not load source or save destination
+        """
+        computing_session = session.get_latest_opened().computing
+        schema = src_table.get_meta().get_schema()
+        try:
+            computing_table = computing_session.load(src_table.get_address(),
+                                                     partitions=src_table.get_partitions(),
+                                                     schema=schema)
+        except NotImplementedError:
+            LOGGER.info(f"can not load {src_table.get_engine()} table on computing engine, copy by driver")
+            return False
+        if not isinstance(computing_table, CTableABC):
+            return False
+        try:
+            computing_table.save(dest_table.get_address(), partitions=dest_table.get_partitions(), schema=schema)
+        except NotImplementedError:
+            LOGGER.info(f"can not save {dest_table.get_engine()} table on computing engine, copy by driver")
+            return False
+        part_of_data = computing_table.take(100)
+        dest_table.get_meta().update_metas(schema=schema, part_of_data=part_of_data)
+        return True
+
     def put_in_table(self, table: StorageTableABC, k, v, temp, count, part_of_data):
         temp.append((k, v))
         if count < 100:
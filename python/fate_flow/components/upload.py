@@ -13,9 +13,11 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 #
+import multiprocessing
 import os
 import shutil
 import time
+from concurrent.futures import FIRST_EXCEPTION, ProcessPoolExecutor, wait
 
 from fate_arch.common import log, file_utils, EngineType, path_utils
 from fate_arch.storage import StorageEngine, EggRollStorageType
@@ -27,6 +29,77 @@ from fate_flow.components.component_base import ComponentBase
 
 LOGGER = log.getLogger()
 
+# engines whose put_all is safe to call concurrently from several processes
+PARALLEL_UPLOAD_STORAGE_ENGINES = {StorageEngine.EGGROLL, StorageEngine.STANDALONE, StorageEngine.MYSQL}
+
+# upload workers are spawned rather than forked, so that they don't share database connections of this process
+_UPLOAD_MP_CONTEXT = multiprocessing.get_context("spawn")
+
+# bytes read by all upload workers, shared with them by the pool initializer
+_upload_bytes_read = None
+
+
+def _init_upload_worker(bytes_read):
+    global _upload_bytes_read
+    _upload_bytes_read = bytes_read
+
+
+def _add_upload_bytes_read(read_bytes):
+    with _upload_bytes_read.get_lock():
+        _upload_bytes_read.value += read_bytes
+
+
+def _create_upload_executor(processes):
+    bytes_read = _UPLOAD_MP_CONTEXT.Value('q', 0)
+    executor = ProcessPoolExecutor(max_workers=processes, mp_context=_UPLOAD_MP_CONTEXT,
+                                   initializer=_init_upload_worker, initargs=(bytes_read,))
+    return executor, bytes_read
+
+
+def _split_ranges(start, end, chunk_bytes):
+    return [(offset, min(offset + chunk_bytes, end)) for offset in range(start, end, chunk_bytes)]
+
+
+def _read_range(input_file, start, end, id_delimiter, batch_bytes):
+    """
+    yield (kv list, bytes read) batches of the lines starting in byte range [start, end) of input file
+    """
+    with open(input_file, 'rb') as fin:
+        if start > 0:
+            # the line across start belongs to the previous range
+            fin.seek(start - 1)
+            start += len(fin.readline()) - 1
+        position = start
+        while position < end:
+            lines = fin.readlines(batch_bytes)
+            if not lines:
+                break
+            data = []
+            read_bytes = 0
+            for line in lines:
+                if position >= end:
+                    break
+                position += len(line)
+                read_bytes += len(line)
+                key, _, value = line.decode('utf-8').rstrip().partition(id_delimiter)
+                data.append((key, value))
+            yield data, read_bytes
+
+
+def _put_ranges(table, input_file, ranges, id_delimiter, batch_bytes, progress_callback=None):
+    for start, end in ranges:
+        for data, read_bytes in _read_range(input_file, start, end, id_delimiter, batch_bytes):
+            table.put_all(data)
+            if progress_callback:
+                progress_callback(read_bytes)
+
+
+def _upload_ranges(input_file, ranges, id_delimiter, batch_bytes, session_id, storage_engine, name, namespace, options):
+    with storage.Session.build(session_id=session_id, storage_engine=storage_engine,
+                               name=name, namespace=namespace, options=options) as storage_session:
+        table = storage_session.get_table()
+        _put_ranges(table, input_file, ranges, id_delimiter, batch_bytes, progress_callback=_add_upload_bytes_read)
+
 
 class Upload(ComponentBase):
     def __init__(self):
@@ -35,6 +108,11 @@ class Upload(ComponentBase):
         # configurable by env
         # TODO, make it configurable in config file
         self.MAX_BYTES = int(os.getenv("FATE_FLOW_UPLOAD_MAX_BYTES", 1024*1024*8))
+        # input file is cut into byte ranges of this size, which are parsed and saved by worker processes
+        self.CHUNK_BYTES = int(os.getenv("FATE_FLOW_UPLOAD_CHUNK_BYTES", 1024*1024*64))
+        self.MAX_PROCESSES = int(os.getenv("FATE_FLOW_UPLOAD_MAX_PROCESSES", min(os.cpu_count() or 1, 8)))
+        self.PROGRESS_INTERVAL = 5  # seconds
+        self.progress = None
         self.parameters = {}
         self.table = None
 
@@ -124,42 +202,65 @@ class Upload(ComponentBase):
 
     def save_data_table(self, job_id, dst_table_name, dst_table_namespace, head=True):
         input_file = self.parameters["file"]
-        input_feature_count = self.get_count(input_file)
+        id_delimiter = self.parameters["id_delimiter"]
         with open(input_file, 'r') as fin:
-            lines_count = 0
             if head is True:
                 data_head = fin.readline()
-                input_feature_count -= 1
-                _, meta = self.table.get_meta().update_metas(schema=data_utils.get_header_schema(header_line=data_head, id_delimiter=self.parameters["id_delimiter"]))
+                _, meta = self.table.get_meta().update_metas(schema=data_utils.get_header_schema(header_line=data_head, id_delimiter=id_delimiter))
                 self.table.set_meta(meta)
-            n = 0
-            while True:
-                data = list()
-                lines = fin.readlines(self.MAX_BYTES)
-                if lines:
-                    for line in lines:
-                        values = line.rstrip().split(self.parameters["id_delimiter"])
-                        data.append((values[0], data_utils.list_to_str(values[1:], id_delimiter=self.parameters["id_delimiter"])))
-                    lines_count += len(data)
-                    save_progress = lines_count/input_feature_count*100//1
-                    job_info = {'progress': save_progress, "job_id": job_id, "role": self.parameters["local"]['role'], "party_id": self.parameters["local"]['party_id']}
-                    ControllerClient.update_job(job_info=job_info)
-                    self.table.put_all(data)
-                    if n == 0:
-                        self.table.get_meta().update_metas(part_of_data=data)
-                else:
-                    table_count = self.table.count()
-                    self.table.get_meta().update_metas(count=table_count, partitions=self.parameters["partition"])
-                    self.save_meta(dst_table_namespace=dst_table_namespace, dst_table_name=dst_table_name, table_count=table_count)
-                    return table_count
-                n += 1
-
-    def get_count(self, input_file):
-        with open(input_file, 'r', encoding='utf-8') as fp:
-            count = 0
-            for line in fp:
-                count += 1
-        return count
+            part_of_data = []
+            for line in fin:
+                values = line.rstrip().split(id_delimiter)
+                part_of_data.append((values[0], data_utils.list_to_str(values[1:], id_delimiter=id_delimiter)))
+                if len(part_of_data) >= 100:
+                    break
+        if part_of_data:
+            self.table.get_meta().update_metas(part_of_data=part_of_data)
+        with open(input_file, 'rb') as fin:
+            if head is True:
+                fin.readline()
+            data_offset = fin.tell()
+        file_size = os.path.getsize(input_file)
+        ranges = _split_ranges(data_offset, file_size, self.CHUNK_BYTES)
+        processes = min(self.MAX_PROCESSES, len(ranges))
+        total_bytes = file_size - data_offset
+        if processes > 1 and self.table.get_engine() in PARALLEL_UPLOAD_STORAGE_ENGINES:
+            LOGGER.info(f"upload {total_bytes} bytes in {len(ranges)} chunks by {processes} processes")
+            executor, bytes_read = _create_upload_executor(processes)
+            with executor:
+                futures = [executor.submit(_upload_ranges, input_file, ranges[i::processes], id_delimiter, self.MAX_BYTES,
+                                           job_utils.generate_session_id(self.tracker.task_id, self.tracker.task_version, self.tracker.role, self.tracker.party_id, suffix=f"upload_{i}", random_end=True),
+                                           self.table.get_engine(), dst_table_name, dst_table_namespace, self.parameters.get("options"))
+                           for i in range(processes)]
+                while True:
+                    done, not_done = wait(futures, timeout=self.PROGRESS_INTERVAL, return_when=FIRST_EXCEPTION)
+                    self.update_progress(job_id, bytes_read.value, total_bytes)
+                    for future in done:
+                        # raise the error of the worker
+                        future.result()
+                    if not not_done:
+                        break
+        else:
+            bytes_read = 0
+
+            def _update_progress(read_bytes):
+                nonlocal bytes_read
+                bytes_read += read_bytes
+                self.update_progress(job_id, bytes_read, total_bytes)
+
+            _put_ranges(self.table, input_file, ranges, id_delimiter, self.MAX_BYTES, progress_callback=_update_progress)
+        table_count = self.table.count()
+        self.table.get_meta().update_metas(count=table_count, partitions=self.parameters["partition"])
+        self.save_meta(dst_table_namespace=dst_table_namespace, dst_table_name=dst_table_name, table_count=table_count)
+        return table_count
+
+    def update_progress(self, job_id, bytes_read, total_bytes):
+        save_progress = bytes_read/total_bytes*100//1 if total_bytes else 100
+        if save_progress == self.progress:
+            return
+        self.progress = save_progress
+        job_info = {'progress': save_progress, "job_id": job_id, "role": self.parameters["local"]['role'], "party_id": self.parameters["local"]['party_id']}
+        ControllerClient.update_job(job_info=job_info)
 
     def generate_table_name(self, input_file_path):
         str_time = time.strftime("%Y%m%d%H%M%S", time.localtime())
@@ -49,7 +49,8 @@ from fate_flow.scheduler.dag_scheduler import DAGScheduler
 from fate_flow.entity.runtime_config import RuntimeConfig
 from fate_flow.entity.types import ProcessRole
 from fate_flow.manager.resource_manager import ResourceManager
-from fate_flow.settings import IP, HTTP_PORT, GRPC_PORT, _ONE_DAY_IN_SECONDS, stat_logger, detect_logger, API_VERSION, GRPC_SERVER_MAX_WORKERS
+from fate_flow.settings import IP, HTTP_PORT, GRPC_PORT, _ONE_DAY_IN_SECONDS, stat_logger, detect_logger, API_VERSION, GRPC_SERVER_MAX_WORKERS, \
+    DAG_SCHEDULER_EVENT_DRIVEN, DAG_SCHEDULER_INTERVAL, DAG_SCHEDULER_CONSISTENCY_CHECK_INTERVAL
 from fate_flow.utils.api_utils import get_json_result
 from fate_flow.utils.authentication_utils import PrivilegeAuth
 from fate_flow.utils.grpc_utils import UnaryService
@@ -119,7 +120,11 @@ if __name__ == '__main__':
 
     ResourceManager.initialize()
     Detector(interval=5 * 1000, logger=detect_logger).start()
-    DAGScheduler(interval=2 * 1000, logger=schedule_logger()).start()
+    if DAG_SCHEDULER_EVENT_DRIVEN:
+        DAGScheduler(interval=DAG_SCHEDULER_CONSISTENCY_CHECK_INTERVAL, first_interval=DAG_SCHEDULER_INTERVAL,
+                     logger=schedule_logger()).start()
+    else:
+        DAGScheduler(interval=DAG_SCHEDULER_INTERVAL, logger=schedule_logger()).start()
     thread_pool_executor = ThreadPoolExecutor(max_workers=GRPC_SERVER_MAX_WORKERS)
     stat_logger.info(f"start grpc server thread pool by {thread_pool_executor._max_workers} max workers")
     server = grpc.server(thread_pool=thread_pool_executor,
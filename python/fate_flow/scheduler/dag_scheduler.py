@@ -13,10 +13,11 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 #
+import threading
 
 from fate_arch.common.base_utils import json_loads, json_dumps, current_timestamp
 from fate_arch.common.log import schedule_logger
-from fate_arch.common import WorkMode
+from fate_arch.common import WorkMode, FederatedCommunicationType
 from fate_flow.db.db_models import DB, Job
 from fate_flow.scheduler.federated_scheduler import FederatedScheduler
 from fate_flow.scheduler.task_scheduler import TaskScheduler
@@ -29,10 +30,21 @@ from fate_flow.utils import detect_utils, job_utils, schedule_utils, authenticat
 from fate_flow.utils.config_adapter import JobRuntimeConfigAdapter
 from fate_flow.utils import model_utils
 from fate_flow.utils.cron import Cron
-from fate_flow.settings import END_STATUS_JOB_SCHEDULING_TIME_LIMIT, END_STATUS_JOB_SCHEDULING_UPDATES
+from fate_flow.settings import END_STATUS_JOB_SCHEDULING_TIME_LIMIT, END_STATUS_JOB_SCHEDULING_UPDATES, \
+    DAG_SCHEDULER_EVENT_DRIVEN, DAG_SCHEDULER_RETRY_INTERVAL
 
 
 class DAGScheduler(Cron):
+    # job ids whose status changed since the last scheduling, in report order
+    _events = {}
+    _events_condition = threading.Condition()
+
+    def __init__(self, *args, **kwargs):
+        super(DAGScheduler, self).__init__(*args, **kwargs)
+        # jobs without status reports are retried in between the periodic runs, by the scheduler thread only
+        self._retry_jobs = {}
+        self._waiting_retry_time = None
+
     @classmethod
     def submit(cls, job_data, job_id=None):
         if not job_id:
@@ -128,12 +140,115 @@ class DAGScheduler(Cron):
             "board_url": job_utils.get_board_url(job_id, job_initiator['role'], job_initiator['party_id'])
         }
         submit_result.update(path_dict)
+        cls.notify(job_id=job_id)
         return submit_result
 
-    def run_do(self):
-        schedule_logger().info("start schedule waiting jobs")
+    @classmethod
+    def notify(cls, job_id):
+        """
+        mark the job to be scheduled at once, called when the status of the job or its tasks changed
+        """
+        with cls._events_condition:
+            cls._events[job_id] = None
+            cls._events_condition.notify()
+
+    @classmethod
+    def take_events(cls, timeout=None):
+        with cls._events_condition:
+            if not cls._events and timeout != 0:
+                cls._events_condition.wait(timeout)
+            job_ids = list(cls._events.keys())
+            cls._events.clear()
+        return job_ids
+
+    def wait(self, timeout):
+        if not DAG_SCHEDULER_EVENT_DRIVEN:
+            return super(DAGScheduler, self).wait(timeout)
+        # reported jobs and jobs due to be retried are scheduled at once in between the periodic runs
+        deadline = current_timestamp() + timeout * 1000
+        while not self.finished.is_set():
+            now = current_timestamp()
+            if now >= deadline:
+                break
+            retry_time = self.next_retry_time()
+            wake_time = deadline if retry_time is None else min(deadline, retry_time)
+            job_ids = self.take_events(timeout=max(wake_time - now, 0) / 1000)
+            retry_job_ids, schedule_waiting = self.take_retries()
+            job_ids += [job_id for job_id in retry_job_ids if job_id not in job_ids]
+            if (not job_ids and not schedule_waiting) or self.finished.is_set():
+                continue
+            if self.lock and not self.lock.acquire(0):
+                continue
+            try:
+                self.run_events(job_ids=job_ids, schedule_waiting=schedule_waiting)
+            except Exception as e:
+                if self.logger:
+                    self.logger.exception(e)
+                else:
+                    raise e
+            finally:
+                if self.lock:
+                    self.lock.release()
+
+    def next_retry_time(self):
+        retry_times = list(self._retry_jobs.values())
+        if self._waiting_retry_time is not None:
+            retry_times.append(self._waiting_retry_time)
+        return min(retry_times) if retry_times else None
+
+    def take_retries(self):
+        now = current_timestamp()
+        job_ids = [job_id for job_id, retry_time in self._retry_jobs.items() if retry_time <= now]
+        for job_id in job_ids:
+            del self._retry_jobs[job_id]
+        schedule_waiting = self._waiting_retry_time is not None and self._waiting_retry_time <= now
+        if schedule_waiting:
+            self._waiting_retry_time = None
+        return job_ids, schedule_waiting
+
+    def retry_if_pulling(self, job):
+        if DAG_SCHEDULER_EVENT_DRIVEN and \
+                job.f_runtime_conf_on_party["job_parameters"]["federated_status_collect_type"] == \
+                FederatedCommunicationType.PULL:
+            self._retry_jobs[job.f_job_id] = current_timestamp() + DAG_SCHEDULER_RETRY_INTERVAL
+
+    def run_events(self, job_ids, schedule_waiting=False):
+        for job_id in job_ids:
+            jobs = JobSaver.query_job(job_id=job_id, is_initiator=True)
+            if not jobs:
+                continue
+            job = jobs[0]
+            if job.f_rerun_signal:
+                schedule_logger(job_id).info(f"schedule rerun job {job_id} by event")
+                self.try_schedule(job, self.schedule_rerun_job)
+            elif job.f_status == JobStatus.RUNNING:
+                schedule_logger(job_id).info(f"schedule running job {job_id} by event")
+                self.try_schedule(job, self.schedule_running_job)
+                self.retry_if_pulling(job)
+            elif job.f_status == JobStatus.WAITING:
+                schedule_waiting = True
+            elif EndStatus.contains(job.f_status) and job.f_end_time and \
+                    current_timestamp() - job.f_end_time <= END_STATUS_JOB_SCHEDULING_TIME_LIMIT:
+                schedule_logger(job_id).info(f"schedule end status job {job_id} by event")
+                self.try_schedule(job, self.schedule_end_status_job)
+                # resources of the ended job may unblock the waiting head
+                schedule_waiting = True
+        if schedule_waiting:
+            self.schedule_waiting_head()
+
+    @classmethod
+    def try_schedule(cls, job, schedule_func):
+        try:
+            schedule_func(job=job)
+        except Exception as e:
+            schedule_logger(job.f_job_id).exception(e)
+            schedule_logger(job.f_job_id).error(f"schedule job {job.f_job_id} failed")
+
+    def schedule_waiting_head(self):
         jobs = JobSaver.query_job(is_initiator=True, status=JobStatus.WAITING, order_by="create_time", reverse=False)
         schedule_logger().info(f"have {len(jobs)} waiting jobs")
+        # waiting jobs may be blocked by resources of other parties, which are not reported
+        self._waiting_retry_time = current_timestamp() + DAG_SCHEDULER_RETRY_INTERVAL if len(jobs) else None
         if len(jobs):
             # FIFO
             job = jobs[0]
@@ -143,6 +258,12 @@ class DAGScheduler(Cron):
             except Exception as e:
                 schedule_logger(job.f_job_id).exception(e)
                 schedule_logger(job.f_job_id).error(f"schedule waiting job {job.f_job_id} failed")
+
+    def run_do(self):
+        # jobs reported so far are all covered by this run
+        self.take_events(timeout=0)
+        schedule_logger().info("start schedule waiting jobs")
+        self.schedule_waiting_head()
         schedule_logger().info("schedule waiting jobs finished")
 
         schedule_logger().info("start schedule running jobs")
@@ -155,6 +276,7 @@ class DAGScheduler(Cron):
             except Exception as e:
                 schedule_logger(job.f_job_id).exception(e)
                 schedule_logger(job.f_job_id).error(f"schedule job {job.f_job_id} failed")
+            self.retry_if_pulling(job)
         schedule_logger().info("schedule running jobs finished")
 
         # some ready job exit before start
@@ -187,17 +309,17 @@ class DAGScheduler(Cron):
         schedule_logger().info(f"have {len(jobs)} end status jobs")
         for job in jobs:
             schedule_logger().info(f"schedule end status job {job.f_job_id}")
-            try:
-                update_status = self.end_scheduling_updates(job_id=job.f_job_id)
-                if not update_status:
-                    schedule_logger(job.f_job_id).info(f"the number of updates has been exceeded")
-                    continue
-                self.schedule_running_job(job=job, force_sync_status=True)
-            except Exception as e:
-                schedule_logger(job.f_job_id).exception(e)
-                schedule_logger(job.f_job_id).error(f"schedule job {job.f_job_id} failed")
+            self.try_schedule(job, self.schedule_end_status_job)
         schedule_logger().info("schedule end status jobs finished")
 
+    @classmethod
+    def schedule_end_status_job(cls, job):
+        update_status = cls.end_scheduling_updates(job_id=job.f_job_id)
+        if not update_status:
+            schedule_logger(job.f_job_id).info(f"the number of updates has been exceeded")
+            return
+        cls.schedule_running_job(job=job, force_sync_status=True)
+
     @classmethod
     def schedule_waiting_jobs(cls, job):
         job_id, initiator_role, initiator_party_id, = job.f_job_id, job.f_initiator_role, job.f_initiator_party_id,
@@ -213,6 +335,7 @@ class DAGScheduler(Cron):
             apply_status_code, federated_response = FederatedScheduler.resource_for_job(job=job, operation_type=ResourceOperation.APPLY)
             if apply_status_code == FederatedSchedulingStatusCode.SUCCESS:
                 cls.start_job(job_id=job_id, initiator_role=initiator_role, initiator_party_id=initiator_party_id)
+                cls.notify(job_id=job_id)
             else:
                 # rollback resource
                 rollback_party = {}
@@ -369,6 +492,7 @@ class DAGScheduler(Cron):
             schedule_logger(job_id=job_id).info(f"job {job_id} set rerun signal")
             status = cls.rerun_signal(job_id=job_id, set_or_reset=True)
             if status:
+                cls.notify(job_id=job_id)
                 schedule_logger(job_id=job_id).info(f"job {job_id} set rerun signal successfully")
             else:
                 schedule_logger(job_id=job_id).info(f"job {job_id} set rerun signal failed")
@@ -446,6 +570,7 @@ class DAGScheduler(Cron):
             job.f_status = stop_status
             schedule_logger(job_id=job_id).info(f"request stop job {job_id} with {stop_status} to all party")
             status_code, response = FederatedScheduler.stop_job(job=jobs[0], stop_status=stop_status)
+            cls.notify(job_id=job_id)
             if status_code == FederatedSchedulingStatusCode.SUCCESS:
                 schedule_logger(job_id=job_id).info(f"stop job {job_id} with {stop_status} successfully")
                 return RetCode.SUCCESS, "success"
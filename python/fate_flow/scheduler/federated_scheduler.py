@@ -14,8 +14,11 @@
 #  limitations under the License.
 #
 
-from fate_flow.settings import DEFAULT_FEDERATED_COMMAND_TRYS
+import time
+
+from fate_flow.settings import DEFAULT_FEDERATED_COMMAND_TRYS, FEDERATED_COMMAND_PARTY_TIMEOUT
 from fate_flow.utils.api_utils import federated_api
+from fate_flow.utils.xthread import ThreadPoolExecutor
 from fate_arch.common.log import schedule_logger
 from fate_flow.entity.types import RetCode, FederatedSchedulingStatusCode
 from fate_flow.db.db_models import Job, Task
@@ -28,7 +31,6 @@ class FederatedScheduler(object):
     Send commands to party,
     Report info to initiator
     """
-
     # Job
     @classmethod
     def create_job(cls, job: Job):
@@ -127,38 +129,33 @@ class FederatedScheduler(object):
             api_type = "party"
         if order_federated:
             dest_partys = schedule_utils.federated_order_reset(dest_partys, scheduler_partys_info=[(job.f_initiator_role, job.f_initiator_party_id)])
-        for dest_role, dest_party_ids in dest_partys:
-            federated_response[dest_role] = {}
-            for dest_party_id in dest_party_ids:
-                try:
-                    response = federated_api(job_id=job.f_job_id,
-                                             method='POST',
-                                             endpoint='/{}/{}/{}/{}/{}'.format(
-                                                 api_type,
-                                                 job.f_job_id,
-                                                 dest_role,
-                                                 dest_party_id,
-                                                 command
-                                             ),
-                                             src_party_id=job.f_party_id,
-                                             dest_party_id=dest_party_id,
-                                             src_role=job.f_role,
-                                             json_body=command_body if command_body else {},
-                                             federated_mode=job_parameters["federated_mode"])
-                    federated_response[dest_role][dest_party_id] = response
-                except Exception as e:
-                    schedule_logger(job_id=job.f_job_id).exception(e)
-                    federated_response[dest_role][dest_party_id] = {
-                        "retcode": RetCode.FEDERATED_ERROR,
-                        "retmsg": "Federated schedule error, {}".format(e)
-                    }
-                if federated_response[dest_role][dest_party_id]["retcode"]:
-                    schedule_logger(job_id=job.f_job_id).warning("an error occurred while {} the job to role {} party {}: \n{}".format(
-                        command,
-                        dest_role,
-                        dest_party_id,
-                        federated_response[dest_role][dest_party_id]["retmsg"]
-                    ))
+            # the scheduler party is moved to the end, and is only requested after all the other parties respond
+            scheduler_party = (job.f_initiator_role, [job.f_initiator_party_id])
+            phases = [[dest for dest in dest_partys if dest != scheduler_party],
+                      [dest for dest in dest_partys if dest == scheduler_party]]
+        else:
+            phases = [list(dest_partys)]
+        for phase_dest_partys in phases:
+            requests = []
+            for dest_role, dest_party_ids in phase_dest_partys:
+                federated_response.setdefault(dest_role, {})
+                for dest_party_id in dest_party_ids:
+                    requests.append((dest_role, dest_party_id, dict(job_id=job.f_job_id,
+                                                                    method='POST',
+                                                                    endpoint='/{}/{}/{}/{}/{}'.format(
+                                                                        api_type,
+                                                                        job.f_job_id,
+                                                                        dest_role,
+                                                                        dest_party_id,
+                                                                        command
+                                                                    ),
+                                                                    src_party_id=job.f_party_id,
+                                                                    dest_party_id=dest_party_id,
+                                                                    src_role=job.f_role,
+                                                                    json_body=dict(command_body) if command_body else {},
+                                                                    federated_mode=job_parameters["federated_mode"])))
+            cls.federated_requests(job_id=job.f_job_id, command=command, target="job", requests=requests,
+                                   federated_response=federated_response)
         return cls.return_federated_response(federated_response=federated_response)
 
     # Task
@@ -225,44 +222,35 @@ class FederatedScheduler(object):
         dsl_parser = schedule_utils.get_job_dsl_parser(dsl=job.f_dsl, runtime_conf=job.f_runtime_conf_on_party, train_runtime_conf=job.f_train_runtime_conf)
         component = dsl_parser.get_component_info(component_name=task.f_component_name)
         component_parameters = component.get_role_parameters()
+        requests = []
         for dest_role, parameters_on_partys in component_parameters.items():
             federated_response[dest_role] = {}
             for parameters_on_party in parameters_on_partys:
                 dest_party_id = parameters_on_party.get('local', {}).get('party_id')
-                try:
-                    if need_user:
-                        command_body["user_id"] = job.f_user.get(dest_role, {}).get(str(dest_party_id), "")
-                        schedule_logger(job_id=job.f_job_id).info(f'user:{job.f_user}, dest_role:{dest_role}, dest_party_id:{dest_party_id}')
-                        schedule_logger(job_id=job.f_job_id).info(f'command_body: {command_body}')
-                    response = federated_api(job_id=task.f_job_id,
-                                             method='POST',
-                                             endpoint='/party/{}/{}/{}/{}/{}/{}/{}'.format(
-                                                 task.f_job_id,
-                                                 task.f_component_name,
-                                                 task.f_task_id,
-                                                 task.f_task_version,
-                                                 dest_role,
-                                                 dest_party_id,
-                                                 command
-                                             ),
-                                             src_party_id=job.f_initiator_party_id,
-                                             dest_party_id=dest_party_id,
-                                             src_role=job.f_initiator_role,
-                                             json_body=command_body if command_body else {},
-                                             federated_mode=job_parameters["federated_mode"])
-                    federated_response[dest_role][dest_party_id] = response
-                except Exception as e:
-                    federated_response[dest_role][dest_party_id] = {
-                        "retcode": RetCode.FEDERATED_ERROR,
-                        "retmsg": "Federated schedule error, {}".format(str(e))
-                    }
-                if federated_response[dest_role][dest_party_id]["retcode"]:
-                    schedule_logger(job_id=job.f_job_id).warning("an error occurred while {} the task to role {} party {}: \n{}".format(
-                        command,
-                        dest_role,
-                        dest_party_id,
-                        federated_response[dest_role][dest_party_id]["retmsg"]
-                    ))
+                # each party gets its own copy of body, which is modified by federated api
+                json_body = dict(command_body) if command_body else {}
+                if need_user:
+                    json_body["user_id"] = job.f_user.get(dest_role, {}).get(str(dest_party_id), "")
+                    schedule_logger(job_id=job.f_job_id).info(f'user:{job.f_user}, dest_role:{dest_role}, dest_party_id:{dest_party_id}')
+                    schedule_logger(job_id=job.f_job_id).info(f'command_body: {json_body}')
+                requests.append((dest_role, dest_party_id, dict(job_id=task.f_job_id,
+                                                                method='POST',
+                                                                endpoint='/party/{}/{}/{}/{}/{}/{}/{}'.format(
+                                                                    task.f_job_id,
+                                                                    task.f_component_name,
+                                                                    task.f_task_id,
+                                                                    task.f_task_version,
+                                                                    dest_role,
+                                                                    dest_party_id,
+                                                                    command
+                                                                ),
+                                                                src_party_id=job.f_initiator_party_id,
+                                                                dest_party_id=dest_party_id,
+                                                                src_role=job.f_initiator_role,
+                                                                json_body=json_body,
+                                                                federated_mode=job_parameters["federated_mode"])))
+        cls.federated_requests(job_id=job.f_job_id, command=command, target="task", requests=requests,
+                               federated_response=federated_response)
         return cls.return_federated_response(federated_response=federated_response)
 
     @classmethod
@@ -318,6 +306,41 @@ class FederatedScheduler(object):
         return response
 
     # Utils
+    @classmethod
+    def federated_requests(cls, job_id, command, target, requests, federated_response):
+        """
+        Send federated requests to all parties concurrently and wait for all of them
+        :param requests: list of (dest_role, dest_party_id, federated_api kwargs)
+        :param federated_response: filled with response of each party
+        """
+        if not requests:
+            return federated_response
+        # one thread per party, so that every request starts at once and the timeout covers the request only
+        executor = ThreadPoolExecutor(max_workers=len(requests), thread_name_prefix="federated_command")
+        futures = [(dest_role, dest_party_id, executor.submit(federated_api, **kwargs))
+                   for dest_role, dest_party_id, kwargs in requests]
+        executor.shutdown(wait=False)
+        deadline = time.time() + FEDERATED_COMMAND_PARTY_TIMEOUT / 1000
+        for dest_role, dest_party_id, future in futures:
+            try:
+                response = future.result(timeout=max(deadline - time.time(), 0))
+            except Exception as e:
+                schedule_logger(job_id=job_id).exception(e)
+                response = {
+                    "retcode": RetCode.FEDERATED_ERROR,
+                    "retmsg": "Federated schedule error, {}".format(e)
+                }
+            federated_response.setdefault(dest_role, {})[dest_party_id] = response
+            if response["retcode"]:
+                schedule_logger(job_id=job_id).warning("an error occurred while {} the {} to role {} party {}: \n{}".format(
+                    command,
+                    target,
+                    dest_role,
+                    dest_party_id,
+                    response["retmsg"]
+                ))
+        return federated_response
+
     @classmethod
     def return_federated_response(cls, federated_response):
         retcode_set = set()
@@ -19,6 +19,7 @@ from flask import Flask, request
 from fate_flow.entity.types import RetCode
 from fate_flow.controller.job_controller import JobController
 from fate_flow.controller.task_controller import TaskController
+from fate_flow.scheduler.dag_scheduler import DAGScheduler
 from fate_flow.settings import stat_logger
 from fate_flow.utils.api_utils import get_json_result
 from fate_flow.utils.authentication_utils import request_authority_certification
@@ -153,6 +154,8 @@ def report_task(job_id, component_name, task_id, task_version, role, party_id):
     if task_info.get("party_status"):
         if not TaskController.update_task_status(task_info=task_info):
             return get_json_result(retcode=RetCode.OPERATING_ERROR, retmsg="update task status failed")
+        # the job is scheduled here if this party is the initiator
+        DAGScheduler.notify(job_id=job_id)
     return get_json_result(retcode=0, retmsg='success')
 
 
@@ -85,10 +85,19 @@ SUPPORT_BACKENDS_ENTRANCE = {
 # Scheduling
 DEFAULT_REMOTE_REQUEST_TIMEOUT = 30 * 1000  # ms
 DEFAULT_FEDERATED_COMMAND_TRYS = 3
+# ms, waiting limit of a command to one party, covers retries inside one federated request
+FEDERATED_COMMAND_PARTY_TIMEOUT = 4 * DEFAULT_REMOTE_REQUEST_TIMEOUT
 JOB_DEFAULT_TIMEOUT = 3 * 24 * 60 * 60
 JOB_START_TIMEOUT = 60 * 1000  # ms
 END_STATUS_JOB_SCHEDULING_TIME_LIMIT = 5 * 60 * 1000  # ms
 END_STATUS_JOB_SCHEDULING_UPDATES = 1
+# also schedule initiator jobs at once when their status changes are reported, in between the periodic runs
+DAG_SCHEDULER_EVENT_DRIVEN = True
+DAG_SCHEDULER_INTERVAL = 2 * 1000  # ms
+# with event driven scheduling, the periodic run over all jobs is only a consistency check for missed reports
+DAG_SCHEDULER_CONSISTENCY_CHECK_INTERVAL = 60 * 1000  # ms
+# waiting jobs and running jobs collecting status by pulling have no reports, they are retried at this interval
+DAG_SCHEDULER_RETRY_INTERVAL = 2 * 1000  # ms
 
 # Endpoint
 FATE_FLOW_MODEL_TRANSFER_ENDPOINT = "/v1/model/transfer"
@@ -0,0 +1,46 @@
+import unittest
+from unittest import mock
+
+from fate_arch.abc import CTableABC
+from fate_arch.computing import ComputingEngine
+from fate_flow.components import reader
+from fate_flow.components.reader import Reader
+
+
+class TestReaderCopyTable(unittest.TestCase):
+    def setUp(self):
+        self.schema = {"header": "x0,x1,x2", "sid": "id"}
+        self.src_table = mock.MagicMock()
+        self.src_table.get_meta().get_schema.return_value = self.schema
+        self.src_table.get_meta().get_in_serialized.return_value = True
+        self.dest_table = mock.MagicMock()
+        self.computing_table = mock.MagicMock(spec=CTableABC)
+        self.computing_table.take.return_value = [("0", "1,2,3")]
+        patcher = mock.patch.object(reader, "session")
+        self.session = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.session.get_latest_opened().computing.load.return_value = self.computing_table
+
+    def test_copy_table_on_computing_keeps_schema(self):
+        Reader().copy_table(src_table=self.src_table, dest_table=self.dest_table,
+                            computing_engine=ComputingEngine.EGGROLL)
+        self.session.get_latest_opened().computing.load.assert_called_once_with(
+            self.src_table.get_address(), partitions=self.src_table.get_partitions(), schema=self.schema)
+        self.computing_table.save.assert_called_once_with(
+            self.dest_table.get_address(), partitions=self.dest_table.get_partitions(), schema=self.schema)
+        self.dest_table.get_meta().update_metas.assert_called_once_with(schema=self.schema,
+                                                                        part_of_data=[("0", "1,2,3")])
+        self.src_table.collect.assert_not_called()
+
+    def test_copy_table_by_driver(self):
+        self.computing_table.save.side_effect = NotImplementedError
+        self.src_table.collect.return_value = [("0", "1,2,3"), ("1", "4,5,6")]
+        Reader().copy_table(src_table=self.src_table, dest_table=self.dest_table,
+                            computing_engine=ComputingEngine.EGGROLL)
+        self.dest_table.put_all.assert_called_once_with([("0", "1,2,3"), ("1", "4,5,6")])
+        self.dest_table.get_meta().update_metas.assert_called_once_with(
+            schema=self.schema, part_of_data=[("0", "1,2,3"), ("1", "4,5,6")])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import os
+import random
+import shutil
+import tempfile
+import unittest
+from concurrent.futures import wait
+
+from fate_flow.components import upload
+from fate_flow.components.upload import _create_upload_executor, _put_ranges, _read_range, _split_ranges
+
+
+class ListTable(object):
+    def __init__(self):
+        self.data = []
+
+    def put_all(self, kv_list):
+        self.data.extend(kv_list)
+
+
+def put_ranges_in_worker(input_file, ranges, batch_bytes):
+    table = ListTable()
+    _put_ranges(table, input_file, ranges, ",", batch_bytes, progress_callback=upload._add_upload_bytes_read)
+    return table.data
+
+
+class TestUploadRanges(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.input_file = os.path.join(self.temp_dir, "data.csv")
+        self.data = [(f"id_{i}", ",".join(str(random.random()) for _ in range(random.randint(0, 20))))
+                     for i in range(500)]
+        with open(self.input_file, "w") as fout:
+            fout.write("id,x\n")
+            for key, value in self.data:
+                fout.write(f"{key},{value}\n")
+        self.head_bytes = len("id,x\n")
+        self.file_size = os.path.getsize(self.input_file)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_split_ranges(self):
+        for chunk_bytes in [1, 7, 100, 4096, self.file_size]:
+            ranges = _split_ranges(self.head_bytes, self.file_size, chunk_bytes)
+            self.assertEqual(ranges[0][0], self.head_bytes)
+            self.assertEqual(ranges[-1][1], self.file_size)
+            self.assertTrue(all(end == next_start for (_, end), (next_start, _) in zip(ranges, ranges[1:])))
+            data, total_bytes = [], 0
+            for start, end in ranges:
+                for batch, read_bytes in _read_range(self.input_file, start, end, ",", batch_bytes=64):
+                    data.extend(batch)
+                    total_bytes += read_bytes
+            # every line is read once, by the range it starts in
+            self.assertListEqual(data, self.data)
+            self.assertEqual(total_bytes, self.file_size - self.head_bytes)
+
+    def test_upload_workers(self):
+        processes = 3
+        ranges = _split_ranges(self.head_bytes, self.file_size, 1000)
+        executor, bytes_read = _create_upload_executor(processes)
+        with executor:
+            futures = [executor.submit(put_ranges_in_worker, self.input_file, ranges[i::processes], 256)
+                       for i in range(processes)]
+            wait(futures)
+        data = [kv for future in futures for kv in future.result()]
+        self.assertListEqual(sorted(data), sorted(self.data))
+        self.assertEqual(bytes_read.value, self.file_size - self.head_bytes)
+
+    def test_workers_are_spawned(self):
+        # forked workers would share the pooled database connections of the task process
+        self.assertEqual(upload._UPLOAD_MP_CONTEXT.get_start_method(), "spawn")
+
+
+if __name__ == '__main__':
+    unittest.main()
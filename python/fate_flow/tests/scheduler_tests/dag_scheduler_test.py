@@ -0,0 +1,163 @@
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from fate_arch.common import FederatedCommunicationType
+from fate_arch.common.base_utils import current_timestamp
+from fate_flow.entity.types import JobStatus
+from fate_flow.scheduler.dag_scheduler import DAGScheduler
+
+
+def fake_job(job_id, status, collect_type=FederatedCommunicationType.PUSH):
+    return SimpleNamespace(f_job_id=job_id, f_status=status, f_rerun_signal=False, f_end_time=None,
+                           f_runtime_conf_on_party={"job_parameters": {"federated_status_collect_type": collect_type}})
+
+
+class TestDAGSchedulerCron(unittest.TestCase):
+    def setUp(self):
+        DAGScheduler.take_events(timeout=0)
+        self.run_do_times = []
+        self.events = []
+
+        def _run_events(scheduler, job_ids, schedule_waiting=False):
+            self.events.append((time.time(), job_ids, schedule_waiting))
+
+        patchers = [patch.object(DAGScheduler, "run_do", lambda scheduler: self.run_do_times.append(time.time())),
+                    patch.object(DAGScheduler, "run_events", _run_events),
+                    patch("fate_flow.scheduler.dag_scheduler.DAG_SCHEDULER_RETRY_INTERVAL", 100)]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def start(self, scheduler=None, **kwargs):
+        if scheduler is None:
+            scheduler = DAGScheduler(interval=300, **kwargs)
+        scheduler.daemon = True
+        scheduler.start()
+        self.addCleanup(scheduler.cancel)
+        return scheduler
+
+    def test_periodic_run(self):
+        # the periodic run is a consistency check for jobs whose status reports are missed
+        start = time.time()
+        self.start()
+        time.sleep(1.05)
+        self.assertEqual(len(self.run_do_times), 3)
+        self.assertLess(self.run_do_times[0] - start, 0.4)
+        self.assertListEqual(self.events, [])
+
+    def test_first_interval(self):
+        start = time.time()
+        self.start(first_interval=50)
+        time.sleep(0.2)
+        self.assertEqual(len(self.run_do_times), 1)
+        self.assertLess(self.run_do_times[0] - start, 0.1)
+
+    def test_notified_job_scheduled_at_once(self):
+        self.start()
+        time.sleep(0.1)
+        notify_time = time.time()
+        DAGScheduler.notify(job_id="job_0")
+        DAGScheduler.notify(job_id="job_1")
+        time.sleep(0.1)
+        self.assertEqual(len(self.events), 1)
+        event_time, job_ids, schedule_waiting = self.events[0]
+        self.assertLess(event_time - notify_time, 0.1)
+        self.assertListEqual(job_ids, ["job_0", "job_1"])
+        self.assertFalse(schedule_waiting)
+        time.sleep(0.3)
+        self.assertEqual(len(self.run_do_times), 1)
+
+    def test_retry_waiting_head(self):
+        scheduler = DAGScheduler(interval=1000)
+        start = time.time()
+        scheduler._waiting_retry_time = current_timestamp() + 100
+        self.start(scheduler)
+        time.sleep(0.2)
+        self.assertEqual(len(self.events), 1)
+        event_time, job_ids, schedule_waiting = self.events[0]
+        self.assertAlmostEqual(event_time - start, 0.1, delta=0.05)
+        self.assertListEqual(job_ids, [])
+        self.assertTrue(schedule_waiting)
+        self.assertIsNone(scheduler._waiting_retry_time)
+
+    def test_retry_pulling_job(self):
+        scheduler = DAGScheduler(interval=1000)
+        start = time.time()
+        scheduler._retry_jobs = {"job_0": current_timestamp() + 100, "job_1": current_timestamp() + 5000}
+        self.start(scheduler)
+        time.sleep(0.2)
+        self.assertEqual(len(self.events), 1)
+        event_time, job_ids, schedule_waiting = self.events[0]
+        self.assertAlmostEqual(event_time - start, 0.1, delta=0.05)
+        self.assertListEqual(job_ids, ["job_0"])
+        self.assertFalse(schedule_waiting)
+        self.assertListEqual(list(scheduler._retry_jobs), ["job_1"])
+
+    def test_lock(self):
+        lock = threading.Lock()
+        lock.acquire()
+        self.start(lock=lock)
+        DAGScheduler.notify(job_id="job_0")
+        time.sleep(0.2)
+        self.assertListEqual(self.events, [])
+        lock.release()
+        DAGScheduler.notify(job_id="job_1")
+        time.sleep(0.05)
+        self.assertListEqual([job_ids for _, job_ids, _ in self.events], [["job_1"]])
+        self.assertFalse(lock.locked())
+
+
+class TestDAGSchedulerEvents(unittest.TestCase):
+    def setUp(self):
+        self.jobs = {}
+        self.waiting_jobs = []
+        self.scheduled = []
+
+        def _query_job(job_id=None, status=None, **kwargs):
+            if status == JobStatus.WAITING:
+                return self.waiting_jobs
+            return [self.jobs[job_id]] if job_id in self.jobs else []
+
+        patchers = [patch("fate_flow.scheduler.dag_scheduler.JobSaver.query_job", side_effect=_query_job),
+                    patch.object(DAGScheduler, "schedule_running_job",
+                                 lambda scheduler, job: self.scheduled.append(("running", job.f_job_id))),
+                    patch.object(DAGScheduler, "schedule_waiting_jobs",
+                                 lambda scheduler, job: self.scheduled.append(("waiting", job.f_job_id)))]
+        self.query_job = patchers[0].start()
+        self.addCleanup(patchers[0].stop)
+        for patcher in patchers[1:]:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.scheduler = DAGScheduler(interval=1000)
+
+    def test_running_jobs_do_not_query_waiting_jobs(self):
+        self.jobs = {"job_0": fake_job("job_0", JobStatus.RUNNING), "job_1": fake_job("job_1", JobStatus.RUNNING)}
+        self.scheduler.run_events(["job_0", "job_1"])
+        self.assertListEqual(self.scheduled, [("running", "job_0"), ("running", "job_1")])
+        self.assertEqual(self.query_job.call_count, 2)
+        self.assertDictEqual(self.scheduler._retry_jobs, {})
+
+    def test_waiting_head_scheduled_once_per_batch(self):
+        self.jobs = {"job_0": fake_job("job_0", JobStatus.WAITING), "job_1": fake_job("job_1", JobStatus.WAITING)}
+        self.waiting_jobs = [self.jobs["job_0"], self.jobs["job_1"]]
+        self.scheduler.run_events(["job_0", "job_1"])
+        self.assertListEqual(self.scheduled, [("waiting", "job_0")])
+        self.assertEqual(self.query_job.call_count, 3)
+        self.assertIsNotNone(self.scheduler._waiting_retry_time)
+
+        # no more waiting jobs, no more retries
+        self.waiting_jobs = []
+        self.scheduler.run_events([], schedule_waiting=True)
+        self.assertIsNone(self.scheduler._waiting_retry_time)
+
+    def test_pulling_job_retried(self):
+        self.jobs = {"job_0": fake_job("job_0", JobStatus.RUNNING, FederatedCommunicationType.PULL)}
+        self.scheduler.run_events(["job_0"])
+        self.assertListEqual(list(self.scheduler._retry_jobs), ["job_0"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+import time
+import unittest
+from unittest.mock import patch
+
+from fate_flow.entity.types import RetCode
+from fate_flow.scheduler import federated_scheduler
+from fate_flow.scheduler.federated_scheduler import FederatedScheduler
+
+
+def slow_federated_api(dest_party_id, json_body, **kwargs):
+    time.sleep(json_body["delay"])
+    return {"retcode": RetCode.SUCCESS, "retmsg": "success", "data": dest_party_id}
+
+
+class TestFederatedRequests(unittest.TestCase):
+    def request(self, party_delays):
+        requests = [("host", party_id, dict(dest_party_id=party_id, json_body={"delay": delay}))
+                    for party_id, delay in party_delays.items()]
+        return FederatedScheduler.federated_requests(job_id="test_job", command="start", target="job",
+                                                     requests=requests, federated_response={})
+
+    @patch.object(federated_scheduler, "FEDERATED_COMMAND_PARTY_TIMEOUT", 1500)
+    @patch.object(federated_scheduler, "federated_api", slow_federated_api)
+    def test_all_parties_start_at_once(self):
+        # more parties than a fixed-size pool would run at once, none of them should wait in queue
+        start = time.time()
+        federated_response = self.request({party_id: 0.5 for party_id in range(50)})
+        self.assertLess(time.time() - start, 1.5)
+        self.assertEqual({party_id: response["data"] for party_id, response in federated_response["host"].items()},
+                         {party_id: party_id for party_id in range(50)})
+
+    @patch.object(federated_scheduler, "FEDERATED_COMMAND_PARTY_TIMEOUT", 1000)
+    @patch.object(federated_scheduler, "federated_api", slow_federated_api)
+    def test_party_timeout(self):
+        start = time.time()
+        federated_response = self.request({9999: 0.6, 10000: 0.6, 10001: 3})
+        self.assertLess(time.time() - start, 2)
+        self.assertEqual(federated_response["host"][9999]["retcode"], RetCode.SUCCESS)
+        self.assertEqual(federated_response["host"][10000]["retcode"], RetCode.SUCCESS)
+        self.assertEqual(federated_response["host"][10001]["retcode"], RetCode.FEDERATED_ERROR)
+
+
+if __name__ == '__main__':
+    unittest.main()
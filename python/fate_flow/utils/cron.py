@@ -19,7 +19,8 @@ import random
 
 
 class Cron(threading.Thread):
-    def __init__(self, interval, run_second=None, rand_size=None, title='', logger=None, lock=None):
+    def __init__(self, interval, run_second=None, rand_size=None, title='', logger=None, lock=None,
+                 first_interval=None):
         """
 
         :param interval: interval by millisecond
@@ -28,6 +29,7 @@ class Cron(threading.Thread):
         :param title:
         :param logger:
         :param lock:
+        :param first_interval: interval before the first run by millisecond, default is interval
         """
         super(Cron, self).__init__()
         self.interval = interval
@@ -37,6 +39,7 @@ class Cron(threading.Thread):
         self.title = title
         self.logger = logger
         self.lock = lock
+        self.first_interval = first_interval
 
     def cancel(self):
         self.finished.set()
@@ -59,7 +62,7 @@ class Cron(threading.Thread):
                 self.logger.info('%s cron start.' % self.title)
 
             if self.run_second is None:
-                first_interval = self.interval
+                first_interval = self.interval if self.first_interval is None else self.first_interval
             else:
                 now = int(round(time.time()*1000))
                 delta = -now % 60000 + self.run_second*1000
@@ -67,12 +70,12 @@ class Cron(threading.Thread):
                     first_interval = delta
                 else:
                     first_interval = 60*1000 + delta
-            self.finished.wait(first_interval/1000)
+            self.wait(first_interval/1000)
             if not self.finished.is_set():
                 do()
 
-            while True:
-                self.finished.wait((self.interval if self.rand_size is None else self.interval - random.randint(0, self.rand_size))/1000)
+            while not self.finished.is_set():
+                self.wait((self.interval if self.rand_size is None else self.interval - random.randint(0, self.rand_size))/1000)
                 if not self.finished.is_set():
                     do()
         except Exception as e:
@@ -81,6 +84,13 @@ class Cron(threading.Thread):
             else:
                 raise e
 
+    def wait(self, timeout):
+        """
+        wait between two runs, returns earlier if cancelled
+        :param timeout: by second
+        """
+        self.finished.wait(timeout)
+
     def run_do(self):
         pass
 
@@ -25,6 +25,7 @@
 # Criterion
 # =============================================================================
 import math
+import numpy as np
 from federatedml.util import LOGGER
 from federatedml.util import consts
 
@@ -74,4 +75,32 @@ class XgboostCriterion(Criterion):
         return self.truncate(num * num / (sum_hess + self.reg_lambda))
 
     def node_weight(self, sum_grad, sum_hess):
-        return self.truncate(-(self._g_alpha_cmp(sum_grad, self.reg_alpha)) / (sum_hess + self.reg_lambda))
\ No newline at end of file
+        return self.truncate(-(self._g_alpha_cmp(sum_grad, self.reg_alpha)) / (sum_hess + self.reg_lambda))
+
+    """
+    Array versions of gain computation, inputs are numpy arrays of the same shape
+    """
+
+    @staticmethod
+    def _g_alpha_cmp_array(gradient, reg_alpha):
+        return np.where(gradient < - reg_alpha, gradient + reg_alpha,
+                        np.where(gradient > reg_alpha, gradient - reg_alpha, 0))
+
+    @staticmethod
+    def truncate_array(f, n=consts.TREE_DECIMAL_ROUND):
+        return np.floor(f * 10 ** n) / 10 ** n
+
+    def split_gain_array(self, node_sum, left_node_sum, right_node_sum):
+        sum_grad, sum_hess = node_sum
+        left_node_sum_grad, left_node_sum_hess = left_node_sum
+        right_node_sum_grad, right_node_sum_hess = right_node_sum
+        rs = self.node_gain_array(left_node_sum_grad, left_node_sum_hess) + \
+             self.node_gain_array(right_node_sum_grad, right_node_sum_hess) - \
+             self.node_gain_array(sum_grad, sum_hess)
+        return self.truncate_array(rs)
+
+    def node_gain_array(self, sum_grad, sum_hess):
+        sum_grad, sum_hess = self.truncate_array(sum_grad), self.truncate_array(sum_hess)
+        num = self._g_alpha_cmp_array(sum_grad, self.reg_alpha)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return self.truncate_array(num * num / (sum_hess + self.reg_lambda))
@@ -35,6 +35,8 @@ from fate_arch.session import computing_session as session
 from fate_arch.common import log
 from federatedml.feature.fate_element_type import NoneType
 from federatedml.framework.weights import Weights
+from federatedml.secureprotol import gmpy_math
+from federatedml.secureprotol.fate_paillier import PaillierEncryptedNumber, PaillierCiphertextAccumulator
 from federatedml.secureprotol.iterative_affine import DeterministicIterativeAffineCiphertext
 
 LOGGER = log.getLogger()
@@ -493,6 +495,35 @@ class FeatureHistogram(object):
             data_record += 1
 
         LOGGER.debug("begin batch calculate histogram, data count is {}".format(data_record))
+
+        if data_record > 0 and FeatureHistogram._is_plaintext(grad[0]):
+            # g/h are plain floats(guest side), use columnar mode
+            node_histograms = FeatureHistogram._vectorized_calculate_histogram(data_bins, node_ids, grad, hess,
+                                                                               bin_split_points, bin_sparse_points,
+                                                                               valid_features, node_map,
+                                                                               use_missing, zero_as_missing)
+        elif data_record > 0 and isinstance(grad[0], PaillierEncryptedNumber):
+            # g/h are paillier ciphertexts(host side), accumulate raw ciphertexts
+            node_histograms = FeatureHistogram._packed_calculate_histogram(data_bins, node_ids, grad, hess,
+                                                                           bin_split_points, bin_sparse_points,
+                                                                           valid_features, node_map,
+                                                                           use_missing, zero_as_missing)
+        else:
+            node_histograms = FeatureHistogram._loop_calculate_histogram(data_bins, node_ids, grad, hess,
+                                                                         bin_split_points, bin_sparse_points,
+                                                                         valid_features, node_map,
+                                                                         use_missing, zero_as_missing)
+
+        ret = FeatureHistogram._generate_histogram_key_value_list(node_histograms, node_map, bin_split_points,
+                                                                  parent_nid_map, sibling_node_id_map,
+                                                                  partition_key=partition_key)
+        return ret
+
+    @staticmethod
+    def _loop_calculate_histogram(data_bins, node_ids, grad, hess, bin_split_points, bin_sparse_points,
+                                  valid_features, node_map, use_missing, zero_as_missing):
+
+        data_record = len(data_bins)
         node_num = len(node_map)
 
         missing_bin = 1 if use_missing else 0
@@ -560,10 +591,197 @@ class FeatureHistogram(object):
                         node_histograms[node_idx][fid][-1][2] += zero_opt_node_sum[node_idx][2] - \
                                                                  zero_optim[node_idx][fid][2]
 
-        ret = FeatureHistogram._generate_histogram_key_value_list(node_histograms, node_map, bin_split_points,
-                                                                  parent_nid_map, sibling_node_id_map,
-                                                                  partition_key=partition_key)
-        return ret
+        return node_histograms
+
+    @staticmethod
+    def _is_plaintext(val):
+        return isinstance(val, (int, float, np.integer, np.floating))
+
+    @staticmethod
+    def _vectorized_calculate_histogram(data_bins, node_ids, grad, hess, bin_split_points, bin_sparse_points,
+                                        valid_features, node_map, use_missing, zero_as_missing):
+
+        """
+        columnar histogram computation for plaintext g/h:
+        sparse features of a partition are converted to CSR arrays(row, fid, bid) once, then g/h/count of every
+        (node, feature, bin) are accumulated by np.bincount on a flattened histogram index
+        """
+
+        node_num = len(node_map)
+        feature_num = bin_split_points.shape[0]
+        missing_bin = 1 if use_missing else 0
+
+        # histograms of a node are flattened into one axis: feature_offset[fid] + bid
+        feature_bin_num = np.array([bin_split_points[fid].shape[0] + missing_bin for fid in range(feature_num)],
+                                   dtype=np.int64)
+        feature_offset = np.zeros(feature_num + 1, dtype=np.int64)
+        np.cumsum(feature_bin_num, out=feature_offset[1:])
+        node_stride = int(feature_offset[-1])
+
+        # CSR arrays of binned features
+        row_nnz = np.zeros(len(data_bins), dtype=np.int64)
+        fids, bids = [], []
+        for rid, data_bin in enumerate(data_bins):
+            sparse_vec = data_bin.features.get_sparse_vector()
+            row_nnz[rid] = len(sparse_vec)
+            fids.extend(sparse_vec.keys())
+            bids.extend(sparse_vec.values())
+
+        if use_missing:
+            # missing value is set as -1
+            bids = [-1 if isinstance(bid, NoneType) else bid for bid in bids]
+
+        node_idx = np.array([node_map[nid] for nid in node_ids], dtype=np.int64)
+        grad = np.asarray(grad, dtype=np.float64)
+        hess = np.asarray(hess, dtype=np.float64)
+        rows = np.repeat(np.arange(len(data_bins)), row_nnz)
+        fids = np.array(fids, dtype=np.int64)
+        bids = np.array(bids, dtype=np.int64)
+
+        if valid_features is not None:
+            valid_mask = np.array([valid_features[fid] is not False for fid in range(feature_num)], dtype=bool)
+            kept = valid_mask[fids]
+            rows, fids, bids = rows[kept], fids[kept], bids[kept]
+
+        if use_missing:
+            bids = np.where(bids == -1, feature_bin_num[fids] - 1, bids)
+
+        # bincount of empty input is int64 even if weights are given, weighted sums are kept as float64
+        hist_size = node_num * node_stride
+        hist_idx = node_idx[rows] * node_stride + feature_offset[fids] + bids
+        g_hist = np.bincount(hist_idx, weights=grad[rows], minlength=hist_size).astype(np.float64, copy=False)
+        g_hist = g_hist.reshape((node_num, node_stride))
+        h_hist = np.bincount(hist_idx, weights=hess[rows], minlength=hist_size).astype(np.float64, copy=False)
+        h_hist = h_hist.reshape((node_num, node_stride))
+        cnt_hist = np.bincount(hist_idx, minlength=hist_size).reshape((node_num, node_stride))
+
+        # add 0 g/h sum to sparse point(or missing bin if zero as missing):
+        # (node total sum value) - (node feature total sum value)
+        node_g_sum = np.bincount(node_idx, weights=grad, minlength=node_num).astype(np.float64, copy=False)
+        node_h_sum = np.bincount(node_idx, weights=hess, minlength=node_num).astype(np.float64, copy=False)
+        node_cnt = np.bincount(node_idx, minlength=node_num)
+
+        node_feat_idx = node_idx[rows] * feature_num + fids
+        node_feat_size = node_num * feature_num
+        feat_g_sum = np.bincount(node_feat_idx, weights=grad[rows], minlength=node_feat_size)
+        feat_g_sum = feat_g_sum.astype(np.float64, copy=False).reshape((node_num, -1))
+        feat_h_sum = np.bincount(node_feat_idx, weights=hess[rows], minlength=node_feat_size)
+        feat_h_sum = feat_h_sum.astype(np.float64, copy=False).reshape((node_num, -1))
+        feat_cnt = np.bincount(node_feat_idx, minlength=node_feat_size).reshape((node_num, -1))
+
+        if valid_features is not None:
+            fill_fids = np.array([fid for fid in range(feature_num) if valid_features[fid] is True], dtype=np.int64)
+            if not use_missing or (use_missing and not zero_as_missing):
+                fill_bids = np.array([bin_sparse_points[fid] for fid in fill_fids], dtype=np.int64)
+            else:
+                fill_bids = feature_bin_num[fill_fids] - 1
+            fill_pos = feature_offset[fill_fids] + fill_bids
+            g_hist[:, fill_pos] += node_g_sum[:, None] - feat_g_sum[:, fill_fids]
+            h_hist[:, fill_pos] += node_h_sum[:, None] - feat_h_sum[:, fill_fids]
+            cnt_hist[:, fill_pos] += node_cnt[:, None] - feat_cnt[:, fill_fids]
+
+        node_histograms = []
+        for nidx in range(node_num):
+            g_list, h_list, cnt_list = g_hist[nidx].tolist(), h_hist[nidx].tolist(), cnt_hist[nidx].tolist()
+            feature_histograms = []
+            for fid in range(feature_num):
+                if valid_features is not None and valid_features[fid] is False:
+                    feature_histograms.append([])
+                    continue
+                start, end = feature_offset[fid], feature_offset[fid + 1]
+                feature_histograms.append([[g, h, cnt] for g, h, cnt in zip(g_list[start: end],
+                                                                           h_list[start: end],
+                                                                           cnt_list[start: end])])
+            node_histograms.append(feature_histograms)
+
+        return node_histograms
+
+    @staticmethod
+    def _accumulated_sum(accumulator):
+        encrypted_sum = accumulator.encrypted_sum()
+        return 0 if encrypted_sum is None else encrypted_sum
+
+    @staticmethod
+    def _packed_calculate_histogram(data_bins, node_ids, grad, hess, bin_split_points, bin_sparse_points,
+                                    valid_features, node_map, use_missing, zero_as_missing):
+
+        """
+        histogram computation for paillier encrypted g/h:
+        raw ciphertexts are multiplied into (node, feature, bin) accumulators bucketed by exponent,
+        PaillierEncryptedNumbers are only generated once per bin when histograms are output
+        """
+
+        public_key = grad[0].public_key
+        node_num = len(node_map)
+        feature_num = bin_split_points.shape[0]
+        missing_bin = 1 if use_missing else 0
+
+        def new_accumulators():
+            # g, h, sample count
+            return [PaillierCiphertextAccumulator(public_key), PaillierCiphertextAccumulator(public_key), 0]
+
+        node_sum = [new_accumulators() for k in range(node_num)]
+        node_feature_sum = {}
+        bin_sum = {}
+
+        for rid in range(len(data_bins)):
+
+            node_idx = node_map.get(node_ids[rid])
+            g_cipher, g_exponent = gmpy_math.mpz(grad[rid].ciphertext(False)), grad[rid].exponent
+            h_cipher, h_exponent = gmpy_math.mpz(hess[rid].ciphertext(False)), hess[rid].exponent
+
+            # node total sum value
+            node_sum[node_idx][0].add_raw(g_cipher, g_exponent)
+            node_sum[node_idx][1].add_raw(h_cipher, h_exponent)
+            node_sum[node_idx][2] += 1
+
+            for fid, value in data_bins[rid].features.get_all_data():
+                if valid_features is not None and valid_features[fid] is False:
+                    continue
+
+                if use_missing and value == NoneType():
+                    # missing value is put in the last bin
+                    value = bin_split_points[fid].shape[0]
+
+                for key, acc_dict in (((node_idx, fid, value), bin_sum), ((node_idx, fid), node_feature_sum)):
+                    acc = acc_dict.get(key)
+                    if acc is None:
+                        acc = acc_dict[key] = new_accumulators()
+                    acc[0].add_raw(g_cipher, g_exponent)
+                    acc[1].add_raw(h_cipher, h_exponent)
+                    acc[2] += 1
+
+        node_histograms = FeatureHistogram._generate_histogram_template(node_map, bin_split_points, valid_features,
+                                                                        missing_bin)
+        for (node_idx, fid, bid), acc in bin_sum.items():
+            node_histograms[node_idx][fid][bid] = [FeatureHistogram._accumulated_sum(acc[0]),
+                                                   FeatureHistogram._accumulated_sum(acc[1]),
+                                                   acc[2]]
+
+        for node_idx in range(node_num):
+            node_g = FeatureHistogram._accumulated_sum(node_sum[node_idx][0])
+            node_h = FeatureHistogram._accumulated_sum(node_sum[node_idx][1])
+            node_cnt = node_sum[node_idx][2]
+            for fid in range(feature_num):
+                if valid_features is not None and valid_features[fid] is True:
+                    feature_g, feature_h, feature_cnt = 0, 0, 0
+                    acc = node_feature_sum.get((node_idx, fid))
+                    if acc is not None:
+                        feature_g = FeatureHistogram._accumulated_sum(acc[0])
+                        feature_h = FeatureHistogram._accumulated_sum(acc[1])
+                        feature_cnt = acc[2]
+
+                    if not use_missing or (use_missing and not zero_as_missing):
+                        # add 0 g/h sum to sparse point
+                        bid = bin_sparse_points[fid]
+                    else:
+                        # if 0 is regarded as missing value, add to missing bin
+                        bid = -1
+                    node_histograms[node_idx][fid][bid][0] += node_g - feature_g
+                    node_histograms[node_idx][fid][bid][1] += node_h - feature_h
+                    node_histograms[node_idx][fid][bid][2] += node_cnt - feature_cnt
+
+        return node_histograms
 
     @staticmethod
     def _recombine_histograms(histograms_list: list, node_map, feature_num):
@@ -96,6 +96,24 @@ class Splitter(object):
     def _check_sample_num(self, l_cnt, r_cnt):
         return l_cnt >= self.min_leaf_node and r_cnt >= self.min_leaf_node
 
+    def _split_gain_tensor(self, node_sum, left_sum, right_sum, candidate_mask):
+
+        """
+        compute gains of all split candidates, candidates fail to pass the checks get gain -inf
+        node_sum: features x 3, left_sum/right_sum: features x bins x 3, 3 -> g, h, sample count
+        """
+
+        valid = candidate_mask & (left_sum[:, :, 2] >= self.min_leaf_node) & \
+            (right_sum[:, :, 2] >= self.min_leaf_node) & \
+            (left_sum[:, :, 1] >= self.min_child_weight) & (right_sum[:, :, 1] >= self.min_child_weight)
+
+        node_sum = np.broadcast_to(node_sum[:, None, :], left_sum.shape)
+        gain = self.criterion.split_gain_array([node_sum[:, :, 0], node_sum[:, :, 1]],
+                                               [left_sum[:, :, 0], left_sum[:, :, 1]],
+                                               [right_sum[:, :, 0], right_sum[:, :, 1]])
+
+        return np.where(valid & (gain > self.min_impurity_split), gain, -np.inf)
+
     def find_split_single_histogram_guest(self, histogram, valid_features, sitename, use_missing, zero_as_missing):
 
         # default values
@@ -111,6 +129,7 @@ class Splitter(object):
         # in default, missing value going to right
         missing_dir = 1
 
+        fids = []
         for fid in range(len(histogram)):
 
             if valid_features[fid] is False:
@@ -120,62 +139,61 @@ class Splitter(object):
                 continue
 
             # last bin contains sum values (cumsum from left)
-            sum_grad = histogram[fid][bin_num - 1][0]
-            sum_hess = histogram[fid][bin_num - 1][1]
-            node_cnt = histogram[fid][bin_num - 1][2]
-
-            if node_cnt < self.min_sample_split:
+            if histogram[fid][bin_num - 1][2] < self.min_sample_split:
                 break
 
-            # last bin will not participate in split find, so bin_num - 1
-            for bid in range(bin_num - missing_bin - 1):
-
-                # left gh
-                sum_grad_l = histogram[fid][bid][0]
-                sum_hess_l = histogram[fid][bid][1]
-                node_cnt_l = histogram[fid][bid][2]
-                # right gh
-                sum_grad_r = sum_grad - sum_grad_l
-                sum_hess_r = sum_hess - sum_hess_l
-                node_cnt_r = node_cnt - node_cnt_l
-
-                if self._check_sample_num(node_cnt_l, node_cnt_r) and self._check_min_child_weight(sum_hess_l, sum_hess_r):
-                    gain = self.criterion.split_gain([sum_grad, sum_hess],
-                                                     [sum_grad_l, sum_hess_l], [sum_grad_r, sum_hess_r])
-
-                    if gain > self.min_impurity_split and gain > best_gain + consts.FLOAT_ZERO:
-                        best_gain = gain
-                        best_fid = fid
-                        best_bid = bid
-                        best_sum_grad_l = sum_grad_l
-                        best_sum_hess_l = sum_hess_l
-                        missing_dir = 1
-
-                """ missing value handle: dispatch to left child"""
-                if use_missing:
-
-                    # add sum of samples with missing features to left
-                    sum_grad_l += histogram[fid][-1][0] - histogram[fid][-2][0]
-                    sum_hess_l += histogram[fid][-1][1] - histogram[fid][-2][1]
-                    node_cnt_l += histogram[fid][-1][2] - histogram[fid][-2][2]
-
-                    sum_grad_r -= histogram[fid][-1][0] - histogram[fid][-2][0]
-                    sum_hess_r -= histogram[fid][-1][1] - histogram[fid][-2][1]
-                    node_cnt_r -= histogram[fid][-1][2] - histogram[fid][-2][2]
-
-                    # if have a better gain value, missing dir is left
-                    if self._check_sample_num(node_cnt_l, node_cnt_r) and self._check_min_child_weight(sum_hess_l, sum_hess_r):
-
-                        gain = self.criterion.split_gain([sum_grad, sum_hess],
-                                                         [sum_grad_l, sum_hess_l], [sum_grad_r, sum_hess_r])
-
-                        if gain > self.min_impurity_split and gain > best_gain + consts.FLOAT_ZERO:
-                            best_gain = gain
-                            best_fid = fid
-                            best_bid = bid
-                            best_sum_grad_l = sum_grad_l
-                            best_sum_hess_l = sum_hess_l
-                            missing_dir = -1
+            # last bin will not participate in split find
+            if bin_num - missing_bin - 1 > 0:
+                fids.append(fid)
+
+        if len(fids) > 0:
+
+            # features x bins x 3 tensor of cumulative histograms, padded to the max bin num
+            bin_nums = np.array([len(histogram[fid]) for fid in fids])
+            hist_tensor = np.zeros((len(fids), bin_nums.max(), 3))
+            for idx, fid in enumerate(fids):
+                hist_tensor[idx, :bin_nums[idx]] = histogram[fid]
+
+            feature_idx = np.arange(len(fids))
+            node_sum = hist_tensor[feature_idx, bin_nums - 1]
+            candidate_num = bin_nums - missing_bin - 1
+            candidate_mask = np.arange(candidate_num.max())[None, :] < candidate_num[:, None]
+
+            left_sum = hist_tensor[:, :candidate_num.max()]
+            right_sum = node_sum[:, None, :] - left_sum
+            left_sums = [left_sum]
+            gains = [self._split_gain_tensor(node_sum, left_sum, right_sum, candidate_mask)]
+
+            """ missing value handle: dispatch to left child"""
+            if use_missing:
+                # add sum of samples with missing features to left
+                missing_sum = (node_sum - hist_tensor[feature_idx, bin_nums - 2])[:, None, :]
+                left_sum = left_sum + missing_sum
+                right_sum = right_sum - missing_sum
+                left_sums.append(left_sum)
+                gains.append(self._split_gain_tensor(node_sum, left_sum, right_sum, candidate_mask))
+
+            # features x bins x missing dirs, flattened in the order candidates are visited
+            gains = np.stack(gains, axis=2)
+            flat_gains = gains.reshape(-1)
+
+            # a later candidate replaces the best one only if its gain is larger by FLOAT_ZERO
+            best_idx, start = None, 0
+            while True:
+                better = np.flatnonzero(flat_gains[start:] > best_gain + consts.FLOAT_ZERO)
+                if len(better) == 0:
+                    break
+                best_idx = start + better[0]
+                best_gain = flat_gains[best_idx].item()
+                start = best_idx + 1
+
+            if best_idx is not None:
+                idx, bid, dir_idx = np.unravel_index(best_idx, gains.shape)
+                best_fid = fids[idx]
+                best_bid = int(bid)
+                best_sum_grad_l = left_sums[dir_idx][idx, bid, 0].item()
+                best_sum_hess_l = left_sums[dir_idx][idx, bid, 1].item()
+                missing_dir = 1 if dir_idx == 0 else -1
 
         splitinfo = SplitInfo(sitename=sitename, best_fid=best_fid, best_bid=best_bid,
                               gain=best_gain, sum_grad=best_sum_grad_l, sum_hess=best_sum_hess_l,
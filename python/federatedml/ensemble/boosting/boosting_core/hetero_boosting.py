@@ -62,7 +62,8 @@ class HeteroBoosting(Boosting, ABC):
         LOGGER.info("generate encrypter")
         if self.encrypt_param.method.lower() == consts.PAILLIER.lower():
             self.encrypter = PaillierEncrypt()
-            self.encrypter.generate_key(self.encrypt_param.key_length)
+            self.encrypter.generate_key(self.encrypt_param.key_length,
+                                        fixed_base_obfuscator=self.encrypt_param.fixed_base_obfuscator)
         elif self.encrypt_param.method.lower() == consts.ITERATIVEAFFINE.lower():
             self.encrypter = IterativeAffineEncrypt()
             self.encrypter.generate_key(key_size=self.encrypt_param.key_length,
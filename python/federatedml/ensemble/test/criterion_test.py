@@ -40,6 +40,14 @@ class TestXgboostCriterion(unittest.TestCase):
         split_gain = gain_left + gain_right - gain_all
         self.assertTrue(np.fabs(self.criterion.split_gain(node, left, right) - split_gain) < consts.FLOAT_ZERO)
 
+    def test_split_gain_array(self):
+        node = np.random.rand(2, 10)
+        left = node * np.random.rand(2, 10)
+        right = node - left
+        split_gain = self.criterion.split_gain_array(node, left, right)
+        for i in range(10):
+            self.assertTrue(self.criterion.split_gain(node[:, i], left[:, i], right[:, i]) == split_gain[i])
+
     def test_node_gain(self):
         grad = 0.5
         hess = 6
@@ -18,6 +18,7 @@ import unittest
 
 from fate_arch.session import computing_session as session
 from federatedml.ensemble import FeatureHistogram
+from federatedml.feature.fate_element_type import NoneType
 from federatedml.feature.instance import Instance
 from federatedml.feature.sparse_vector import SparseVector
 from federatedml.util import consts
@@ -94,6 +95,82 @@ class TestFeatureHistogram(unittest.TestCase):
                     for r in range(len(his2[i][j][k])):
                         self.assertTrue(np.fabs(his2[i][j][k][r] - histograms[i][j][k][r]) < consts.FLOAT_ZERO)
 
+    def test_calculate_histogram_with_missing(self):
+        data_insts = []
+        for i in range(200):
+            indices = []
+            data = []
+            for j in range(10):
+                x = random.randint(0, 6)
+                if x != 0:
+                    data.append(NoneType() if x == 6 else x - 1)
+                    indices.append(j)
+            data_insts.append((Instance(features=SparseVector(indices, data, shape=10)), (1, random.randint(0, 3))))
+        data_bin = session.parallelize(data_insts, include_key=False, partition=4)
+        grad_and_hess = session.parallelize(self.grad_and_hess_list[:200], include_key=False, partition=4)
+        valid_features = [True for i in range(10)]
+        valid_features[5] = False
+
+        histograms = self.feature_histogram.calculate_histogram(
+            data_bin, grad_and_hess,
+            self.bin_split_points, self.bin_sparse,
+            valid_features=valid_features,
+            node_map=self.node_map,
+            use_missing=True)
+
+        his2 = [[[[0 for i in range(3)]
+                  for j in range(7)]
+                 for k in range(10)]
+                for r in range(4)]
+        for i in range(200):
+            grad, hess = self.grad_and_hess_list[i]
+            id = self.node_map[data_insts[i][1][1]]
+            for fid in range(10):
+                bid = data_insts[i][0].features.get_data(fid, 0)
+                bid = -1 if bid == NoneType() else bid
+                his2[id][fid][bid][0] += grad
+                his2[id][fid][bid][1] += hess
+                his2[id][fid][bid][2] += 1
+
+        for i in range(len(his2)):
+            self.assertTrue(histograms[i][5] == [])
+            for j in range(len(his2[i])):
+                if j == 5:
+                    continue
+                his2[i][j] = self.feature_histogram._tensor_histogram_cumsum(his2[i][j])
+                for k in range(len(his2[i][j])):
+                    for r in range(len(his2[i][j][k])):
+                        self.assertTrue(np.fabs(his2[i][j][k][r] - histograms[i][j][k][r]) < consts.FLOAT_ZERO)
+
+    def test_calculate_histogram_with_empty_rows(self):
+        # no row has a non-zero bin, all g/h go to sparse points
+        data_insts = [(Instance(features=SparseVector([], [], shape=10)), (1, random.randint(0, 3)))
+                      for i in range(50)]
+        data_bin = session.parallelize(data_insts, include_key=False, partition=1)
+        grad_and_hess = session.parallelize(self.grad_and_hess_list[:50], include_key=False, partition=1)
+        valid_features = [True for i in range(10)]
+
+        histograms = self.feature_histogram.calculate_histogram(
+            data_bin, grad_and_hess,
+            self.bin_split_points, self.bin_sparse,
+            valid_features=valid_features,
+            node_map=self.node_map)
+
+        node_sum = [[0, 0, 0] for r in range(4)]
+        for i in range(50):
+            grad, hess = self.grad_and_hess_list[i]
+            id = self.node_map[data_insts[i][1][1]]
+            node_sum[id][0] += grad
+            node_sum[id][1] += hess
+            node_sum[id][2] += 1
+
+        for i in range(len(node_sum)):
+            for j in range(10):
+                # every bin accumulates the sparse point after cumsum
+                for k in range(6):
+                    for r in range(3):
+                        self.assertTrue(np.fabs(node_sum[i][r] - histograms[i][j][k][r]) < consts.FLOAT_ZERO)
+
     def test_aggregate_histogram(self):
 
         fake_fid = 114
@@ -114,17 +114,53 @@ class Evaluation(ModelBase):
             pred_labels.append(d[1][1])
             pred_scores.append(d[1][2])
         if self.eval_type == consts.BINARY or self.eval_type == consts.REGRESSION:
-            if self.pos_label and self.eval_type == consts.BINARY:
-                labels_arr = np.array(labels)
-                labels_arr[labels_arr == self.pos_label] = 1
-                labels_arr[labels_arr != self.pos_label] = 0
-                labels = list(labels_arr)
+            labels = list(self._binary_pos_labels(np.array(labels)))
             pred_results = pred_scores
         else:
             pred_results = pred_labels
 
         return labels, pred_results
 
+    def _binary_pos_labels(self, labels_arr: np.ndarray):
+        if self.pos_label and self.eval_type == consts.BINARY:
+            labels_arr[labels_arr == self.pos_label] = 1
+            labels_arr[labels_arr != self.pos_label] = 0
+        return labels_arr
+
+    @staticmethod
+    def _partition_labels_and_scores(kvs):
+        """
+        labels and predict scores of one partition, as arrays grouped by data type
+        """
+
+        labels, pred_scores = defaultdict(list), defaultdict(list)
+        for _, v in kvs:
+            labels[v[-1]].append(v[0])
+            pred_scores[v[-1]].append(v[2])
+        return {mode: (np.array(labels[mode]), np.array(pred_scores[mode], dtype=np.float64)) for mode in labels}
+
+    @staticmethod
+    def _merge_labels_and_scores(result, other):
+        merged = dict(result)
+        for mode, (labels, pred_scores) in other.items():
+            if mode in merged:
+                labels = np.concatenate([merged[mode][0], labels])
+                pred_scores = np.concatenate([merged[mode][1], pred_scores])
+            merged[mode] = (labels, pred_scores)
+        return merged
+
+    def split_labels_and_scores_with_type(self, eval_data) -> dict:
+
+        """
+        binary and regression metrics only need labels and predict scores, they are gathered as arrays
+        partition by partition, so that rows of prediction table are not collected
+        """
+
+        split_result = eval_data.applyPartitions(self._partition_labels_and_scores) \
+            .reduce(self._merge_labels_and_scores)
+        return {mode: (self._binary_pos_labels(labels), pred_scores)
+                for mode, (labels, pred_scores) in split_result.items()}
+
     def _clustering_extract(self, data):
 
         """
@@ -169,6 +205,10 @@ class Evaluation(ModelBase):
     def _evaluate_classification_and_regression_metrics(self, mode, data):
 
         labels, pred_results = self._classification_and_regression_extract(data)
+        return self._evaluate_labels_and_results_metrics(mode, labels, pred_results)
+
+    def _evaluate_labels_and_results_metrics(self, mode, labels, pred_results):
+
         eval_result = defaultdict(list)
         for eval_metric in self.metrics:
             if eval_metric not in self.special_metric_list:
@@ -316,6 +356,13 @@ class Evaluation(ModelBase):
                 LOGGER.debug('data with {} is None, skip metric computation'.format(key))
                 continue
 
+            if self.eval_type in [consts.BINARY, consts.REGRESSION]:
+                split_labels_and_scores = self.split_labels_and_scores_with_type(eval_data)
+                for mode, (labels, pred_scores) in split_labels_and_scores.items():
+                    eval_result = self._evaluate_labels_and_results_metrics(mode, labels, pred_scores)
+                    self.eval_results[key].append(eval_result)
+                continue
+
             eval_data_local = list(eval_data.collect())
             if len(eval_data_local) == 0:
                 continue
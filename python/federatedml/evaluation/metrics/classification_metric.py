@@ -38,30 +38,35 @@ class ConfusionMatrix(object):
             assert ret_type in ['tp', 'tn', 'fp', 'fn']
 
         sorted_labels = np.array(sorted_labels)
-        sorted_scores = np.array(sorted_pred_scores)
+        sorted_scores = np.array(sorted_pred_scores, dtype=np.float64)
         sorted_labels[sorted_labels != pos_label] = 0
         sorted_labels[sorted_labels == pos_label] = 1
-        score_thresholds = np.array([score_thresholds]).transpose()
-        pred_labels = (sorted_scores > score_thresholds) + 0
+        score_thresholds = np.array(score_thresholds, dtype=np.float64)
+
+        # a sample is predicted positive if its score is larger than the threshold,
+        # count them for all thresholds with one sort and cumulative sums instead of a thresholds x samples matrix
+        is_valid = ~np.isnan(sorted_scores)
+        asc_idx = np.argsort(sorted_scores[is_valid], kind='stable')
+        asc_scores = sorted_scores[is_valid][asc_idx]
+        pos_cumsum = np.concatenate([[0], np.cumsum(sorted_labels[is_valid][asc_idx] == 1)])
+
+        not_larger_num = np.searchsorted(asc_scores, score_thresholds, side='right')
+        # nothing is larger than nan
+        not_larger_num[np.isnan(score_thresholds)] = len(asc_scores)
+        pred_pos_num = len(asc_scores) - not_larger_num
+        tp_num = pos_cumsum[-1] - pos_cumsum[not_larger_num]
+        fp_num = pred_pos_num - tp_num
+        pos_num = int((sorted_labels == 1).sum())
 
         ret_dict = {}
-        if 'tp' in ret or 'tn' in ret:
-            match_arr = (pred_labels + sorted_labels)
-            if 'tp' in ret:
-                tp_num = (match_arr == 2).sum(axis=-1)
-                ret_dict['tp'] = tp_num
-            if 'tn' in ret:
-                tn_num = (match_arr == 0).sum(axis=-1)
-                ret_dict['tn'] = tn_num
-
-        if 'fp' in ret or 'fn' in ret:
-            match_arr = (sorted_labels - pred_labels)
-            if 'fp' in ret:
-                fp_num = (match_arr == -1).sum(axis=-1)
-                ret_dict['fp'] = fp_num
-            if 'fn' in ret:
-                fn_num = (match_arr == 1).sum(axis=-1)
-                ret_dict['fn'] = fn_num
+        if 'tp' in ret:
+            ret_dict['tp'] = tp_num
+        if 'tn' in ret:
+            ret_dict['tn'] = len(sorted_labels) - pos_num - fp_num
+        if 'fp' in ret:
+            ret_dict['fp'] = fp_num
+        if 'fn' in ret:
+            ret_dict['fn'] = pos_num - tp_num
 
         return ret_dict
 
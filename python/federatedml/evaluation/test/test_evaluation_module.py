@@ -1,9 +1,12 @@
 import unittest
 
 import numpy as np
+from fate_arch.session import computing_session as session
 from federatedml.util import consts
+from federatedml.evaluation.evaluation import Evaluation
 from federatedml.evaluation.metrics import classification_metric, clustering_metric, regression_metric
 from federatedml.evaluation.metric_interface import MetricInterface
+from federatedml.param.evaluation_param import EvaluateParam
 
 
 class TestEvaluation(unittest.TestCase):
@@ -49,6 +52,19 @@ class TestEvaluation(unittest.TestCase):
         interface.recall(self.bin_label, self.bin_score)
         interface.roc(self.bin_label, self.bin_score)
 
+    def test_confusion_mat(self):
+        labels = np.random.randint(0, 2, 1000)
+        scores = np.random.random(1000).round(2)
+        thresholds = [1.1, 0.8, 0.5, 0.5, scores[0], 0.0, -0.1]
+        confusion_mat = classification_metric.ConfusionMatrix.compute(labels, scores, thresholds,
+                                                                      ret=['tp', 'fp', 'tn', 'fn'])
+        for i, threshold in enumerate(thresholds):
+            pred_labels = scores > threshold
+            self.assertEqual(confusion_mat['tp'][i], (pred_labels & (labels == 1)).sum())
+            self.assertEqual(confusion_mat['fp'][i], (pred_labels & (labels == 0)).sum())
+            self.assertEqual(confusion_mat['tn'][i], (~pred_labels & (labels == 0)).sum())
+            self.assertEqual(confusion_mat['fn'][i], (~pred_labels & (labels == 1)).sum())
+
     def test_psi(self):
         interface = MetricInterface(pos_label=1, eval_type=consts.BINARY)
         interface.psi(self.psi_train_score, self.psi_val_score, train_labels=self.psi_train_label,
@@ -80,5 +96,50 @@ class TestEvaluation(unittest.TestCase):
                                                               self.psi_train_label, self.psi_val_label)
 
 
+class TestEvaluationFit(unittest.TestCase):
+
+    def setUp(self):
+        session.init("test_evaluation_fit")
+        scores = np.random.random(1000)
+        labels = (np.random.random(1000) < scores) + 0
+        self.rows = [(str(i), [int(labels[i]), int(scores[i] > 0.5), float(scores[i]), {"1": float(scores[i])},
+                               "train" if i % 3 else "validate"]) for i in range(1000)]
+        self.table = session.parallelize(self.rows, include_key=True, partition=4)
+
+    def _evaluation(self, eval_type, metrics):
+        evaluation = Evaluation()
+        evaluation._init_model(EvaluateParam(eval_type=eval_type, metrics=metrics))
+        return evaluation
+
+    def test_split_labels_and_scores_with_type(self):
+        evaluation = self._evaluation(consts.BINARY, [consts.AUC, consts.KS])
+        split_result = evaluation.split_labels_and_scores_with_type(self.table)
+        split_rows = evaluation.split_data_with_type(self.rows)
+        self.assertSetEqual(set(split_result), set(split_rows))
+        for mode, (labels, scores) in split_result.items():
+            expected_labels, expected_scores = evaluation._classification_and_regression_extract(split_rows[mode])
+            self.assertListEqual(sorted(zip(scores.tolist(), labels.tolist())),
+                                 sorted(zip(expected_scores, expected_labels)))
+
+            # metrics of arrays match those of collected rows
+            eval_result = evaluation._evaluate_labels_and_results_metrics(mode, labels, scores)
+            expected_result = evaluation._evaluate_classification_and_regression_metrics(mode, split_rows[mode])
+            self.assertAlmostEqual(eval_result[consts.AUC][1], expected_result[consts.AUC][1])
+            self.assertAlmostEqual(eval_result[consts.KS][1][0], expected_result[consts.KS][1][0])
+
+    def test_regression(self):
+        evaluation = self._evaluation(consts.REGRESSION, [consts.MEAN_SQUARED_ERROR])
+        split_result = evaluation.split_labels_and_scores_with_type(self.table)
+        for mode, data in evaluation.split_data_with_type(self.rows).items():
+            labels, scores = split_result[mode]
+            eval_result = evaluation._evaluate_labels_and_results_metrics(mode, labels, scores)
+            expected_result = evaluation._evaluate_classification_and_regression_metrics(mode, data)
+            self.assertAlmostEqual(eval_result[consts.MEAN_SQUARED_ERROR][1],
+                                   expected_result[consts.MEAN_SQUARED_ERROR][1])
+
+    def tearDown(self):
+        session.stop()
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -20,8 +20,11 @@ import bisect
 import copy
 import functools
 import math
+import numbers
 import random
 
+import numpy as np
+
 from federatedml.feature.binning.bin_inner_param import BinInnerParam
 from federatedml.feature.binning.bin_result import BinColResults, BinResults
 from federatedml.statistic.data_overview import get_header
@@ -32,6 +35,9 @@ from federatedml.feature.fate_element_type import NoneType
 
 # from federatedml.statistic import statics
 
+# number of rows binned together as one numpy block
+TRANSFORM_BLOCK_SIZE = 4096
+
 
 class BaseBinning(object):
     """
@@ -168,33 +174,25 @@ class BaseBinning(object):
         if split_points is None:
             split_points = self.fit_split_points(data_instances)
 
-        f = functools.partial(self.bin_data,
+        f = functools.partial(self.bin_data_partition,
                               split_points=split_points,
                               cols_dict=self.bin_inner_param.get_need_cal_iv_cols_map(),
                               header=self.header,
                               is_sparse=is_sparse)
-        data_bin_dict = data_instances.mapValues(f)
+        data_bin_dict = data_instances.mapPartitions(f, use_previous_behavior=False, preserves_partitioning=True)
         return data_bin_dict
 
     def convert_feature_to_woe(self, data_instances):
         is_sparse = data_overview.is_sparse_data(data_instances)
         schema = data_instances.schema
 
-        if is_sparse:
-            f = functools.partial(self._convert_sparse_data,
-                                  bin_inner_param=self.bin_inner_param,
-                                  bin_results=self.bin_results,
-                                  abnormal_list=self.abnormal_list,
-                                  convert_type='woe'
-                                  )
-            new_data = data_instances.mapValues(f)
-        else:
-            f = functools.partial(self._convert_dense_data,
-                                  bin_inner_param=self.bin_inner_param,
-                                  bin_results=self.bin_results,
-                                  abnormal_list=self.abnormal_list,
-                                  convert_type='woe')
-            new_data = data_instances.mapValues(f)
+        f = functools.partial(self._convert_partition,
+                              bin_inner_param=self.bin_inner_param,
+                              bin_results=self.bin_results,
+                              abnormal_list=self.abnormal_list,
+                              convert_type='woe',
+                              is_sparse=is_sparse)
+        new_data = data_instances.mapPartitions(f, use_previous_behavior=False, preserves_partitioning=True)
         new_data.schema = schema
         return new_data
 
@@ -208,21 +206,13 @@ class BaseBinning(object):
             for col_name, sp in split_points.items():
                 self.bin_results.put_col_split_points(col_name, sp)
 
-        if is_sparse:
-            f = functools.partial(self._convert_sparse_data,
-                                  bin_inner_param=self.bin_inner_param,
-                                  bin_results=self.bin_results,
-                                  abnormal_list=self.abnormal_list,
-                                  convert_type='bin_num'
-                                  )
-            new_data = data_instances.mapValues(f)
-        else:
-            f = functools.partial(self._convert_dense_data,
-                                  bin_inner_param=self.bin_inner_param,
-                                  bin_results=self.bin_results,
-                                  abnormal_list=self.abnormal_list,
-                                  convert_type='bin_num')
-            new_data = data_instances.mapValues(f)
+        f = functools.partial(self._convert_partition,
+                              bin_inner_param=self.bin_inner_param,
+                              bin_results=self.bin_results,
+                              abnormal_list=self.abnormal_list,
+                              convert_type='bin_num',
+                              is_sparse=is_sparse)
+        new_data = data_instances.mapPartitions(f, use_previous_behavior=False, preserves_partitioning=True)
         new_data.schema = schema
         bin_sparse = self.get_sparse_bin(self.bin_inner_param.transform_bin_indexes, split_points)
         split_points_result = self.bin_results.get_split_points_array(self.bin_inner_param.transform_bin_names)
@@ -293,6 +283,157 @@ class BaseBinning(object):
         instances.features = sparse_vector
         return instances
 
+    @staticmethod
+    def _iter_blocks(kvs):
+        keys, instances = [], []
+        for key, instance in kvs:
+            keys.append(key)
+            instances.append(instance)
+            if len(keys) >= TRANSFORM_BLOCK_SIZE:
+                yield keys, instances
+                keys, instances = [], []
+        if keys:
+            yield keys, instances
+
+    @staticmethod
+    def _dense_block(instances):
+        """
+        stack dense features of a block into a 2-D numeric array, None if they are not numeric
+        """
+        features = np.array([instance.features for instance in instances])
+        if features.ndim != 2 or features.dtype.kind not in "biuf":
+            return None
+        return features
+
+    @staticmethod
+    def _sparse_block(instances):
+        """
+        flatten sparse features of a block, returns row offsets, column indexes and values
+        """
+        offsets = [0]
+        col_indexes, values = [], []
+        for instance in instances:
+            sparse_vec = instance.features.get_sparse_vector()
+            col_indexes.extend(sparse_vec.keys())
+            values.extend(sparse_vec.values())
+            offsets.append(len(values))
+        return offsets, np.asarray(col_indexes, dtype=np.int64), values
+
+    @staticmethod
+    def _numeric_values(values, abnormal_list):
+        """
+        returns a float array of values and the mask of values to be binned,
+        which are numeric and not in abnormal_list
+        """
+        try:
+            numeric_values = np.asarray(values, dtype=np.float64)
+            is_numeric = np.ones(len(values), dtype=bool)
+        except (TypeError, ValueError):
+            is_numeric = np.fromiter((isinstance(v, numbers.Number) for v in values), dtype=bool, count=len(values))
+            numeric_values = np.zeros(len(values), dtype=np.float64)
+            numeric_values[is_numeric] = [v for v, numeric in zip(values, is_numeric) if numeric]
+        numeric_abnormal = [v for v in abnormal_list if isinstance(v, numbers.Number)]
+        if numeric_abnormal:
+            is_numeric &= ~np.isin(numeric_values, numeric_abnormal)
+        return numeric_values, is_numeric
+
+    @staticmethod
+    def _column_positions(col_indexes, cols):
+        """
+        yields each col in cols with positions of its values in col_indexes
+        """
+        order = np.argsort(col_indexes, kind="stable")
+        sorted_cols = col_indexes[order]
+        for col_idx in cols:
+            start, end = np.searchsorted(sorted_cols, [col_idx, col_idx + 1])
+            if start < end:
+                yield col_idx, order[start: end]
+
+    @staticmethod
+    def get_bin_nums(values, split_points):
+        """
+        vectorized get_bin_num over a float array, nan goes to the first bin as bisect does
+        """
+        bin_nums = np.searchsorted(np.asarray(split_points[:-1], dtype=np.float64), values, side="left")
+        bin_nums[np.isnan(values)] = 0
+        return bin_nums
+
+    @staticmethod
+    def _convert_partition(kvs, bin_inner_param: BinInnerParam, bin_results: BinResults,
+                           abnormal_list: list, convert_type: str = 'bin_num', is_sparse=False):
+        """
+        Convert transform columns of a partition to bin num or woe, a block of rows at a time,
+        same as _convert_dense_data and _convert_sparse_data per instance
+        """
+        result = []
+        for keys, instances in BaseBinning._iter_blocks(kvs):
+            if is_sparse:
+                new_instances = BaseBinning._convert_sparse_block(instances, bin_inner_param, bin_results,
+                                                                  abnormal_list, convert_type)
+            else:
+                new_instances = BaseBinning._convert_dense_block(instances, bin_inner_param, bin_results,
+                                                                 abnormal_list, convert_type)
+            result.extend(zip(keys, new_instances))
+        return result
+
+    @staticmethod
+    def _convert_value(bin_nums, col_name, bin_results, convert_type):
+        if convert_type == 'bin_num':
+            return bin_nums
+        col_results = bin_results.all_cols_results.get(col_name)
+        return np.asarray(col_results.woe_array)[bin_nums]
+
+    @staticmethod
+    def _convert_dense_block(instances, bin_inner_param, bin_results, abnormal_list, convert_type):
+        features = BaseBinning._dense_block(instances)
+        if features is None or convert_type not in ('bin_num', 'woe'):
+            return [BaseBinning._convert_dense_data(instance, bin_inner_param, bin_results,
+                                                    abnormal_list, convert_type) for instance in instances]
+
+        split_points_dict = bin_results.all_split_points
+        for col_idx in set(bin_inner_param.transform_bin_indexes):
+            col_name = bin_inner_param.header[col_idx]
+            col_values, to_bin = BaseBinning._numeric_values(features[:, col_idx], abnormal_list)
+            bin_nums = BaseBinning.get_bin_nums(col_values[to_bin], split_points_dict[col_name])
+            features[to_bin, col_idx] = BaseBinning._convert_value(bin_nums, col_name, bin_results, convert_type)
+
+        new_instances = []
+        for i, instance in enumerate(instances):
+            new_instance = copy.copy(instance)
+            new_instance.features = features[i]
+            new_instances.append(new_instance)
+        return new_instances
+
+    @staticmethod
+    def _convert_sparse_block(instances, bin_inner_param, bin_results, abnormal_list, convert_type):
+        if convert_type not in ('bin_num', 'woe'):
+            return [BaseBinning._convert_sparse_data(instance, bin_inner_param, bin_results,
+                                                     abnormal_list, convert_type) for instance in instances]
+
+        offsets, col_indexes, values = BaseBinning._sparse_block(instances)
+        numeric_values, to_bin = BaseBinning._numeric_values(values, abnormal_list)
+        new_values = np.empty(len(values), dtype=object)
+        new_values[:] = values
+
+        split_points_dict = bin_results.all_split_points
+        for col_idx, positions in BaseBinning._column_positions(col_indexes,
+                                                                set(bin_inner_param.transform_bin_indexes)):
+            col_name = bin_inner_param.header[col_idx]
+            positions = positions[to_bin[positions]]
+            bin_nums = BaseBinning.get_bin_nums(numeric_values[positions], split_points_dict[col_name])
+            new_values[positions] = \
+                BaseBinning._convert_value(bin_nums, col_name, bin_results, convert_type).tolist()
+
+        col_indexes = col_indexes.tolist()
+        new_instances = []
+        for i, instance in enumerate(instances):
+            start, end = offsets[i], offsets[i + 1]
+            new_instance = copy.copy(instance)
+            new_instance.features = SparseVector(col_indexes[start: end], new_values[start: end].tolist(),
+                                                 instance.features.get_shape())
+            new_instances.append(new_instance)
+        return new_instances
+
     def get_sparse_bin(self, transform_cols_idx, split_points_dict):
         """
         Get which bins the 0 located at for each column.
@@ -485,6 +626,39 @@ class BaseBinning(object):
 
         return result_bin_nums
 
+    @staticmethod
+    def bin_data_partition(kvs, split_points, cols_dict, header, is_sparse):
+        """
+        bin_data over a partition, a block of rows at a time, returns list of (key, result_bin_dict)
+        """
+        result = []
+        for keys, instances in BaseBinning._iter_blocks(kvs):
+            features = None if is_sparse else BaseBinning._dense_block(instances)
+            if not is_sparse and features is None:
+                result.extend((key, BaseBinning.bin_data(instance, split_points, cols_dict, header, is_sparse))
+                              for key, instance in zip(keys, instances))
+                continue
+
+            result_bin_nums = [{} for _ in instances]
+            if is_sparse:
+                offsets, col_indexes, values = BaseBinning._sparse_block(instances)
+                row_indexes = np.repeat(np.arange(len(instances)), np.diff(offsets))
+                col_values = np.asarray(values, dtype=np.float64)
+                cols = {col_idx for col_idx, col_name in enumerate(header) if col_name in cols_dict}
+                for col_idx, positions in BaseBinning._column_positions(col_indexes, cols):
+                    col_name = header[col_idx]
+                    bin_nums = BaseBinning.get_bin_nums(col_values[positions], split_points[col_name])
+                    for row_idx, bin_num in zip(row_indexes[positions].tolist(), bin_nums.tolist()):
+                        result_bin_nums[row_idx][col_name] = bin_num
+            else:
+                for col_name, col_index in cols_dict.items():
+                    bin_nums = BaseBinning.get_bin_nums(features[:, col_index].astype(np.float64),
+                                                        split_points[col_name])
+                    for row_bin_nums, bin_num in zip(result_bin_nums, bin_nums.tolist()):
+                        row_bin_nums[col_name] = bin_num
+            result.extend(zip(keys, result_bin_nums))
+        return result
+
     @staticmethod
     def get_bin_num(value, split_points):
         sp = split_points[:-1]
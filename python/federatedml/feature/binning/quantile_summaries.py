@@ -17,7 +17,11 @@
 #  limitations under the License.
 #
 
+import bisect
 import math
+import numbers
+
+import numpy as np
 
 from federatedml.util import consts, LOGGER
 
@@ -30,6 +34,11 @@ class Stats(object):
 
 
 class QuantileSummaries(object):
+    """
+    Greenwald-Khanna summary, samples are kept as three aligned arrays of value, g and delta,
+    so that a sorted batch is merged in and compressed with numpy instead of one Stats object per value.
+    """
+
     def __init__(self, compress_thres=consts.DEFAULT_COMPRESS_THRESHOLD,
                  head_size=consts.DEFAULT_HEAD_SIZE,
                  error=consts.DEFAULT_RELATIVE_ERROR,
@@ -38,7 +47,9 @@ class QuantileSummaries(object):
         self.head_size = head_size
         self.error = error
         self.head_sampled = []
-        self.sampled = []  # list of Stats
+        self._values = np.empty(0, dtype=np.float64)
+        self._g = np.empty(0, dtype=np.int64)
+        self._delta = np.empty(0, dtype=np.int64)
         self.count = 0  # Total observations appeared
         self.missing_count = 0
         if abnormal_list is None:
@@ -46,6 +57,14 @@ class QuantileSummaries(object):
         else:
             self.abnormal_list = abnormal_list
 
+    @property
+    def sampled(self):
+        """
+        list of Stats, built on access
+        """
+        return [Stats(value, g, delta) for value, g, delta in
+                zip(self._values.tolist(), self._g.tolist(), self._delta.tolist())]
+
     # insert a number
     def insert(self, x):
         """
@@ -69,46 +88,99 @@ class QuantileSummaries(object):
         self.head_sampled.append(x)
         if len(self.head_sampled) >= self.head_size:
             self._insert_head_buffer()
-            if len(self.sampled) >= self.compress_thres:
+            if len(self._values) >= self.compress_thres:
                 self.compress()
 
+    def insert_batch(self, values):
+        """
+        Insert a batch of observations, such as one column of a block of rows, same as inserting them one by one
+        Parameters
+        ----------
+        values : 1-D array-like
+        """
+        values = self._valid_batch(values)
+        if values is not None:
+            self._extend_head(values)
+
+    def _valid_batch(self, values):
+        """
+        drop abnormal values of a numeric batch and count them as missing, returns the float array left.
+        batch of other types is inserted one by one and None is returned
+        """
+        values = np.asarray(values)
+        if values.dtype.kind not in "biuf":
+            for x in values.tolist():
+                self.insert(x)
+            return None
+        abnormal_values = [v for v in self.abnormal_list if isinstance(v, numbers.Number)]
+        if abnormal_values:
+            is_abnormal = np.isin(values, abnormal_values)
+            abnormal_count = int(np.count_nonzero(is_abnormal))
+            if abnormal_count:
+                self.missing_count += abnormal_count
+                values = values[~is_abnormal]
+        return values.astype(np.float64, copy=False)
+
+    def _extend_head(self, values):
+        if self.head_sampled:
+            values = np.concatenate([np.asarray(self.head_sampled, dtype=np.float64), values])
+            self.head_sampled = []
+        # head buffer is flushed every head_size values, as inserting one by one does
+        start = 0
+        while len(values) - start >= self.head_size:
+            self._insert_sorted(np.sort(values[start: start + self.head_size]))
+            start += self.head_size
+            if len(self._values) >= self.compress_thres:
+                self.compress()
+        self.head_sampled = values[start:].tolist()
+
     def _insert_head_buffer(self):
         if not len(self.head_sampled):  # If empty
             return
-        current_count = self.count
-        sorted_head = sorted(self.head_sampled)
-        new_sampled = []
-        sample_idx = 0
-        ops_idx = 0
-        while ops_idx < len(sorted_head):
-            current_sample = sorted_head[ops_idx]
-            while sample_idx < len(self.sampled) and self.sampled[sample_idx].value <= current_sample:
-                new_sampled.append(self.sampled[sample_idx])
-                sample_idx += 1
-
-            current_count += 1
-
-            # If it is the first one to insert or if it is the last one
-            if not new_sampled or (sample_idx == len(self.sampled) and
-                                   ops_idx == len(sorted_head) - 1):
-                delta = 0
-            else:
-                # delta = math.floor(2 * self.error * current_count) - 1
-                delta = math.floor(2 * self.error * current_count)
-
-            new_stats = Stats(current_sample, 1, delta)
-            new_sampled.append(new_stats)
-            ops_idx += 1
-        self.sampled = new_sampled
+        sorted_head = np.sort(np.asarray(self.head_sampled, dtype=np.float64))
         self.head_sampled = []
-        self.count = current_count
+        self._insert_sorted(sorted_head)
+
+    def _insert_sorted(self, sorted_head):
+        """
+        merge sorted values into samples, each value is a new sample with g = 1, and
+        delta = floor(2 * error * count) but 0 for the new minimum and maximum
+        """
+        head_size = len(sorted_head)
+        # samples not greater than a new value are kept before it
+        head_position = np.searchsorted(self._values, sorted_head, side="right")
+        current_count = self.count + np.arange(1, head_size + 1)
+        head_delta = np.floor(2 * self.error * current_count).astype(np.int64)
+        if head_position[0] == 0:
+            head_delta[0] = 0
+        if head_position[-1] == len(self._values):
+            head_delta[-1] = 0
+
+        # samples greater than all the new values are not carried over, same as the one by one merge always did
+        sampled_size = head_position[-1]
+        self._values, self._g, self._delta = \
+            self._values[:sampled_size], self._g[:sampled_size], self._delta[:sampled_size]
+
+        head_position = head_position + np.arange(head_size)
+        sampled_position = np.searchsorted(sorted_head, self._values, side="left") + np.arange(sampled_size)
+
+        values = np.empty(head_size + sampled_size, dtype=np.float64)
+        g = np.empty(head_size + sampled_size, dtype=np.int64)
+        delta = np.empty(head_size + sampled_size, dtype=np.int64)
+        values[head_position] = sorted_head
+        g[head_position] = 1
+        delta[head_position] = head_delta
+        values[sampled_position] = self._values
+        g[sampled_position] = self._g
+        delta[sampled_position] = self._delta
+        self._values, self._g, self._delta = values, g, delta
+        self.count += head_size
 
     def compress(self):
         self._insert_head_buffer()
         # merge_threshold = math.floor(2 * self.error * self.count) - 1
         merge_threshold = 2 * self.error * self.count
-        compressed = self._compress_immut(merge_threshold)
-        self.sampled = compressed
+        self._values, self._g, self._delta = self._compress_immut(merge_threshold)
 
     def merge(self, other):
         """
@@ -132,18 +204,10 @@ class QuantileSummaries(object):
         if self.count == 0:
             return other
 
-        # merge two sorted array
-        new_sample = []
-        i, j = 0, 0
-        while i < len(self.sampled) and j < len(other.sampled):
-            if self.sampled[i].value < other.sampled[j].value:
-                new_sample.append(self.sampled[i])
-                i += 1
-            else:
-                new_sample.append(other.sampled[j])
-                j += 1
-        new_sample += self.sampled[i:]
-        new_sample += other.sampled[j:]
+        # merge two sorted array, other's sample goes first if values are equal
+        self_size, other_size = len(self._values), len(other._values)
+        self_position = np.searchsorted(other._values, self._values, side="right") + np.arange(self_size)
+        other_position = np.searchsorted(self._values, other._values, side="left") + np.arange(other_size)
 
         res_summary = self.__class__(compress_thres=self.compress_thres,
                                      head_size=self.head_size,
@@ -151,13 +215,17 @@ class QuantileSummaries(object):
                                      abnormal_list=self.abnormal_list)
         res_summary.count = self.count + other.count
         res_summary.missing_count = self.missing_count + other.missing_count
-        res_summary.sampled = new_sample
-        # self.sampled = new_sample
-        # self.count += other.count
+        res_summary._values = np.empty(self_size + other_size, dtype=np.float64)
+        res_summary._g = np.empty(self_size + other_size, dtype=np.int64)
+        res_summary._delta = np.empty(self_size + other_size, dtype=np.int64)
+        for position, summary in [(self_position, self), (other_position, other)]:
+            res_summary._values[position] = summary._values
+            res_summary._g[position] = summary._g
+            res_summary._delta[position] = summary._delta
         # merge_threshold = math.floor(2 * self.error * self.count) - 1
         merge_threshold = 2 * self.error * res_summary.count
 
-        res_summary.sampled = res_summary._compress_immut(merge_threshold)
+        res_summary._values, res_summary._g, res_summary._delta = res_summary._compress_immut(merge_threshold)
         return res_summary
 
     def query(self, quantile):
@@ -183,91 +251,78 @@ class QuantileSummaries(object):
             return 0
 
         if quantile <= self.error:
-            return self.sampled[0].value
+            return float(self._values[0])
 
         if quantile >= 1 - self.error:
-            return self.sampled[-1].value
+            return float(self._values[-1])
 
         rank = math.ceil(quantile * self.count)
         target_error = math.ceil(self.error * self.count)
-        min_rank = 0
-        i = 1
-        while i < len(self.sampled) - 1:
-            cur_sample = self.sampled[i]
-            min_rank += cur_sample.g
-            max_rank = min_rank + cur_sample.delta
-            if max_rank - target_error <= rank <= min_rank + target_error:
-                return cur_sample.value
-            i += 1
-        return self.sampled[-1].value
+        # min rank and max rank of samples except the first and the last one
+        min_rank = np.cumsum(self._g[1:-1])
+        max_rank = min_rank + self._delta[1:-1]
+        matched = np.flatnonzero((max_rank - target_error <= rank) & (rank <= min_rank + target_error))
+        if len(matched):
+            return float(self._values[matched[0] + 1])
+        return float(self._values[-1])
 
     def value_to_rank(self, value):
-        min_rank, max_rank = 0, 0
-        for sample in self.sampled:
-            if sample.value < value:
-                min_rank += sample.g
-                max_rank = min_rank + sample.delta
-            else:
-                return (min_rank + max_rank) // 2
-        return (min_rank + max_rank) // 2
+        return self._values_to_ranks(np.asarray([value]))[0]
 
     def query_value_list(self, values):
         """
         Given a sorted value list, return the rank of each element in this list
         """
         self.compress()
-        res = []
-        min_rank, max_rank = 0, 0
-        idx = 0
-        sample_idx = 0
-
-        while sample_idx < len(self.sampled):
-            v = values[idx]
-            sample = self.sampled[sample_idx]
-            if sample.value < v:
-                min_rank += sample.g
-                max_rank = min_rank + sample.delta
-                sample_idx += 1
-            else:
-                res.append((min_rank + max_rank) // 2)
-                idx += 1
-                if idx >= len(values):
-                    break
-
-        while idx < len(values):
-            res.append((min_rank + max_rank) // 2)
-            idx += 1
-        return res
-
-    def _compress_immut(self, merge_threshold):
-        if not self.sampled:
-            return self.sampled
+        return self._values_to_ranks(np.asarray(values))
 
-        res = []
-
-        # Start from the last element
-        head = self.sampled[-1]
-        i = len(self.sampled) - 2  # Do not merge the last element
+    def _values_to_ranks(self, values):
+        # rank of a value is estimated by the samples smaller than it
+        smaller_count = np.searchsorted(self._values, values, side="left")
+        min_rank = np.concatenate([[0], np.cumsum(self._g)])[smaller_count]
+        max_rank = np.concatenate([[0], np.cumsum(self._g) + self._delta])[smaller_count]
+        return ((min_rank + max_rank) // 2).tolist()
 
-        while i >= 1:
-            this_sample = self.sampled[i]
-            if this_sample.g + head.g + head.delta < merge_threshold:
-                head.g = head.g + this_sample.g
-            else:
-                res.append(head)
-                head = this_sample
-            i -= 1
-        res.append(head)
+    def _compress_immut(self, merge_threshold):
+        """
+        merge neighbour samples from the end as long as g + delta of merged sample is under threshold,
+        the first and the last sample are always kept. returns compressed (values, g, delta)
+        """
+        sampled_size = len(self._values)
+        if not sampled_size:
+            return self._values, self._g, self._delta
+
+        # g + delta < threshold equals to g + delta < ceil(threshold) for integers
+        merge_threshold = math.ceil(merge_threshold)
+        g_cumsum = np.cumsum(self._g).tolist()
+        delta = self._delta.tolist()
+        res_index, res_g = [], []
+
+        # Start from the last element, head absorbs its left neighbours, but never the first one
+        head = sampled_size - 1
+        while True:
+            lowest = head
+            if head >= 2:
+                # the leftmost j in [1, head - 1] with g_cumsum[head] - g_cumsum[j - 1] + delta[head] < threshold
+                j = max(bisect.bisect_right(g_cumsum, g_cumsum[head] + delta[head] - merge_threshold) + 1, 1)
+                if j <= head - 1:
+                    lowest = j
+            res_index.append(head)
+            res_g.append(g_cumsum[head] - (g_cumsum[lowest - 1] if lowest >= 1 else 0))
+            if lowest <= 1:
+                break
+            head = lowest - 1
 
         # If head of current sample is smaller than this new res's head
         # Add current head into res
-        current_head = self.sampled[0]
-        if current_head.value <= head.value and len(self.sampled) > 1:
-            res.append(current_head)
+        if sampled_size > 1 and self._values[0] <= self._values[res_index[-1]]:
+            res_index.append(0)
+            res_g.append(int(self._g[0]))
 
-        # Python do not support prepend, thus, use reverse instead
-        res.reverse()
-        return res
+        # samples are collected from the end, reverse them
+        res_index.reverse()
+        res_g.reverse()
+        return self._values[res_index], np.asarray(res_g, dtype=np.int64), self._delta[res_index]
 
 
 class SparseQuantileSummaries(QuantileSummaries):
@@ -300,6 +355,14 @@ class SparseQuantileSummaries(QuantileSummaries):
             self.bigger_num += 1
         super(SparseQuantileSummaries, self).insert(x)
 
+    def insert_batch(self, values):
+        values = self._valid_batch(values)
+        if values is None:
+            return
+        self.smaller_num += int(np.count_nonzero(values < consts.FLOAT_ZERO))
+        self.bigger_num += int(np.count_nonzero(values >= consts.FLOAT_ZERO))
+        self._extend_head(values)
+
     def query(self, quantile):
         if self.zero_lower_bound < quantile < self.zero_upper_bound:
             return 0.0
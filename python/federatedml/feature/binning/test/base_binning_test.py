@@ -22,14 +22,18 @@ import numpy as np
 
 from fate_arch.session import computing_session as session
 
-session.init("123")
-
+from federatedml.feature.binning.base_binning import BaseBinning
+from federatedml.feature.binning.bin_inner_param import BinInnerParam
+from federatedml.feature.binning.bin_result import BinResults
+from federatedml.feature.fate_element_type import NoneType
 from federatedml.feature.instance import Instance
+from federatedml.feature.sparse_vector import SparseVector
 from federatedml.statistic.statics import MultivariateStatisticalSummary
 
 
 class TestBaseBinningFunctions(unittest.TestCase):
     def setUp(self):
+        session.init("123")
         self.table_list = []
 
     def _gen_data(self, label_histogram: dict, partition=10):
@@ -67,6 +71,41 @@ class TestBaseBinningFunctions(unittest.TestCase):
             label_hist = summary_obj.get_label_histogram()
             self.assertDictEqual(h, label_hist)
 
+    def test_convert_partition(self):
+        header = ['d' + str(x) for x in range(10)]
+        bin_inner_param = BinInnerParam()
+        bin_inner_param.set_header(header)
+        bin_inner_param.add_transform_bin_indexes(list(range(0, 10, 2)))
+        bin_results = BinResults()
+        for col_name in header:
+            bin_results.put_col_split_points(col_name, [-1.0, 0.0, 0.5, 1.0])
+            bin_results.all_cols_results[col_name].woe_array = [0.1, 0.2, 0.3, 0.4]
+        abnormal_list = [0.5, NoneType()]
+
+        dense_data, sparse_data = [], []
+        for i in range(100):
+            features = np.random.randn(10)
+            features[i % 10] = [np.nan, 0.5, 0.0][i % 3]
+            dense_data.append((i, Instance(features=features)))
+            values = features.tolist()
+            values[i % 10] = NoneType() if i % 3 == 0 else values[i % 10]
+            sparse_data.append((i, Instance(features=SparseVector(list(range(10)), values, 10))))
+
+        for convert_type in ['bin_num', 'woe']:
+            result = BaseBinning._convert_partition(iter(dense_data), bin_inner_param, bin_results,
+                                                    abnormal_list, convert_type)
+            for (_, expect), (_, inst) in zip(dense_data, result):
+                expect = BaseBinning._convert_dense_data(expect, bin_inner_param, bin_results,
+                                                         abnormal_list, convert_type)
+                self.assertTrue(np.array_equal(expect.features, inst.features, equal_nan=True))
+
+            result = BaseBinning._convert_partition(iter(sparse_data), bin_inner_param, bin_results,
+                                                    abnormal_list, convert_type, is_sparse=True)
+            for (_, expect), (_, inst) in zip(sparse_data, result):
+                expect = BaseBinning._convert_sparse_data(expect, bin_inner_param, bin_results,
+                                                          abnormal_list, convert_type)
+                self.assertEqual(expect.features.sparse_vec, inst.features.sparse_vec)
+
     def tearDown(self):
         # for table in self.table_list:
         #     table.destroy()
@@ -52,6 +52,24 @@ class TestQuantileSummaries(unittest.TestCase):
                                                         error=self.error)
             self.test_correctness()
 
+    def test_insert_batch(self):
+        batch_summaries = QuantileSummaries(compress_thres=1000, head_size=500, error=self.error,
+                                            abnormal_list=[0.5])
+        self.quantile_summaries.abnormal_list = [0.5]
+        table = np.append(self.table, [0.5] * 10)
+        for num in table:
+            self.quantile_summaries.insert(num)
+        for start in range(0, len(table), 777):
+            batch_summaries.insert_batch(table[start: start + 777])
+        self.quantile_summaries.compress()
+        batch_summaries.compress()
+
+        self.assertEqual(batch_summaries.count, self.quantile_summaries.count)
+        self.assertEqual(batch_summaries.missing_count, 10)
+        for q_num in self.percentile_rate:
+            self.assertEqual(batch_summaries.query(q_num / 100), self.quantile_summaries.query(q_num / 100))
+        for value in self.table[:100]:
+            self.assertEqual(batch_summaries.value_to_rank(value), self.quantile_summaries.value_to_rank(value))
 
 
 if __name__ == '__main__':
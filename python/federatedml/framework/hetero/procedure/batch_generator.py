@@ -54,6 +54,7 @@ class Host(batch_info_sync.Host):
     def __init__(self):
         self.finish_sycn = False
         self.batch_data_insts = []
+        self.batch_data_sizes = []
         self.batch_nums = None
 
     def register_batch_generator(self, transfer_variables):
@@ -68,12 +69,13 @@ class Host(batch_info_sync.Host):
             # batch_data_inst = batch_data_index.join(data_instances, lambda g, d: d)
             batch_data_inst = data_instances.join(batch_data_index, lambda d, g: d)
             self.batch_data_insts.append(batch_data_inst)
+        self.batch_data_sizes = [batch_data_inst.count() for batch_data_inst in self.batch_data_insts]
 
     def generate_batch_data(self):
         batch_index = 0
         for batch_data_inst in self.batch_data_insts:
             LOGGER.info("batch_num: {}, batch_data_inst size:{}".format(
-                batch_index, batch_data_inst.count()))
+                batch_index, self.batch_data_sizes[batch_index]))
             yield batch_data_inst
             batch_index += 1
 
@@ -23,9 +23,9 @@ class Arbiter(object):
     def _register_paillier_keygen(self, pubkey_transfer):
         self._pubkey_transfer = pubkey_transfer
 
-    def paillier_keygen(self, key_length, suffix=tuple()):
+    def paillier_keygen(self, key_length, suffix=tuple(), fixed_base_obfuscator=False):
         cipher = PaillierEncrypt()
-        cipher.generate_key(key_length)
+        cipher.generate_key(key_length, fixed_base_obfuscator=fixed_base_obfuscator)
         pub_key = cipher.get_public_key()
         self._pubkey_transfer.remote(obj=pub_key, role=consts.HOST, idx=-1, suffix=suffix)
         self._pubkey_transfer.remote(obj=pub_key, role=consts.GUEST, idx=-1, suffix=suffix)
@@ -37,6 +37,9 @@ class Server(object):
     def get_models(self, suffix=tuple()):
         return self._model_scatter.get_models(suffix=suffix)
 
+    def iter_models(self, suffix=tuple()):
+        return self._model_scatter.iter_models(suffix=suffix)
+
     def send_aggregated_model(self, model, suffix=tuple()):
         self._model_broadcaster.send_model(model=model, suffix=suffix)
 
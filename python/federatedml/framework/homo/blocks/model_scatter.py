@@ -35,6 +35,13 @@ class Server(object):
         models = self._scatter.get_parties(parties=self._client_parties, suffix=suffix)
         return models
 
+    def iter_models(self, suffix=tuple()):
+        """
+        yields clients' models one by one, a model is pulled only after the previous one is consumed
+        """
+        for party in self._client_parties:
+            yield self._scatter.get_parties(parties=party, suffix=suffix)[0]
+
 
 class Client(object):
     def __init__(self, trans_var: ModelScatterTransVar = None):
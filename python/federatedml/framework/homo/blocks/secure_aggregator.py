@@ -45,10 +45,24 @@ class Server(object):
     def get_models(self, suffix=tuple()):
         return self._aggregator.get_models(suffix=suffix)
 
+    def iter_models(self, suffix=tuple()):
+        return self._aggregator.iter_models(suffix=suffix)
+
     def aggregate(self, func, suffix=tuple()):
         models = self.get_models(suffix=suffix)
         return func(models)
 
+    def fold(self, func, suffix=tuple(), map_func=None):
+        """
+        folds clients' models into a running result with func(result, model) as each one is received,
+        so at most one received model is held besides the result.
+        if map_func is given, each model is replaced by map_func(model) before being folded
+        """
+        models = self.iter_models(suffix=suffix)
+        if map_func is not None:
+            models = map(map_func, models)
+        return functools.reduce(func, models)
+
     def send_aggregated_model(self, model, suffix=tuple()):
         self._aggregator.send_aggregated_model(model=model, suffix=suffix)
 
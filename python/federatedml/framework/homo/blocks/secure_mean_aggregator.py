@@ -32,22 +32,18 @@ class Server(secure_aggregator.Server):
         super().__init__(trans_var=trans_var, enable_secure_aggregate=enable_secure_aggregate)
 
     def mean_model(self, suffix=tuple()):
-        def _func(models):
-            num = len(models)
-            return model_div_scalar(functools.reduce(model_add, models), float(num))
+        def _func(total, model):
+            return model_add(total[0], model[0]), total[1] + model[1]
 
-        return self.aggregate(_func, suffix=suffix)
+        total_model, num = self.fold(_func, suffix=suffix, map_func=lambda model: (model, 1))
+        return model_div_scalar(total_model, float(num))
 
     def weighted_mean_model(self, suffix=tuple()):
-        def _func(models):
-            total_model, total_degree = models[0]
-            for model, degree in models[1:]:
-                total_model = model_add(total_model, model)
-                total_degree += degree
-            mean_model = model_div_scalar(total_model, total_degree)
-            return mean_model
-
-        return self.aggregate(_func, suffix=suffix)
+        def _func(total, model):
+            return model_add(total[0], model[0]), total[1] + model[1]
+
+        total_model, total_degree = self.fold(_func, suffix=suffix)
+        return model_div_scalar(total_model, total_degree)
 
 
 class Client(secure_aggregator.Client):
@@ -37,10 +37,7 @@ class Server(secure_aggregator.Server):
         super().__init__(trans_var=trans_var, enable_secure_aggregate=enable_secure_aggregate)
 
     def sum_model(self, suffix=tuple()):
-        def _func(models):
-            return functools.reduce(model_add, models)
-
-        return self.aggregate(_func, suffix=suffix)
+        return self.fold(model_add, suffix=suffix)
 
 
 class Client(secure_aggregator.Client):
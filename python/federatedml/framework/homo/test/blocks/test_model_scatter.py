@@ -34,6 +34,16 @@ def model_scatter_call(job_id, role, ind, *args):
         return model_scatter.Client().send_model(model)
 
 
+def model_scatter_iter_call(job_id, role, ind, *args):
+    models = args[0]
+    if role == consts.ARBITER:
+        return list(model_scatter.Server().iter_models())
+    elif role == consts.HOST:
+        return model_scatter.Client().send_model(models[ind + 1])
+    else:
+        return model_scatter.Client().send_model(models[0])
+
+
 class ModelScatterTest(TestBlocks):
 
     def run_with_num_hosts(self, num_hosts):
@@ -48,3 +58,12 @@ class ModelScatterTest(TestBlocks):
 
     def test_host_10(self):
         self.run_with_num_hosts(10)
+
+    def test_iter_models(self):
+        num_hosts = 3
+        models = [[random.random() for _ in range(random.randint(1, 10))] for _ in range(num_hosts + 1)]
+        arbiter, _, _ = self.run_test(model_scatter_iter_call, self.job_id, num_hosts, models)
+
+        self.assertEqual(len(arbiter), len(models))
+        for model, arbiter_model in zip(models, arbiter):
+            self.assertListEqual(model, arbiter_model)
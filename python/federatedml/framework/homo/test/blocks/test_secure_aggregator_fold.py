@@ -0,0 +1,96 @@
+#
+#  Copyright 2019 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+
+import unittest
+
+import numpy as np
+
+from federatedml.framework.homo.blocks import secure_mean_aggregator
+from federatedml.framework.homo.blocks import secure_sum_aggregator
+
+
+class StubServerMixin(object):
+    """
+    replaces transfer of clients' models with a generator over given models,
+    recording how many models have been pulled
+    """
+
+    def __init__(self, models):
+        self.models = models
+        self.pulled = 0
+
+    def iter_models(self, suffix=tuple()):
+        for model in self.models:
+            self.pulled += 1
+            yield model
+
+
+class StubMeanServer(StubServerMixin, secure_mean_aggregator.Server):
+    pass
+
+
+class StubSumServer(StubServerMixin, secure_sum_aggregator.Server):
+    pass
+
+
+class SecureAggregatorFoldTest(unittest.TestCase):
+
+    def setUp(self):
+        self.models = [np.random.rand(5, 3) for _ in range(4)]
+
+    def test_fold_pulls_models_one_at_a_time(self):
+        server = StubMeanServer(self.models)
+        folded = []
+
+        def _func(total, model):
+            # the first two models are pulled before first call, then one more for each call
+            self.assertEqual(server.pulled, len(folded) + 2)
+            folded.append(model)
+            return total + model
+
+        result = server.fold(_func)
+        self.assertEqual(len(folded), len(self.models) - 1)
+        self.assertAlmostEqual(np.linalg.norm(result - sum(self.models)), 0.0)
+
+    def test_fold_with_map_func(self):
+        server = StubMeanServer(self.models)
+        result = server.fold(lambda total, model: total + model, map_func=lambda model: model * 2)
+        self.assertAlmostEqual(np.linalg.norm(result - 2 * sum(self.models)), 0.0)
+
+    def test_fold_single_model(self):
+        server = StubMeanServer(self.models[:1])
+        result = server.fold(lambda total, model: self.fail("nothing to fold"))
+        self.assertIs(result, self.models[0])
+
+    def test_mean_model(self):
+        expected = sum(self.models) / len(self.models)
+        result = StubMeanServer([m.copy() for m in self.models]).mean_model()
+        self.assertAlmostEqual(np.linalg.norm(result - expected), 0.0)
+
+    def test_weighted_mean_model(self):
+        weights = [0.1, 0.2, 0.3, 0.4]
+        expected = sum(m * w for m, w in zip(self.models, weights)) / sum(weights)
+        weighted = [(m * w, w) for m, w in zip(self.models, weights)]
+        result = StubMeanServer(weighted).weighted_mean_model()
+        self.assertAlmostEqual(np.linalg.norm(result - expected), 0.0)
+
+    def test_sum_model(self):
+        result = StubSumServer([m.copy() for m in self.models]).sum_model()
+        self.assertAlmostEqual(np.linalg.norm(result - sum(self.models)), 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -13,6 +13,7 @@
 #  limitations under the License.
 #
 import os
+import tempfile
 
 import numpy as np
 import torch
@@ -41,6 +42,12 @@ class DatasetMixIn(Dataset):
 
 
 class TableDataSet(DatasetMixIn):
+    """
+    features of the instance table are spilled partition by partition to a memory-mapped `.npy` file
+    in a local temporary directory, so the dataset is not bounded by memory of the task process.
+    The file is opened lazily in read-only mode, once per DataLoader worker.
+    """
+
     def get_num_features(self):
         return self._num_features
 
@@ -58,6 +65,7 @@ class TableDataSet(DatasetMixIn):
         data_instances: CTableABC,
         expected_label_type=np.float32,
         label_align_mapping=None,
+        cache_dir=None,
         **kwargs,
     ):
 
@@ -80,20 +88,41 @@ class TableDataSet(DatasetMixIn):
 
         # shape
         self.x_shape = data_instances.first()[1].features.shape
-        self.x = np.zeros((self.size, *self.x_shape), dtype=np.float32)
+        self._cache = tempfile.TemporaryDirectory(prefix="table_dataset_", dir=cache_dir)
+        self._x_path = os.path.join(self._cache.name, "x.npy")
+        self._x = None
+        x = np.lib.format.open_memmap(
+            self._x_path, mode="w+", dtype=np.float32, shape=(self.size, *self.x_shape)
+        )
         self.y = np.zeros((self.size,), dtype=expected_label_type)
         self._keys = []
 
         index = 0
         for key, instance in data_instances.collect():
             self._keys.append(key)
-            self.x[index] = instance.features
+            x[index] = instance.features
             self.y[index] = label_align_mapping[instance.label]
             index += 1
+        x.flush()
+        del x
+        LOGGER.debug(f"{self.size} instances cached in {self._x_path}")
 
         self._num_labels = len(label_align_mapping)
         self._num_features = self.x_shape[0]
 
+    @property
+    def x(self):
+        if self._x is None:
+            self._x = np.load(self._x_path, mmap_mode="r")
+        return self._x
+
+    def __getstate__(self):
+        # workers share the cache file, only the owner removes it
+        state = self.__dict__.copy()
+        state["_x"] = None
+        state["_cache"] = None
+        return state
+
     def __getitem__(self, index):
         return torch.tensor(self.x[index]), self.y[index]
 
@@ -20,15 +20,35 @@ import numpy as np
 from federatedml.util import LOGGER
 from fate_arch.session import computing_session
 
+# rows per table value, fixed so that tensors of the same rows built by different parties share block keys
+ROW_BLOCK_SIZE = 32
+
+
+def row_blocks(n_rows, block_size=ROW_BLOCK_SIZE):
+    """
+    yields (block index, row slice) of contiguous row blocks that cover n_rows rows
+    """
+    for block_id, start in enumerate(range(0, n_rows, block_size)):
+        yield block_id, slice(start, min(start + block_size, n_rows))
+
 
 class PaillierTensor(object):
+    """
+    Tensor stored in a table of contiguous row blocks: key is block index, value is the ndarray of rows
+    [key * ROW_BLOCK_SIZE, (key + 1) * ROW_BLOCK_SIZE), so element-wise ops join one entry per block and
+    matrix products run once per block instead of once per sample.
+
+    Tables passed by tb_obj, such as the ones received from other party, should have the same layout.
+    """
+
     def __init__(self, ori_data=None, tb_obj=None, partitions=1):
         if ori_data is not None:
-            self._ori_data = ori_data
+            self._ori_data = np.asarray(ori_data)
             self._partitions = partitions
-            self._obj = computing_session.parallelize(ori_data,
-                                                      include_key=False,
-                                                      partition=partitions)
+            self._obj = computing_session.parallelize(
+                [(block_id, self._ori_data[rows]) for block_id, rows in row_blocks(self._ori_data.shape[0])],
+                include_key=True,
+                partition=partitions)
         else:
             self._ori_data = None
             self._partitions = tb_obj.partitions
@@ -106,10 +126,10 @@ class PaillierTensor(object):
         if self._ori_data is not None:
             return self._ori_data.shape
         else:
-            first_dim = self._obj.count()
-            second_dim = self._obj.first()[1].shape
+            first_dim = self._obj.mapValues(lambda block: block.shape[0]).reduce(lambda n1, n2: n1 + n2)
+            other_dims = self._obj.first()[1].shape[1:]
 
-            return tuple([first_dim] + list(second_dim))
+            return tuple([first_dim] + list(other_dims))
 
     def mean(self, axis=-1):
         if axis == -1:
@@ -123,7 +143,7 @@ class PaillierTensor(object):
             return self._obj.mapValues(lambda val: np.sum(val)).reduce(lambda val1, val2: val1 + val2) / size
 
         else:
-            ret_obj = self._obj.mapValues(lambda val: np.mean(val, axis - 1))
+            ret_obj = self._obj.mapValues(lambda block: np.mean(block, axis))
 
             return PaillierTensor(tb_obj=ret_obj)
 
@@ -138,7 +158,7 @@ class PaillierTensor(object):
     #         return PaillierTensor(tb_obj=self._obj.mapValues(lambda x: x.sum(axis=axis-1)))
 
     def reduce_sum(self):
-        return self._obj.reduce(lambda t1, t2: t1 + t2)
+        return self._obj.mapValues(lambda block: block.sum(axis=0)).reduce(lambda t1, t2: t1 + t2)
 
     def map_ndarray_product(self, other):
         if isinstance(other, np.ndarray):
@@ -150,12 +170,9 @@ class PaillierTensor(object):
         if self._ori_data is not None:
             return self._ori_data
 
-        arr = [None for i in range(self._obj.count())]
-
-        for k, v in self._obj.collect():
-            arr[k] = v
+        blocks = [block for _, block in sorted(self._obj.collect(), key=lambda kv: kv[0])]
 
-        self._ori_data = np.array(arr, dtype=arr[0].dtype)
+        self._ori_data = np.concatenate(blocks)
 
         return self._ori_data
 
@@ -172,18 +189,8 @@ class PaillierTensor(object):
         return PaillierTensor(tb_obj=self._obj.mapValues(lambda val: decoder.decode(val)))
 
     @staticmethod
-    def _vector_mul(kv_iters):
-        ret_mat = None
-        for k, v in kv_iters:
-            tmp_mat = np.outer(v[0], v[1])
-            # tmp_mat = np.tensordot(v[0], v[1], [[], []])
-
-            if ret_mat is not None:
-                ret_mat += tmp_mat
-            else:
-                ret_mat = tmp_mat
-
-        return ret_mat
+    def _block_matmul(block1, block2):
+        return np.matmul(block1.T, block2)
 
     def fast_matmul_2d(self, other):
         """
@@ -194,9 +201,7 @@ class PaillierTensor(object):
             mat_tensor = PaillierTensor(ori_data=other, partitions=self.partitions)
             return self.fast_matmul_2d(mat_tensor)
 
-        func = self._vector_mul
-        ret_mat = self._obj.join(other.get_obj(), lambda vec1, vec2: (vec1, vec2)).applyPartitions(func).reduce(
-            lambda mat1, mat2: mat1 + mat2)
+        ret_mat = self._obj.join(other.get_obj(), self._block_matmul).reduce(lambda mat1, mat2: mat1 + mat2)
 
         return ret_mat
 
@@ -211,11 +216,11 @@ class PaillierTensor(object):
             raise ValueError('only support numpy array and Paillier Tensor')
 
         if multiply == 'left':
-            return PaillierTensor(tb_obj=self._obj.join(mat._obj, lambda val1, val2: np.tensordot(val1, val2, (1, 0))),
+            return PaillierTensor(tb_obj=self._obj.join(mat._obj, lambda val1, val2: np.matmul(val1, val2)),
                                   partitions=self._partitions)
 
         if multiply == 'right':
-            return PaillierTensor(tb_obj=mat._obj.join(self._obj, lambda val1, val2: np.tensordot(val1, val2, (1, 0))),
+            return PaillierTensor(tb_obj=mat._obj.join(self._obj, lambda val1, val2: np.matmul(val1, val2)),
                                   partitions=self._partitions)
 
     def element_wise_product(self, other):
@@ -227,10 +232,13 @@ class PaillierTensor(object):
 
     def squeeze(self, axis):
         if axis == 0:
-            return PaillierTensor(ori_data=list(self._obj.collect())[0][1], partitions=self.partitions)
+            return PaillierTensor(ori_data=dict(self._obj.collect())[0][0], partitions=self.partitions)
         else:
-            return PaillierTensor(tb_obj=self._obj.mapValues(lambda val: np.squeeze(val, axis=axis - 1)))
+            return PaillierTensor(tb_obj=self._obj.mapValues(lambda block: np.squeeze(block, axis=axis)))
 
     def select_columns(self, select_table):
+        """
+        select_table holds boolean masks in the same block layout, kept elements of a block are flattened
+        """
         return PaillierTensor(tb_obj=self._obj.join(select_table, lambda v1, v2: v1[v2]))
 
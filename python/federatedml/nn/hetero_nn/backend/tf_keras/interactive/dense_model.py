@@ -259,34 +259,13 @@ class HostDenseModel(DenseModel):
         self.role = "host"
 
     def select_backward_sample(self, selective_ids):
-        cached_shape = self.input_cached.shape[0]
-        offsets = [i + cached_shape for i in range(len(selective_ids))]
-        id_map = dict(zip(selective_ids, offsets))
-        if cached_shape == 0:
-            self.input_cached = (
-                self.input.get_obj()
-                .filter(lambda k, v: k in id_map)
-                .map(lambda k, v: (id_map[k], v))
-            )
-            self.input_cached = PaillierTensor(tb_obj=self.input_cached)
-            # selective_ids_tb = session.parallelize(zip(selective_ids, range(len(selective_ids))), include_key=True,
-            #                                        partition=self.input.partitions)
-            # self.input_cached = self.input.get_obj().join(selective_ids_tb, lambda v1, v2: (v1, v2))
-            # self.input_cached = PaillierTensor(tb_obj=self.input_cached.map(lambda k, v: (v[1], v[0])))
+        # input is stored in row blocks, selected rows are cached as ndarray and re-blocked on backward
+        if self.input_cached.shape[0] == 0:
+            self.input_cached = self.input.numpy()[selective_ids]
             self.activation_cached = self.activation_input[selective_ids]
         else:
-            # selective_ids_tb = session.parallelize(zip(selective_ids, range(len(selective_ids))), include_key=True,
-            #                                        partition=self.input.partitions)
-            # selective_input = self.input.get_obj().join(selective_ids_tb, lambda v1, v2: (v1, v2))
-            # pre_count = self.input_cached.shape[0]
-            # selective_input = selective_input.map(lambda k, v: (v[1] + pre_count, v[0]))
-            selective_input = (
-                self.input.get_obj()
-                .filter(lambda k, v: k in id_map)
-                .map(lambda k, v: (id_map[k], v))
-            )
-            self.input_cached = PaillierTensor(
-                tb_obj=self.input_cached.get_obj().union(selective_input)
+            self.input_cached = np.vstack(
+                (self.input_cached, self.input.numpy()[selective_ids])
             )
             self.activation_cached = np.vstack(
                 (self.activation_cached, self.activation_input[selective_ids])
@@ -319,11 +298,10 @@ class HostDenseModel(DenseModel):
     def get_weight_gradient(self, delta, encoder=None):
         # delta_w = self.input.fast_matmul_2d(delta) / self.input.shape[0]
         if self.do_backward_selective_strategy:
-            self.input = self.input_cached.filter(lambda k, v: k < self.batch_size)
-            self.input_cached = self.input_cached.filter(
-                lambda k, v: k >= self.batch_size
-            ).map(lambda kv: (kv[0] - self.batch_size, kv[1]))
-            # self.input_cached = self.input_cached.subtractByKey(self.input).map(lambda kv: (kv[0] - self.batch_size, kv[1]))
+            self.input = PaillierTensor(
+                ori_data=self.input_cached[: self.batch_size], partitions=self.input.partitions
+            )
+            self.input_cached = self.input_cached[self.batch_size :]
 
         if encoder:
             delta_w = self.input.fast_matmul_2d(encoder.encode(delta))
@@ -17,7 +17,8 @@
 #  limitations under the License.
 #
 import numpy as np
-from fate_arch.session import computing_session as session
+
+from federatedml.nn.hetero_nn.backend.paillier_tensor import PaillierTensor
 
 
 class DropOut(object):
@@ -46,7 +47,7 @@ class DropOut(object):
         self._mask = np.random.uniform(low=0, high=1, size=self._noise_shape) < self._keep_rate
 
     def generate_mask_table(self):
-        _mask_table = session.parallelize(self._mask, include_key=False, partition=self._partition)
+        _mask_table = PaillierTensor(ori_data=self._mask, partitions=self._partition).get_obj()
 
         self._mask_table = _mask_table
         return _mask_table
@@ -61,6 +61,21 @@ class TestPaillierTensor(unittest.TestCase):
     def test_mean(self):
         self.assertTrue(abs(self.paillier_tensor1.mean() - 1.0) < consts.FLOAT_ZERO)
 
+    def test_row_blocks(self):
+        data = np.arange(1000 * 3).reshape((1000, 3))
+        paillier_tensor = PaillierTensor(ori_data=data, partitions=4)
+        self.assertTrue(paillier_tensor.get_obj().count() < 1000)
+        self.assertTrue(np.array_equal(PaillierTensor(tb_obj=paillier_tensor.get_obj()).numpy(), data))
+        self.assertTrue(PaillierTensor(tb_obj=paillier_tensor.get_obj()).shape == (1000, 3))
+
+    def test_fast_matmul_2d(self):
+        data1 = np.random.rand(1000, 10)
+        data2 = np.random.rand(1000, 4)
+        paillier_tensor = PaillierTensor(ori_data=data1, partitions=10)
+        ret = paillier_tensor.fast_matmul_2d(data2)
+        self.assertTrue(ret.shape == (10, 4))
+        self.assertTrue(np.abs(ret - np.matmul(data1.T, data2)).max() < consts.FLOAT_ZERO)
+
     def test_encrypt_and_decrypt(self):
         from federatedml.secureprotol import PaillierEncrypt
         from federatedml.secureprotol.encrypt_mode import EncryptModeCalculator
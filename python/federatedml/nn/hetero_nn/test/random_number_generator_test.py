@@ -1,5 +1,6 @@
 from federatedml.nn.hetero_nn.util.random_number_generator import RandomNumberGenerator
 from federatedml.nn.hetero_nn.backend.paillier_tensor import PaillierTensor
+from federatedml.util.fixpoint_solver import FixedPointEncoder
 import numpy as np
 from fate_arch.session import computing_session as session
 import random
@@ -24,6 +25,13 @@ class TestRandomNumberGenerator(unittest.TestCase):
         self.assertTrue(isinstance(random_data, PaillierTensor))
         self.assertTrue(tuple(random_data.shape) == tuple(data.shape))
 
+    def test_encoded_noise_matches_noise(self):
+        # the noise added to forward output encoded, and removed later as is, must be drawn once
+        noise = self.rng_gen.fast_generate_random_number((1000, 10), partition=4)
+        encoded_noise = noise.encode(FixedPointEncoder(2 ** 16))
+        residual = encoded_noise.decode(FixedPointEncoder(2 ** 16)) - noise
+        self.assertLess(np.abs(residual.numpy()).max(), 1e-3)
+
     def tearDown(self):
         session.stop()
 
@@ -22,7 +22,7 @@ import random
 import numpy as np
 from fate_arch.session import computing_session
 
-from federatedml.nn.hetero_nn.backend.paillier_tensor import PaillierTensor
+from federatedml.nn.hetero_nn.backend.paillier_tensor import PaillierTensor, row_blocks
 
 BITS = 10
 MIXED_RATE = 0.5
@@ -60,7 +60,7 @@ class RandomNumberGenerator(object):
     def generate_random_number(self, shape=None, mixed_rate=MIXED_RATE, keep=None):
         if keep is not None:
             size = self.get_size_by_shape(keep.shape)
-            return self.generate_random_number_1d(size, mixed_rate=mixed_rate, keep=keep)
+            return self.generate_random_number_1d(size, mixed_rate=mixed_rate, keep=keep.flatten())
         else:
             size = self.get_size_by_shape(shape)
             return np.reshape(self.generate_random_number_1d(size, mixed_rate=mixed_rate), shape)
@@ -71,8 +71,10 @@ class RandomNumberGenerator(object):
                                                                                      mixed_rate=mixed_rate))
             return PaillierTensor(tb_obj=tb)
         else:
-            tb = computing_session.parallelize([None for _ in range(shape[0])], include_key=False, partition=partition)
+            block_rows = [(block_id, rows.stop - rows.start) for block_id, rows in row_blocks(shape[0])]
+            tb = computing_session.parallelize(block_rows, include_key=True, partition=partition)
 
-            tb = tb.mapValues(lambda val: self.generate_random_number(shape[1:], mixed_rate=mixed_rate))
+            tb = tb.mapValues(lambda n_rows: self.generate_random_number([n_rows] + list(shape[1:]),
+                                                                         mixed_rate=mixed_rate))
 
             return PaillierTensor(tb_obj=tb)
@@ -13,6 +13,7 @@
 #  limitations under the License.
 #
 #
+import itertools
 import json
 import math
 import os
@@ -195,6 +196,9 @@ class PyTorchSAServerContext(_PyTorchSAContext):
     def recv_model(self):
         return self.aggregator.get_models(suffix=self._suffix())
 
+    def iter_models(self):
+        return self.aggregator.iter_models(suffix=self._suffix())
+
     def send_convergence_status(self, status):
         self.aggregator.send_aggregated_model(
             status, suffix=self._suffix(group="convergence")
@@ -375,16 +379,15 @@ class PyTorchFederatedTrainer(object):
         dataloader = torch.utils.data.DataLoader(
             dataset=dataset, batch_size=batch_size, num_workers=1
         )
-        results = []
-        for x, y in dataloader:
-            results.append(self.pl_model(x).detach().numpy())
-
-        predict = numpy.vstack(results)
-        num_output_units = predict.shape[1]
+        # predictions are generated batch by batch while the table is written, never stacked in memory
+        batches = (self.pl_model(x).detach().numpy() for x, y in dataloader)
+        first_batch = next(batches)
+        num_output_units = first_batch.shape[1]
+        rows = (row for batch in itertools.chain([first_batch], batches) for row in batch.tolist())
         if num_output_units == 1:
-            kv = zip(dataset.get_keys(), (x.tolist()[0] for x in predict))
+            kv = zip(dataset.get_keys(), (row[0] for row in rows))
         else:
-            kv = zip(dataset.get_keys(), predict.tolist())
+            kv = zip(dataset.get_keys(), rows)
 
         partitions = getattr(dataset, "partitions", 10)
 
@@ -547,19 +550,20 @@ class PytorchFederatedAggregator(object):
 
     def fit(self, loss_callback):
         while not self.context.finished():
-            recv_elements: typing.List[
-                typing.Tuple[typing.List[numpy.ndarray], float]
-            ] = self.context.recv_model()
-            degrees = [party_tuple[1] for party_tuple in recv_elements]
-            tensors = [party_tuple[0] for party_tuple in recv_elements]
-            total_degree = sum(degrees)
-            for i in range(len(tensors)):
-                for j, tensor in enumerate(tensors[i]):
-                    tensor /= total_degree
-                    if i != 0:
-                        tensors[0][j] += tensor
-
-            self.context.send_model(tensors[0])
+            # fold each party's tensors into the running sum as soon as they are received
+            aggregated_tensors: typing.Optional[typing.List[numpy.ndarray]] = None
+            total_degree = 0.0
+            for tensors, degree in self.context.iter_models():
+                total_degree += degree
+                if aggregated_tensors is None:
+                    aggregated_tensors = tensors
+                else:
+                    for j, tensor in enumerate(tensors):
+                        aggregated_tensors[j] += tensor
+            for tensor in aggregated_tensors:
+                tensor /= total_degree
+
+            self.context.send_model(aggregated_tensors)
             is_converged, loss = self.context.do_convergence_check()
             loss_callback(self.context.aggregation_iteration, float(loss))
 
@@ -0,0 +1,173 @@
+#
+#  Copyright 2019 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+
+import gc
+import os
+import pickle
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from federatedml.feature.instance import Instance
+
+try:
+    import torch
+    from federatedml.nn.backend.pytorch.data import TableDataSet
+except ImportError:
+    torch = None
+
+try:
+    from federatedml.nn.homo_nn import _torch
+except ImportError:
+    _torch = None
+
+
+class InstanceTable(object):
+    """
+    in memory stand-in of an instance table, with the calls TableDataSet makes
+    """
+
+    def __init__(self, kvs, partitions=4):
+        self.kvs = kvs
+        self.partitions = partitions
+
+    def count(self):
+        return len(self.kvs)
+
+    def first(self):
+        return self.kvs[0]
+
+    def collect(self):
+        return iter(self.kvs)
+
+
+def make_table(num_instances=10, num_features=3):
+    kvs = [(f"id_{i}", Instance(features=np.random.rand(num_features), label=i % 2))
+           for i in range(num_instances)]
+    return InstanceTable(kvs)
+
+
+@unittest.skipIf(torch is None, "pytorch is not installed")
+class TableDataSetTest(unittest.TestCase):
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.table = make_table()
+        self.label_align_mapping = {0: 1, 1: 0}
+
+    def _dataset(self):
+        return TableDataSet(self.table, label_align_mapping=self.label_align_mapping, cache_dir=self.cache_dir)
+
+    def test_memmap_contents(self):
+        dataset = self._dataset()
+        self.assertEqual(len(dataset), len(self.table.kvs))
+        self.assertListEqual(dataset.get_keys(), [k for k, _ in self.table.kvs])
+        self.assertIsInstance(dataset.x, np.memmap)
+        self.assertFalse(dataset.x.flags.writeable)
+        for i, (_, instance) in enumerate(self.table.kvs):
+            x, y = dataset[i]
+            np.testing.assert_allclose(x.numpy(), instance.features.astype(np.float32))
+            self.assertEqual(y, self.label_align_mapping[instance.label])
+        self.assertEqual(dataset.get_num_features(), 3)
+        self.assertEqual(dataset.get_num_labels(), 2)
+
+    def test_pickle_does_not_own_cache(self):
+        dataset = self._dataset()
+        _ = dataset.x
+        copied = pickle.loads(pickle.dumps(dataset))
+        self.assertIsNone(copied._x)
+        np.testing.assert_array_equal(copied.x, dataset.x)
+
+        # dropping a copy keeps the file, dropping the owner removes it
+        del copied
+        gc.collect()
+        self.assertTrue(os.path.exists(dataset._x_path))
+        cache_path = dataset._cache.name
+        del dataset
+        gc.collect()
+        self.assertFalse(os.path.exists(cache_path))
+
+    def test_dataloader_workers(self):
+        dataset = self._dataset()
+        # spawned workers receive the dataset pickled, each one opens the cache file itself
+        dataloader = torch.utils.data.DataLoader(dataset, batch_size=3, num_workers=2,
+                                                 multiprocessing_context="spawn")
+        x = torch.cat([batch_x for batch_x, _ in dataloader]).numpy()
+        y = torch.cat([batch_y for _, batch_y in dataloader]).numpy()
+        np.testing.assert_allclose(x, np.stack([instance.features for _, instance in self.table.kvs]), rtol=1e-6)
+        np.testing.assert_array_equal(y, [self.label_align_mapping[inst.label] for _, inst in self.table.kvs])
+
+        cache_path = dataset._cache.name
+        self.assertTrue(os.path.exists(dataset._x_path))
+        del dataloader, dataset
+        gc.collect()
+        self.assertFalse(os.path.exists(cache_path))
+
+    def tearDown(self):
+        gc.collect()
+        os.rmdir(self.cache_dir)
+
+
+@unittest.skipIf(torch is None or _torch is None, "pytorch or pytorch_lightning is not installed")
+class StreamedPredictTest(unittest.TestCase):
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.table = make_table(num_instances=11)
+        self.dataset = TableDataSet(self.table, label_align_mapping={0: 0, 1: 1}, cache_dir=self.cache_dir)
+
+    def _predict(self, num_output_units):
+        model = torch.nn.Linear(3, num_output_units)
+        trainer = _torch.PyTorchFederatedTrainer(pl_model=model)
+        collected = {}
+
+        def _parallelize(data, include_key, partition):
+            self.assertNotIsInstance(data, (list, tuple))
+            collected["kv"] = list(data)
+            collected["partition"] = partition
+            return mock.sentinel.table
+
+        with mock.patch.object(_torch, "computing_session") as computing_session:
+            computing_session.parallelize.side_effect = _parallelize
+            pred_tbl, classes = trainer.predict(self.dataset, batch_size=4)
+
+        self.assertIs(pred_tbl, mock.sentinel.table)
+        self.assertEqual(collected["partition"], self.table.partitions)
+        expected = model(torch.tensor(self.dataset.x)).detach().numpy()
+        return collected["kv"], classes, expected
+
+    def test_predict_order_single_output(self):
+        kv, classes, expected = self._predict(1)
+        self.assertListEqual([k for k, _ in kv], self.dataset.get_keys())
+        np.testing.assert_allclose([v for _, v in kv], expected[:, 0], rtol=1e-5)
+        self.assertListEqual(classes, [0, 1])
+
+    def test_predict_order_multiple_outputs(self):
+        kv, classes, expected = self._predict(3)
+        self.assertListEqual([k for k, _ in kv], self.dataset.get_keys())
+        np.testing.assert_allclose([v for _, v in kv], expected, rtol=1e-5)
+        self.assertListEqual(classes, [0, 1, 2])
+
+    def tearDown(self):
+        del self.dataset
+        gc.collect()
+        os.rmdir(self.cache_dir)
+
+
+if __name__ == '__main__':
+    unittest.main()
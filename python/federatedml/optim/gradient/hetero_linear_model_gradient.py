@@ -118,15 +118,45 @@ class HeteroGradientBase(object):
                 gradient.append(bias_grad)
             return np.array(gradient)
 
+    @staticmethod
+    def __apply_cal_sparse_gradient(data, fixed_point_encoder):
+        """
+        Accumulate d * x_j per column over non-zero entries only, so that no multiplication is paid
+        for zero features. Columns without any non-zero entry get 0 * d, as the dense version does.
+        """
+        col_g = {}
+        shape = None
+        zero_g = None
+        for key, (feature, d) in data:
+            if shape is None:
+                shape = feature.get_shape()
+                zero_g = d * 0
+            sparse_vec = feature.get_sparse_vector()
+            if not sparse_vec:
+                continue
+            indices = list(sparse_vec.keys())
+            values = np.array(list(sparse_vec.values()))
+            if fixed_point_encoder:
+                values = fixed_point_encoder.encode(values)
+            for idx, v in zip(indices, values):
+                g = v * d
+                if idx in col_g:
+                    col_g[idx] += g
+                else:
+                    col_g[idx] = g
+        if shape is None:
+            return None
+        all_g = np.array([col_g.get(idx, zero_g) for idx in range(shape)])
+        if fixed_point_encoder:
+            all_g = fixed_point_encoder.decode(all_g)
+        return all_g
+
     @staticmethod
     def __apply_cal_gradient(data, fixed_point_encoder, is_sparse):
+        if is_sparse:
+            return HeteroGradientBase.__apply_cal_sparse_gradient(data, fixed_point_encoder)
         all_g = None
         for key, (feature, d) in data:
-            if is_sparse:
-                x = np.zeros(feature.get_shape())
-                for idx, v in feature.get_all_data():
-                    x[idx] = v
-                feature = x
             if fixed_point_encoder:
                 # g = (feature * 2 ** floating_point_precision).astype("int") * d
                 g = fixed_point_encoder.encode(feature) * d
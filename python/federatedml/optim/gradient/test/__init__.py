@@ -13,7 +13,3 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 #
-
-from federatedml.optim.gradient.logistic_gradient import LogisticGradient, HeteroLogisticGradient, TaylorLogisticGradient
-
-__all__ = ["LogisticGradient", "HeteroLogisticGradient", "TaylorLogisticGradient"]
\ No newline at end of file
@@ -15,6 +15,7 @@
 #
 
 import unittest
+import uuid
 
 import numpy as np
 
@@ -28,6 +29,7 @@ from federatedml.secureprotol import PaillierEncrypt
 
 class TestHeteroLogisticGradient(unittest.TestCase):
     def setUp(self):
+        session.init("test_hetero_lr_gradient_" + str(uuid.uuid1()))
         self.paillier_encrypt = PaillierEncrypt()
         self.paillier_encrypt.generate_key()
         # self.hetero_lr_gradient = HeteroLogisticGradient(self.paillier_encrypt)
@@ -82,8 +84,38 @@ class TestHeteroLogisticGradient(unittest.TestCase):
 
         return self.data_inst.mapValues(trans_sparse)
 
+    def test_apply_partitions_sparse_gradient(self):
+        # enough features * instances to take the applyPartitions path, column 3 is zero everywhere
+        data_num, feature_num = 40, 6
+        features = np.random.randint(-3, 4, (data_num, feature_num)) * (np.random.rand(data_num, feature_num) < 0.3)
+        features[:, 3] = 0
+        features[5] = 0
+        dense_data = session.parallelize([Instance(features=features[i].astype(float)) for i in range(data_num)],
+                                         partition=4, include_key=False)
+        sparse_data = dense_data.mapValues(
+            lambda inst: Instance(features=SparseVector(indices=np.nonzero(inst.features)[0].tolist(),
+                                                        data=inst.features[np.nonzero(inst.features)[0]].tolist(),
+                                                        shape=feature_num)))
+        fore_gradient = session.parallelize(np.random.rand(data_num).tolist(), partition=4, include_key=False)
+        en_fore_gradient = fore_gradient.mapValues(self.paillier_encrypt.encrypt)
+
+        for floating_point_precision in [None, 23]:
+            gradient_computer = hetero_linear_model_gradient.HeteroGradientBase()
+            gradient_computer.set_fixed_float_precision(floating_point_precision)
+            for fit_intercept in [True, False]:
+                dense_result = gradient_computer.compute_gradient(dense_data, fore_gradient, fit_intercept)
+                sparse_result = gradient_computer.compute_gradient(sparse_data, fore_gradient, fit_intercept)
+                self.assertEqual(len(sparse_result), feature_num + int(fit_intercept))
+                self.assertTrue(np.allclose(dense_result, sparse_result))
+
+                en_dense_result = gradient_computer.compute_gradient(dense_data, en_fore_gradient, fit_intercept)
+                en_sparse_result = gradient_computer.compute_gradient(sparse_data, en_fore_gradient, fit_intercept)
+                self.assertTrue(np.allclose([self.paillier_encrypt.decrypt(g) for g in en_dense_result],
+                                            [self.paillier_encrypt.decrypt(g) for g in en_sparse_result]))
+
+    def tearDown(self):
+        session.stop()
+
 
 if __name__ == "__main__":
-    session.init("1111")
     unittest.main()
-    session.stop()
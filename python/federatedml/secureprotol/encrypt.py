@@ -108,6 +108,8 @@ class RsaEncrypt(Encrypt):
         self.e = None
         self.d = None
         self.n = None
+        self.p = None
+        self.q = None
 
     def generate_key(self, rsa_bit=1024):
         random_generator = Random.new().read
@@ -115,10 +117,20 @@ class RsaEncrypt(Encrypt):
         self.e = rsa.e
         self.d = rsa.d
         self.n = rsa.n
+        self.p = rsa.p
+        self.q = rsa.q
 
     def get_key_pair(self):
         return self.e, self.d, self.n
 
+    def get_crt_key(self):
+        """
+        return CRT components of private key: p, q, d mod (p - 1), d mod (q - 1), q ** -1 mod p
+        """
+        if self.p is None or self.q is None:
+            return None
+        return self.p, self.q, self.d % (self.p - 1), self.d % (self.q - 1), gmpy_math.invert(self.q, self.p)
+
     def set_public_key(self, public_key):
         self.e = public_key["e"]
         self.n = public_key["n"]
@@ -150,10 +162,12 @@ class PaillierEncrypt(Encrypt):
     def __init__(self):
         super(PaillierEncrypt, self).__init__()
 
-    def generate_key(self, n_length=1024):
+    def generate_key(self, n_length=1024, fixed_base_obfuscator=False):
         self.public_key, self.privacy_key = PaillierKeypair.generate_keypair(
             n_length=n_length
         )
+        if fixed_base_obfuscator:
+            self.public_key.init_fixed_base_obfuscator()
 
     def get_key_pair(self):
         return self.public_key, self.privacy_key
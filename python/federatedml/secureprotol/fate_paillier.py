@@ -16,6 +16,7 @@
 #  limitations under the License.
 #
 
+from collections import OrderedDict
 from collections.abc import Mapping
 from federatedml.secureprotol.fixedpoint import FixedPointNumber
 from federatedml.secureprotol import gmpy_math
@@ -50,6 +51,8 @@ class PaillierKeypair(object):
 class PaillierPublicKey(object):
     """Contains a public key and associated encryption methods.
     """
+    obfuscator = None
+
     def __init__(self, n):
         self.g = n + 1
         self.n = n
@@ -66,11 +69,19 @@ class PaillierPublicKey(object):
     def __hash__(self):
         return hash(self.n)
 
+    def init_fixed_base_obfuscator(self, exponent_bits=None, window_bits=8):
+        """use FixedBaseObfuscator instead of r ** n for random obfuscation
+        """
+        self.obfuscator = FixedBaseObfuscator(self, exponent_bits, window_bits)
+
     def apply_obfuscator(self, ciphertext, random_value=None):
         """
         """
-        r = random_value or random.SystemRandom().randrange(1, self.n)
-        obfuscator = gmpy_math.powmod(r, self.n, self.nsquare)
+        if random_value is None and self.obfuscator is not None:
+            obfuscator = self.obfuscator.generate()
+        else:
+            r = random_value or random.SystemRandom().randrange(1, self.n)
+            obfuscator = gmpy_math.powmod(r, self.n, self.nsquare)
 
         return (ciphertext * obfuscator) % self.nsquare
 
@@ -106,6 +117,62 @@ class PaillierPublicKey(object):
         return encryptednumber
 
 
+class FixedBaseObfuscator(object):
+    """Obfuscator of Damgard-Jurik-Nielsen style: hs ** a mod n^2, where hs = (-x^2) ** n mod n^2 for a random x
+    is fixed per key, and a is a random exponent of exponent_bits(default: half of key length).
+
+    hs ** a is computed from a fixed-base window table: table[i][j] = hs ** (j * 2 ** (window_bits * i)),
+    so an obfuscator costs exponent_bits / window_bits modular multiplications instead of a full powmod.
+    The table is built lazily and cached per process in a small LRU, it is not pickled with the public key.
+    """
+    _tables = OrderedDict()
+    _max_cached_tables = 2
+
+    def __init__(self, public_key, exponent_bits=None, window_bits=8):
+        self.nsquare = public_key.nsquare
+        self.exponent_bits = exponent_bits or public_key.n.bit_length() // 2
+        self.window_bits = window_bits
+        x = random.SystemRandom().randrange(1, public_key.n)
+        self.hs = gmpy_math.powmod(public_key.n - x * x % public_key.n, public_key.n, public_key.nsquare)
+
+    def _get_table(self):
+        key = (self.hs, self.nsquare, self.exponent_bits, self.window_bits)
+        table = self._tables.get(key)
+        if table is not None:
+            self._tables.move_to_end(key)
+        else:
+            nsquare = gmpy_math.mpz(self.nsquare)
+            base = gmpy_math.mpz(self.hs)
+            table = []
+            for i in range((self.exponent_bits + self.window_bits - 1) // self.window_bits):
+                row = [gmpy_math.mpz(1), base]
+                for j in range(2, 1 << self.window_bits):
+                    row.append(row[-1] * base % nsquare)
+                table.append(row)
+                base = row[-1] * base % nsquare
+            self._tables[key] = table
+            while len(self._tables) > self._max_cached_tables:
+                self._tables.popitem(last=False)
+
+        return table
+
+    def generate(self):
+        """return int: hs ** a mod n^2 with a fresh random a
+        """
+        table = self._get_table()
+        nsquare = gmpy_math.mpz(self.nsquare)
+        mask = (1 << self.window_bits) - 1
+        a = random.SystemRandom().getrandbits(self.exponent_bits)
+        obfuscator = gmpy_math.mpz(1)
+        for row in table:
+            digit = a & mask
+            if digit:
+                obfuscator = obfuscator * row[digit] % nsquare
+            a >>= self.window_bits
+
+        return int(obfuscator)
+
+
 class PaillierPrivateKey(object):
     """Contains a private key and associated decryption method.
     """
@@ -335,3 +402,52 @@ class PaillierEncryptedNumber(object):
 
         return PaillierEncryptedNumber(self.public_key, ciphertext, exponent)
 
+
+class PaillierCiphertextAccumulator(object):
+    """Sums PaillierEncryptedNumbers on raw ciphertexts.
+
+    Ciphertexts are multiplied modulo n^2 in buckets keyed by exponent, so no exponent alignment
+    and no PaillierEncryptedNumber is created per addition. Exponents are aligned once per bucket
+    when the sum is produced.
+    """
+    def __init__(self, public_key):
+        self.public_key = public_key
+        self.nsquare = gmpy_math.mpz(public_key.nsquare)
+        self.buckets = {}
+
+    def __len__(self):
+        return len(self.buckets)
+
+    def add_raw(self, ciphertext, exponent):
+        """add a raw ciphertext(preferably gmpy2.mpz) encoded with exponent
+        """
+        acc = self.buckets.get(exponent)
+        self.buckets[exponent] = ciphertext if acc is None else acc * ciphertext % self.nsquare
+
+    def add(self, encrypted_number):
+        if self.public_key != encrypted_number.public_key:
+            raise ValueError("add two numbers have different public key!")
+
+        self.add_raw(gmpy_math.mpz(encrypted_number.ciphertext(False)), encrypted_number.exponent)
+
+    def merge(self, other):
+        for exponent, ciphertext in other.buckets.items():
+            self.add_raw(ciphertext, exponent)
+
+        return self
+
+    def encrypted_sum(self):
+        """return PaillierEncryptedNumber of the accumulated sum, None if nothing is accumulated
+        """
+        if not self.buckets:
+            return None
+
+        max_exponent = max(self.buckets)
+        ciphertext = gmpy_math.mpz(1)
+        for exponent, acc in self.buckets.items():
+            if exponent != max_exponent:
+                acc = PaillierEncryptedNumber(self.public_key, int(acc), exponent).increase_exponent_to(max_exponent)
+                acc = gmpy_math.mpz(acc.ciphertext(False))
+            ciphertext = ciphertext * acc % self.nsquare
+
+        return PaillierEncryptedNumber(self.public_key, int(ciphertext), max_exponent)
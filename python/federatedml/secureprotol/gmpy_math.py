@@ -35,6 +35,25 @@ def powmod(a, b, c):
         return int(gmpy2.powmod(a, b, c))
 
 
+def powmod_crt(a, p, q, dp, dq, q_inverse):
+    """
+    return int: (a ** d) % (p * q), with CRT components dp = d % (p - 1), dq = d % (q - 1),
+    q_inverse = q ** -1 % p
+    """
+    mp = gmpy2.powmod(a, dp, p)
+    mq = gmpy2.powmod(a, dq, q)
+    h = q_inverse * (mp - mq) % p
+
+    return int(mq + h * q)
+
+
+def mpz(a):
+    """
+    return gmpy2.mpz: a as gmpy2 multiple precision integer, for repeated modular products
+    """
+    return gmpy2.mpz(a)
+
+
 def invert(a, b):
     """return int: x, where a * x == 1 mod b
     """    
@@ -14,4 +14,5 @@
 #  limitations under the License.
 #
 
-from federatedml.secureprotol.spdz.beaver_triples.he import beaver_triplets
+from federatedml.secureprotol.spdz.beaver_triples.he import beaver_triplets, ring_beaver_triplets
+from federatedml.secureprotol.spdz.beaver_triples.pool import BeaverTriplePool
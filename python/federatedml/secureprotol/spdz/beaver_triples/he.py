@@ -13,11 +13,13 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 #
+import random
+
 import numpy as np
 
 from fate_arch.session import is_table
 from federatedml.secureprotol.spdz.communicator import Communicator
-from federatedml.secureprotol.spdz.utils.random_utils import rand_tensor, urand_tensor
+from federatedml.secureprotol.spdz.utils.random_utils import rand_tensor, urand_tensor, urand_ring_tensor
 
 
 def encrypt_tensor(tensor, public_key):
@@ -65,3 +67,46 @@ def beaver_triplets(a_tensor, b_tensor, dot, q_field, he_key_pair, communicator:
     c = _cross(communicator.party_idx, 1 - communicator.party_idx)
 
     return a, b, c % q_field
+
+
+# statistical security parameter of masks on cross terms in ring triplets
+RING_MASK_SECURITY_BITS = 40
+
+
+def ring_beaver_triplets(a_tensor, b_tensor, dot, he_key_pair, communicator: Communicator, name):
+    """
+    beaver triplets over ring Z_{2^64}, a, b and c are uint64 arrays of the shapes of a_tensor and b_tensor.
+    local products wrap around natively, cross terms are computed under paillier over integers,
+    masked by random integers large enough to statistically hide them, and then reduced to the ring
+    """
+    public_key, private_key = he_key_pair
+    a = urand_ring_tensor(a_tensor)
+    b = urand_ring_tensor(b_tensor)
+    ring_size = 1 << 64
+    # a cross term is a sum of at most b.size products of two 64 bits integers
+    mask_bits = 128 + max(b.size, 1).bit_length() + RING_MASK_SECURITY_BITS
+
+    def _cross(self_index, other_index):
+        _c = dot(a, b)
+        encrypted_a = encrypt_tensor(a.astype(object), public_key)
+        communicator.remote_encrypted_tensor(encrypted=encrypted_a, tag=f"{name}_a_{self_index}")
+        _p, (ea,) = communicator.get_encrypted_tensors(tag=f"{name}_a_{other_index}")
+        eab = dot(ea, b.astype(object))
+        r = np.zeros(shape=_c.shape, dtype=object)
+        view = r.view().reshape(-1)
+        for i in range(r.size):
+            view[i] = random.SystemRandom().getrandbits(mask_bits)
+        eab += r
+        _c -= (r % ring_size).astype(np.uint64)
+        communicator.remote_encrypted_cross_tensor(encrypted=eab,
+                                                   parties=_p,
+                                                   tag=f"{name}_cross_a_{other_index}_b_{self_index}")
+        crosses = communicator.get_encrypted_cross_tensors(tag=f"{name}_cross_a_{self_index}_b_{other_index}")
+        for eab in crosses:
+            _c += (decrypt_tensor(eab, private_key, [object]) % ring_size).astype(np.uint64)
+
+        return _c
+
+    c = _cross(communicator.party_idx, 1 - communicator.party_idx)
+
+    return a, b, c
@@ -0,0 +1,52 @@
+#
+#  Copyright 2019 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+from collections import defaultdict, deque
+
+
+class BeaverTriplePool(object):
+    """
+    beaver triplets generated in offline phase, taken by the online multiplications they were prepared for.
+
+    Triplets are queued by a key describing the multiplication, such as einsum expression and operand shapes.
+    Every party prepares and takes triplets in the same order, so a multiplication is served from the pool
+    on all parties or on none of them.
+    """
+
+    def __init__(self):
+        self._triplets = defaultdict(deque)
+
+    def put(self, key, triplet):
+        self._triplets[key].append(triplet)
+
+    def take(self, key):
+        """
+        returns the earliest triplet prepared for key, None if there is none left
+        """
+        queue = self._triplets.get(key)
+        if not queue:
+            return None
+        triplet = queue.popleft()
+        if not queue:
+            del self._triplets[key]
+        return triplet
+
+    def size(self, key=None):
+        if key is None:
+            return sum(len(queue) for queue in self._triplets.values())
+        return len(self._triplets.get(key, ()))
+
+    def clear(self):
+        self._triplets.clear()
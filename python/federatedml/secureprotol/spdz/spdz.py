@@ -15,6 +15,7 @@
 #
 
 from federatedml.secureprotol.fate_paillier import PaillierKeypair
+from federatedml.secureprotol.spdz.beaver_triples import BeaverTriplePool
 from federatedml.secureprotol.spdz.communicator import Communicator
 from federatedml.secureprotol.spdz.utils import NamingService
 from federatedml.secureprotol.spdz.utils import naming
@@ -37,7 +38,11 @@ class SPDZ(object):
     def has_instance(cls):
         return cls.__instance is not None
 
-    def __init__(self, name="ss", q_field=2 << 60, local_party=None, all_parties=None, use_mix_rand=False):
+    def __init__(self, name="ss", q_field=2 << 60, local_party=None, all_parties=None, use_mix_rand=False,
+                 use_ring=False):
+        """
+        use_ring: shares numpy tensors over ring Z_{2^64} as native uint64 arrays instead of field `q_field`
+        """
         self.name_service = naming.NamingService(name)
         self._prev_name_service = None
         self._pre_instance = None
@@ -49,8 +54,11 @@ class SPDZ(object):
         if len(self.other_parties) > 1:
             raise EnvironmentError("support 2-party secret share only")
         self.public_key, self.private_key = PaillierKeypair.generate_keypair(1024)
-        self.q_field = q_field
+        self.use_ring = use_ring
+        self.q_field = 1 << 64 if use_ring else q_field
         self.use_mix_rand = use_mix_rand
+        # beaver triplets prepared in offline phase, see `prepare_dot` of tensors
+        self.triplet_pool = BeaverTriplePool()
 
     def __enter__(self):
         self._prev_name_service = NamingService.set_instance(self.name_service)
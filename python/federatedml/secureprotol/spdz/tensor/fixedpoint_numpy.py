@@ -17,9 +17,11 @@ import numpy as np
 
 from fate_arch.common import Party
 from fate_arch.session import is_table
-from federatedml.secureprotol.spdz.beaver_triples import beaver_triplets
+from federatedml.secureprotol.spdz.beaver_triples import beaver_triplets, ring_beaver_triplets
 from federatedml.secureprotol.spdz.tensor.base import TensorBase
-from federatedml.secureprotol.spdz.utils.random_utils import urand_tensor
+from federatedml.secureprotol.spdz.utils.random_utils import urand_tensor, urand_ring_tensor
+
+RING_SIZE = 1 << 64
 
 
 class FixedPointEndec(object):
@@ -63,6 +65,47 @@ class FixedPointEndec(object):
         else:
             return integer_tensor // (self.base ** self.precision_fractional)
 
+    def mod(self, integer_tensor):
+        return integer_tensor % self.field
+
+
+class RingFixedPointEndec(FixedPointEndec):
+    """
+    fixed point encoding over ring Z_{2^64}, encoded tensors are uint64 arrays and
+    additions and multiplications wrap around natively, so no modulo is needed.
+    """
+
+    def __init__(self, base: int, precision_fractional: int):
+        super().__init__(RING_SIZE, base, precision_fractional)
+
+    def decode(self, integer_tensor: np.ndarray):
+        signed = np.asarray(integer_tensor, dtype=np.uint64).view(np.int64)
+        return signed / (self.base ** self.precision_fractional)
+
+    def encode(self, float_tensor, check_range=True):
+        upscaled = np.asarray(float_tensor) * self.base ** self.precision_fractional
+        if check_range:
+            assert (np.abs(upscaled) < RING_SIZE / 4).all(), (
+                f"{float_tensor} cannot be correctly embedded: choose a lower precision"
+            )
+        return upscaled.astype(np.int64).view(np.uint64)
+
+    def truncate(self, integer_tensor, idx=0):
+        """
+        probabilistic truncation of shares, each party divides its own share locally,
+        the result is off by at most 1 except with probability about |x| / 2^64
+        """
+        scale = np.uint64(self.base ** self.precision_fractional)
+        if idx == 0:
+            return np.negative(np.negative(integer_tensor) // scale)
+        else:
+            return integer_tensor // scale
+
+    def mod(self, integer_tensor):
+        if isinstance(integer_tensor, (int, np.integer)):
+            return np.uint64(int(integer_tensor) % RING_SIZE)
+        return integer_tensor
+
 
 class FixedPointTensor(TensorBase):
     __array_ufunc__ = None
@@ -107,13 +150,16 @@ class FixedPointTensor(TensorBase):
         else:
             base = kwargs['base'] if 'base' in kwargs else 10
             frac = kwargs['frac'] if 'frac' in kwargs else 4
-            encoder = FixedPointEndec(q_field, base, frac)
+            if spdz.use_ring:
+                encoder = RingFixedPointEndec(base, frac)
+            else:
+                encoder = FixedPointEndec(q_field, base, frac)
         if isinstance(source, np.ndarray):
             source = encoder.encode(source)
-            _pre = urand_tensor(q_field, source)
+            _pre = cls._urand(source, q_field)
             spdz.communicator.remote_share(share=_pre, tensor_name=tensor_name, party=spdz.other_parties[0])
             for _party in spdz.other_parties[1:]:
-                r = urand_tensor(q_field, source)
+                r = cls._urand(source, q_field)
                 spdz.communicator.remote_share(share=r - _pre, tensor_name=tensor_name, party=_party)
                 _pre = r
             share = source - _pre
@@ -123,6 +169,49 @@ class FixedPointTensor(TensorBase):
             raise ValueError(f"type={type(source)}")
         return FixedPointTensor(share, spdz.q_field, encoder, tensor_name)
 
+    @classmethod
+    def _urand(cls, tensor, q_field):
+        if cls.get_spdz().use_ring:
+            return urand_ring_tensor(tensor)
+        return urand_tensor(q_field, tensor)
+
+    @classmethod
+    def _beaver_triplets(cls, a_tensor, b_tensor, dot, name):
+        spdz = cls.get_spdz()
+        if spdz.use_ring:
+            return ring_beaver_triplets(a_tensor=a_tensor, b_tensor=b_tensor, dot=dot,
+                                        he_key_pair=(spdz.public_key, spdz.private_key),
+                                        communicator=spdz.communicator, name=name)
+        return beaver_triplets(a_tensor=a_tensor, b_tensor=b_tensor, dot=dot,
+                               q_field=spdz.q_field, he_key_pair=(spdz.public_key, spdz.private_key),
+                               communicator=spdz.communicator, name=name)
+
+    @staticmethod
+    def _triplet_key(a_shape, b_shape, einsum_expr):
+        return "einsum", einsum_expr, tuple(a_shape), tuple(b_shape)
+
+    @classmethod
+    def prepare_einsum(cls, a_shape, b_shape, einsum_expr, num=1):
+        """
+        offline phase of einsum, generates `num` beaver triplets for operands of shape a_shape and b_shape,
+        which are taken by following einsum calls with the same expression and shapes.
+        all parties should prepare the same triplets in the same order
+        """
+        spdz = cls.get_spdz()
+
+        def _dot_func(_x, _y):
+            return np.einsum(einsum_expr, _x, _y, optimize=True)
+
+        key = cls._triplet_key(a_shape, b_shape, einsum_expr)
+        for _ in range(num):
+            triplet = cls._beaver_triplets(a_tensor=np.empty(a_shape), b_tensor=np.empty(b_shape), dot=_dot_func,
+                                           name=spdz.name_service.next())
+            spdz.triplet_pool.put(key, triplet)
+
+    @classmethod
+    def prepare_dot(cls, a_shape, b_shape, num=1):
+        cls.prepare_einsum(a_shape, b_shape, "ij,ik->jk", num)
+
     def einsum(self, other: 'FixedPointTensor', einsum_expr, target_name=None):
         spdz = self.get_spdz()
         target_name = target_name or spdz.name_service.next()
@@ -130,16 +219,18 @@ class FixedPointTensor(TensorBase):
         def _dot_func(_x, _y):
             return np.einsum(einsum_expr, _x, _y, optimize=True)
 
-        a, b, c = beaver_triplets(a_tensor=self.value, b_tensor=other.value, dot=_dot_func,
-                                  q_field=self.q_field, he_key_pair=(spdz.public_key, spdz.private_key),
-                                  communicator=spdz.communicator, name=target_name)
+        triplet = spdz.triplet_pool.take(self._triplet_key(self.value.shape, other.value.shape, einsum_expr))
+        if triplet is None:
+            triplet = self._beaver_triplets(a_tensor=self.value, b_tensor=other.value, dot=_dot_func,
+                                            name=target_name)
+        a, b, c = triplet
 
         x_add_a = self._raw_add(a).rescontruct(f"{target_name}_confuse_x")
         y_add_b = other._raw_add(b).rescontruct(f"{target_name}_confuse_y")
         cross = c - _dot_func(a, y_add_b) - _dot_func(x_add_a, b)
         if spdz.party_idx == 0:
             cross += _dot_func(x_add_a, y_add_b)
-        cross = cross % self.q_field
+        cross = self.endec.mod(cross)
         cross = self.endec.truncate(cross, self.get_spdz().party_idx)
         share = self._boxed(cross)
         return share
@@ -164,8 +255,7 @@ class FixedPointTensor(TensorBase):
 
         # get shares from other parties
         for other_share in spdz.communicator.get_rescontruct_shares(name):
-            share_val += other_share
-            share_val %= self.q_field
+            share_val = self.endec.mod(share_val + other_share)
         return share_val
 
     def _boxed(self, value, tensor_name=None):
@@ -178,42 +268,48 @@ class FixedPointTensor(TensorBase):
         return self.__str__()
 
     def _raw_add(self, other):
-        z_value = (self.value + other) % self.q_field
+        z_value = self.endec.mod(self.value + other)
         return self._boxed(z_value)
 
     def _raw_sub(self, other):
-        z_value = (self.value - other) % self.q_field
+        z_value = self.endec.mod(self.value - other)
         return self._boxed(z_value)
 
     def __add__(self, other):
         if isinstance(other, FixedPointTensor):
             return self._raw_add(other.value)
-        z_value = (self.value + self.endec.encode(other / 2)) % self.q_field
+        z_value = self.endec.mod(self.value + self.endec.encode(other / 2))
         return self._boxed(z_value)
 
     def __radd__(self, other):
-        z_value = (self.endec.encode(other / 2) + self.value) % self.q_field
+        z_value = self.endec.mod(self.endec.encode(other / 2) + self.value)
         return self._boxed(z_value)
 
     def __sub__(self, other):
         if isinstance(other, FixedPointTensor):
             return self._raw_sub(other.value)
-        z_value = (self.value - self.endec.encode(other / 2)) % self.q_field
+        z_value = self.endec.mod(self.value - self.endec.encode(other / 2))
         return self._boxed(z_value)
 
     def __rsub__(self, other):
-        z_value = (self.endec.encode(other / 2) - self.value) % self.q_field
+        z_value = self.endec.mod(self.endec.encode(other / 2) - self.value)
         return self._boxed(z_value)
 
     def __mul__(self, other):
         if not isinstance(other, (int, np.integer)):
             raise NotImplementedError("__mul__ support integer only")
-        return self._boxed(self.value * other)
+        return self._boxed(self.value * self._scalar(other))
 
     def __rmul__(self, other):
         if not isinstance(other, (int, np.integer)):
             raise NotImplementedError("__rmul__ support integer only")
-        return self._boxed(self.value * other)
+        return self._boxed(self.value * self._scalar(other))
+
+    def _scalar(self, other):
+        # integers are embedded into ring before multiplying uint64 shares
+        if isinstance(self.endec, RingFixedPointEndec):
+            return self.endec.mod(other)
+        return other
 
     def __matmul__(self, other):
         return self.einsum(other, "ij,jk->ik")
@@ -78,14 +78,31 @@ class FixedPointTensor(TensorBase):
         self.endec = endec
         self.tensor_name = NamingService.get_instance().next() if tensor_name is None else tensor_name
 
+    @classmethod
+    def prepare_dot(cls, a_table, b_table, target_name):
+        """
+        offline phase of dot, generates a beaver triplet for the dot named `target_name`.
+        a_table and b_table could be any tables with the same keys and row sizes as the operands,
+        all parties should prepare the same triplets in the same order
+        """
+        spdz = cls.get_spdz()
+        triplet = beaver_triplets(a_tensor=a_table, b_tensor=b_table, dot=table_dot,
+                                  q_field=spdz.q_field, he_key_pair=(spdz.public_key, spdz.private_key),
+                                  communicator=spdz.communicator, name=f"{target_name}_prepared")
+        spdz.triplet_pool.put(("table_dot", target_name), triplet)
+
     def dot(self, other: 'FixedPointTensor', target_name=None):
         spdz = self.get_spdz()
         if target_name is None:
             target_name = NamingService.get_instance().next()
 
-        a, b, c = beaver_triplets(a_tensor=self.value, b_tensor=other.value, dot=table_dot,
-                                  q_field=self.q_field, he_key_pair=(spdz.public_key, spdz.private_key),
-                                  communicator=spdz.communicator, name=target_name)
+        # table triplets are bound to keys of operands, so they are prepared for a named dot only
+        triplet = spdz.triplet_pool.take(("table_dot", target_name))
+        if triplet is None:
+            triplet = beaver_triplets(a_tensor=self.value, b_tensor=other.value, dot=table_dot,
+                                      q_field=self.q_field, he_key_pair=(spdz.public_key, spdz.private_key),
+                                      communicator=spdz.communicator, name=target_name)
+        a, b, c = triplet
 
         x_add_a = (self + a).rescontruct(f"{target_name}_confuse_x")
         y_add_b = (other + b).rescontruct(f"{target_name}_confuse_y")
@@ -100,6 +117,8 @@ class FixedPointTensor(TensorBase):
     @classmethod
     def from_source(cls, tensor_name, source, **kwargs):
         spdz = cls.get_spdz()
+        if spdz.use_ring:
+            raise NotImplementedError("ring backend supports numpy tensors only")
         if 'encoder' in kwargs:
             encoder = kwargs['encoder']
         else:
@@ -150,6 +150,32 @@ def einsum(job_id, idx, einsum_expr, data_list):
         return x.einsum(y, einsum_expr).get()
 
 
+def ring_mat_mul(job_id, idx, data_list):
+    _, all_parties = session_init(job_id, idx)
+    with SPDZ(use_ring=True):
+        if idx == 0:
+            x = FixedPointTensor.from_source("x", data_list[0])
+            y = FixedPointTensor.from_source("y", all_parties[1])
+        else:
+            x = FixedPointTensor.from_source("x", all_parties[0])
+            y = FixedPointTensor.from_source("y", data_list[1])
+        return x.value.dtype, (x @ y).get()
+
+
+def prepared_einsum(job_id, idx, einsum_expr, data_list):
+    _, all_parties = session_init(job_id, idx)
+    with SPDZ() as spdz:
+        FixedPointTensor.prepare_einsum(data_list[0].shape, data_list[1].shape, einsum_expr, num=2)
+        if idx == 0:
+            x = FixedPointTensor.from_source("x", data_list[0])
+            y = FixedPointTensor.from_source("y", all_parties[1])
+        else:
+            x = FixedPointTensor.from_source("x", all_parties[0])
+            y = FixedPointTensor.from_source("y", data_list[1])
+        result = [x.einsum(y, einsum_expr).get(), x.einsum(y, einsum_expr).get()]
+        return result, spdz.triplet_pool.size()
+
+
 class TestSyncBase(unittest.TestCase):
 
     def setUp(self) -> None:
@@ -213,3 +239,24 @@ class TestSyncBase(unittest.TestCase):
         rec = submit(einsum, self.job_id, einsum_expr=einsum_expr, data_list=data_list)
         for a in rec:
             self.assertAlmostEqual(np.linalg.norm(np.einsum(einsum_expr, x, y) - a), 0, delta=j_dim * k_dim * EPS)
+
+    def test_prepared_einsum(self):
+        x = np.random.rand(10, 5)
+        y = np.random.rand(10, 20)
+        einsum_expr = "ij,ik->jk"
+        data_list = [x, y]
+        rec = submit(prepared_einsum, self.job_id, einsum_expr=einsum_expr, data_list=data_list)
+        for result, pool_size in rec:
+            self.assertEqual(pool_size, 0)
+            for a in result:
+                self.assertAlmostEqual(np.linalg.norm(np.einsum(einsum_expr, x, y) - a), 0, delta=10 * EPS)
+
+    def test_ring_matmul(self):
+        j_dim = 15
+        x = np.random.rand(10, j_dim) - 0.5
+        y = np.random.rand(j_dim, 20) - 0.5
+        data_list = [x, y]
+        rec = submit(ring_mat_mul, self.job_id, data_list=data_list)
+        for dtype, a in rec:
+            self.assertEqual(dtype, np.uint64)
+            self.assertAlmostEqual(np.linalg.norm((x @ y) - a), 0, delta=j_dim * EPS)
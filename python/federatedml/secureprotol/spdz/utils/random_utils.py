@@ -15,6 +15,7 @@
 #
 import array
 import functools
+import os
 import random
 
 import numpy as np
@@ -86,3 +87,13 @@ def urand_tensor(q_field, tensor, use_mix=False):
             view[i] = random.SystemRandom().randint(1, q_field)
         return arr
     raise NotImplementedError(f"type={type(tensor)}")
+
+
+def urand_ring_tensor(tensor):
+    """
+    uniform random uint64 array of the same shape as tensor, elements of ring Z_{2^64}
+    """
+    if isinstance(tensor, np.ndarray):
+        size = int(np.prod(tensor.shape))
+        return np.frombuffer(os.urandom(8 * size), dtype=np.uint64).reshape(tensor.shape).copy()
+    raise NotImplementedError(f"type={type(tensor)}")
@@ -20,6 +20,7 @@ from federatedml.secureprotol.fate_paillier import PaillierKeypair
 from federatedml.secureprotol.fate_paillier import PaillierPublicKey
 from federatedml.secureprotol.fate_paillier import PaillierPrivateKey
 from federatedml.secureprotol.fate_paillier import PaillierEncryptedNumber
+from federatedml.secureprotol.fate_paillier import PaillierCiphertextAccumulator
 
 
 class TestPaillierEncryptedNumber(unittest.TestCase):
@@ -80,7 +81,45 @@ class TestPaillierEncryptedNumber(unittest.TestCase):
             x = x + 5000 - 0.2
             de_en_x = self.private_key.decrypt(en_x)
             self.assertAlmostEqual(de_en_x, x)
-            
+
+    def test_fixed_base_obfuscator(self):
+        self.public_key.init_fixed_base_obfuscator()
+        x_li = np.random.rand(100) * 100 - 50
+        for x in x_li:
+            en_x = self.public_key.encrypt(x)
+            en_y = self.public_key.encrypt(x)
+            self.assertNotEqual(en_x.ciphertext(), en_y.ciphertext())
+            self.assertAlmostEqual(self.private_key.decrypt(en_x + en_y), 2 * x)
+
+    def test_fixed_base_obfuscator_cache(self):
+        from federatedml.secureprotol.fate_paillier import FixedBaseObfuscator
+        FixedBaseObfuscator._tables.clear()
+        obfuscators = [FixedBaseObfuscator(self.public_key, exponent_bits=64) for _ in range(4)]
+        for obfuscator in obfuscators:
+            obfuscator.generate()
+        self.assertEqual(len(FixedBaseObfuscator._tables), FixedBaseObfuscator._max_cached_tables)
+
+        # least recently used table is evicted first
+        obfuscators[2].generate()
+        obfuscators[0].generate()
+        self.assertEqual(len(FixedBaseObfuscator._tables), FixedBaseObfuscator._max_cached_tables)
+        self.assertEqual(list(FixedBaseObfuscator._tables)[0][0], obfuscators[2].hs)
+
+    def test_accumulator(self):
+        x_li = np.random.rand(100) * 100 - 50
+        accumulator = PaillierCiphertextAccumulator(self.public_key)
+        self.assertIsNone(accumulator.encrypted_sum())
+
+        for x in x_li:
+            accumulator.add(self.public_key.encrypt(x))
+
+        other = PaillierCiphertextAccumulator(self.public_key)
+        other.add(self.public_key.encrypt(1000))
+        accumulator.merge(other)
+
+        de_en_res = self.private_key.decrypt(accumulator.encrypted_sum())
+        self.assertAlmostEqual(de_en_res, x_li.sum() + 1000)
+
    
 if __name__ == '__main__': 
     unittest.main()
@@ -0,0 +1,65 @@
+#
+#  Copyright 2019 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+
+import random
+import unittest
+
+from federatedml.secureprotol import gmpy_math
+from federatedml.secureprotol.encrypt import RsaEncrypt
+
+
+class TestPowmodCrt(unittest.TestCase):
+    def setUp(self):
+        self.rsa = RsaEncrypt()
+        self.rsa.generate_key(1024)
+        self.e, self.d, self.n = self.rsa.get_key_pair()
+        self.crt_key = self.rsa.get_crt_key()
+
+    def test_crt_key(self):
+        p, q, dp, dq, q_inverse = self.crt_key
+        self.assertEqual(p * q, self.n)
+        self.assertEqual(dp, self.d % (p - 1))
+        self.assertEqual(dq, self.d % (q - 1))
+        self.assertEqual(q * q_inverse % p, 1)
+
+    def test_powmod_crt(self):
+        p, q = self.crt_key[:2]
+        values = [0, 1, 2, p, q, self.n - 1] + [random.SystemRandom().randrange(self.n) for _ in range(100)]
+        for value in values:
+            self.assertEqual(gmpy_math.powmod_crt(value, *self.crt_key), gmpy_math.powmod(value, self.d, self.n))
+
+    def test_rsa_decrypt(self):
+        for _ in range(100):
+            value = random.SystemRandom().randrange(self.n)
+            encrypted = self.rsa.encrypt(value)
+            self.assertEqual(gmpy_math.powmod_crt(encrypted, *self.crt_key), self.rsa.decrypt(encrypted))
+            self.assertEqual(gmpy_math.powmod_crt(encrypted, *self.crt_key), value)
+
+    def test_rsa_sign(self):
+        for _ in range(100):
+            hash_sid = random.SystemRandom().randrange(self.n)
+            signed = gmpy_math.powmod_crt(hash_sid, *self.crt_key)
+            self.assertEqual(signed, gmpy_math.powmod(hash_sid, self.d, self.n))
+            self.assertEqual(gmpy_math.powmod(signed, self.e, self.n), hash_sid)
+
+    def test_without_crt_key(self):
+        rsa = RsaEncrypt()
+        rsa.set_privacy_key({"d": self.d, "n": self.n})
+        self.assertIsNone(rsa.get_crt_key())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -114,6 +114,7 @@ class RsaIntersect(Intersect):
         self.e = None
         self.d = None
         self.n = None
+        self.crt_key = None
         # self.r = None
         self.transfer_variable = RsaIntersectTransferVariable()
         self.role = None
@@ -168,19 +169,28 @@ class RsaIntersect(Intersect):
         LOGGER.info(f"Generated {rsa_bit}-bit RSA key.")
         encrypt_operator = RsaEncrypt()
         encrypt_operator.generate_key(rsa_bit)
-        return encrypt_operator.get_key_pair()
+        e, d, n = encrypt_operator.get_key_pair()
+        return e, d, n, encrypt_operator.get_crt_key()
 
     def generate_protocol_key(self):
         if self.role == consts.HOST:
-            e, d, n = self.generate_rsa_key(self.rsa_params.key_length)
+            e, d, n, crt_key = self.generate_rsa_key(self.rsa_params.key_length)
         else:
-            e, d, n = [], [], []
+            e, d, n, crt_key = [], [], [], []
             for i in range(len(self.host_party_id_list)):
-                e_i, d_i, n_i = self.generate_rsa_key(self.rsa_params.key_length)
+                e_i, d_i, n_i, crt_key_i = self.generate_rsa_key(self.rsa_params.key_length)
                 e.append(e_i)
                 d.append(d_i)
                 n.append(n_i)
-        return e, d, n
+                crt_key.append(crt_key_i)
+        return e, d, n, crt_key
+
+    @staticmethod
+    def prvkey_powmod(value, rsa_d, rsa_n, crt_key=None):
+        # private key exponentiation, use CRT if the components are kept by key owner
+        if crt_key is not None:
+            return gmpy_math.powmod_crt(value, *crt_key)
+        return gmpy_math.powmod(value, rsa_d, rsa_n)
 
     @staticmethod
     def pubkey_id_process_per(hash_sid, v, random_bit, rsa_e, rsa_n, hash_operator=None, salt=''):
@@ -193,31 +203,36 @@ class RsaIntersect(Intersect):
             return processed_id, (v[0], r)
 
     @staticmethod
-    def prvkey_id_process(hash_sid, v, rsa_d, rsa_n, final_hash_operator, salt, first_hash_operator=None):
+    def prvkey_id_process(hash_sid, v, rsa_d, rsa_n, final_hash_operator, salt, first_hash_operator=None,
+                          crt_key=None):
         if first_hash_operator:
-            processed_id = Intersect.hash(gmpy_math.powmod(int(Intersect.hash(hash_sid, first_hash_operator, salt), 16),
-                                                           rsa_d,
-                                                           rsa_n),
+            processed_id = Intersect.hash(RsaIntersect.prvkey_powmod(int(Intersect.hash(hash_sid,
+                                                                                        first_hash_operator,
+                                                                                        salt), 16),
+                                                                     rsa_d,
+                                                                     rsa_n,
+                                                                     crt_key),
                                           final_hash_operator,
                                           salt)
             return processed_id, hash_sid
         else:
-            processed_id = Intersect.hash(gmpy_math.powmod(hash_sid, rsa_d, rsa_n),
+            processed_id = Intersect.hash(RsaIntersect.prvkey_powmod(hash_sid, rsa_d, rsa_n, crt_key),
                                           final_hash_operator,
                                           salt)
             return processed_id, v[0]
 
-    def cal_prvkey_ids_process_pair(self, data_instances, d, n, first_hash_operator=None):
+    def cal_prvkey_ids_process_pair(self, data_instances, d, n, first_hash_operator=None, crt_key=None):
         return data_instances.map(
             lambda k, v: self.prvkey_id_process(k, v, d, n,
                                                 self.final_hash_operator,
                                                 self.rsa_params.salt,
-                                                first_hash_operator)
+                                                first_hash_operator,
+                                                crt_key)
         )
 
     @staticmethod
-    def sign_id(hash_sid, rsa_d, rsa_n):
-        return gmpy_math.powmod(hash_sid, rsa_d, rsa_n)
+    def sign_id(hash_sid, rsa_d, rsa_n, crt_key=None):
+        return RsaIntersect.prvkey_powmod(hash_sid, rsa_d, rsa_n, crt_key)
 
     @staticmethod
     def map_raw_id_to_encrypt_id(raw_id_data, encrypt_id_data):
@@ -456,16 +456,25 @@ class MultivariateStatisticalSummary(object):
         for col_name in cols_dict:
             summary_dict[col_name] = QuantileSummaries(abnormal_list=abnormal_list, error=error)
 
+        def _insert_block(block):
+            features = np.array(block)
+            if features.dtype.kind not in "biuf":
+                features = np.empty((len(block), len(block[0])), dtype=object)
+                features[:] = block
+            for col_name, col_index in cols_dict.items():
+                summary_dict[col_name].insert_batch(features[:, col_index])
+
+        block = []
         for k, instances in data_instances:
             if isinstance(instances, Instance):
-                features = instances.features
+                block.append(instances.features)
             else:
-                features = instances
-
-            for col_name, col_index in cols_dict.items():
-                value = features[col_index]
-                summary_obj = summary_dict[col_name]
-                summary_obj.insert(value)
+                block.append(instances)
+            if len(block) >= consts.DEFAULT_HEAD_SIZE:
+                _insert_block(block)
+                block = []
+        if block:
+            _insert_block(block)
 
         return summary_dict
 
@@ -23,6 +23,7 @@
 
 import copy
 import functools
+import warnings
 
 import numpy as np
 
@@ -131,10 +132,19 @@ class DenseFeatureTransformer(object):
             data_shape = data_overview.get_data_shape(input_data)
             if not data_shape or self.label_idx >= data_shape:
                 raise ValueError("input data's value is empty, it does not contain a label")
+        else:
+            data_shape = None
+
+        if not self.missing_fill and not self.outlier_replace:
+            # nothing is fitted on raw features, so lines are parsed to instances in one pass per partition
+            data_instance = self.gen_data_instance_by_partition(input_data, data_shape)
+            if mode == "transform":
+                data_instance = data_overview.header_alignment(data_instance, fit_header)
+            return data_instance
 
+        if self.label_idx is not None:
             input_data_features = input_data.mapValues(
-                lambda value: [] if data_shape == 1 else value.split(self.delimitor, -1)[:self.label_idx] + value.split(
-                    self.delimitor, -1)[self.label_idx + 1:])
+                lambda value: [] if data_shape == 1 else self.split_label(value.split(self.delimitor, -1))[0])
 
             input_data_labels = input_data.mapValues(lambda value: value.split(self.delimitor, -1)[self.label_idx])
 
@@ -151,6 +161,96 @@ class DenseFeatureTransformer(object):
 
         return data_instance
 
+    def split_label(self, values):
+        return values[: self.label_idx] + values[self.label_idx + 1:], values[self.label_idx]
+
+    @assert_io_num_rows_equal
+    def gen_data_instance_by_partition(self, input_data, data_shape=None):
+        to_instances = functools.partial(self.partition_to_instances, data_shape=data_shape)
+        data_instance = input_data.mapPartitions(to_instances, use_previous_behavior=False,
+                                                 preserves_partitioning=True)
+        set_schema(data_instance, self.get_schema())
+        return data_instance
+
+    def partition_to_instances(self, kvs, data_shape=None):
+        keys = []
+        values = []
+        for key, value in kvs:
+            keys.append(key)
+            values.append(value)
+        if not keys:
+            return []
+
+        if self.output_format == "dense" and self.header and not self.exclusive_data_type_fid_map and \
+                self.data_type in ["int", "int64", "long", "float", "float64", "double"] and data_shape != 1:
+            features, labels = self.parse_dense_block(values)
+            return [(key, Instance(inst_id=None, features=features[i], label=None if labels is None else labels[i]))
+                    for i, key in enumerate(keys)]
+
+        instances = []
+        for key, value in zip(keys, values):
+            if self.label_idx is not None:
+                features, label = self.split_label(value.split(self.delimitor, -1))
+                instances.append((key, self.to_instance([] if data_shape == 1 else features, label)))
+            else:
+                instances.append((key, self.to_instance(value.split(self.delimitor, -1) if self.header else [])))
+        return instances
+
+    def parse_dense_block(self, values):
+        """
+        parse lines of one partition into a 2-D array of features, and labels if with label
+        """
+        column_shape = len(self.header) + (0 if self.label_idx is None else 1)
+        for value in values:
+            if value.count(self.delimitor) != column_shape - 1:
+                raise ValueError("features shape {} not equal to header shape {}".format(
+                    len(value.split(self.delimitor, -1)) - (0 if self.label_idx is None else 1), len(self.header)))
+
+        labels = None
+        rows = None
+        if self.label_idx is not None:
+            labels = [value.split(self.delimitor, self.label_idx + 1)[self.label_idx] for value in values]
+            if self.label_type == 'int':
+                labels = [int(label) for label in labels]
+            elif self.label_type in ["float", "float64"]:
+                labels = [float(label) for label in labels]
+            else:
+                # labels which are not numbers are removed before features are converted
+                rows = [self.split_label(value.split(self.delimitor, -1))[0] for value in values]
+                column_shape = len(self.header)
+
+        label_in_block = False
+        block = None
+        if self.missing_impute is None and self.data_type in ["float", "float64", "double"]:
+            # default missing values are not numbers, a block without any of them is parsed by numpy at once,
+            # numeric labels are parsed together with features and removed afterwards
+            label_in_block = self.label_idx is not None and rows is None
+            text = self.delimitor.join(values) if rows is None else \
+                self.delimitor.join(self.delimitor.join(row) for row in rows)
+            try:
+                with warnings.catch_warnings():
+                    # unparsable text stops parsing with a warning or an error depending on numpy version
+                    warnings.simplefilter("ignore")
+                    block = np.fromstring(text, dtype=np.float64, sep=self.delimitor)
+            except ValueError:
+                block = None
+            if block is not None and block.size == len(values) * column_shape:
+                block = block.reshape(len(values), column_shape)
+            else:
+                block = None
+        if block is None:
+            if rows is None:
+                rows = [value.split(self.delimitor, -1) for value in values]
+                if self.label_idx is not None:
+                    # labels may not be convertible to data_type, they are removed before features are converted
+                    rows = [self.split_label(row)[0] for row in rows]
+            label_in_block = False
+            missing_values = set(self.missing_impute if self.missing_impute is not None else ['', 'NULL', 'null', "NA"])
+            block = np.asarray([[np.nan if x in missing_values else x for x in row] for row in rows], dtype=self.data_type)
+        if label_in_block:
+            block = np.delete(block, self.label_idx, axis=1)
+        return block, labels
+
     def fit(self, input_data, input_data_features, input_data_labels):
         schema = self.get_schema()
         set_schema(input_data_features, schema)
@@ -0,0 +1,108 @@
+#
+#  Copyright 2019 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+
+import random
+import unittest
+
+import numpy as np
+from fate_arch.session import computing_session as session
+
+from federatedml.param.data_transform_param import DataTransformParam
+from federatedml.util.data_transform import DenseFeatureTransformer
+
+
+class TestDenseFeatureTransformer(unittest.TestCase):
+    def setUp(self):
+        session.init("test_data_transform_" + str(random.random()))
+        self.data = [(str(i), ",".join([str(i % 2)] + [str(i * j * 0.5) for j in range(5)])) for i in range(100)]
+        self.data.append(("100", "1,NA,,1,2,null"))
+        self.table = session.parallelize(self.data, include_key=True, partition=4)
+        self.table.schema = {"header": "y,x0,x1,x2,x3,x4", "sid": "id"}
+
+    def test_dense_with_label(self):
+        transformer = DenseFeatureTransformer(DataTransformParam(with_label=True, label_name="y"))
+        result = dict(transformer.read_data(self.table).collect())
+        self.assertEqual(len(result), len(self.data))
+        self.assertEqual(transformer.header, ["x0", "x1", "x2", "x3", "x4"])
+        for key, value in self.data[:-1]:
+            values = value.split(",")
+            inst = result[key]
+            self.assertEqual(inst.label, int(values[0]))
+            self.assertEqual(inst.features.dtype, np.float64)
+            self.assertTrue(np.array_equal(inst.features, np.array(values[1:], dtype=float)))
+
+        features = result["100"].features
+        self.assertTrue(np.isnan(features[[0, 1, 4]]).all())
+        self.assertTrue(np.array_equal(features[[2, 3]], [1, 2]))
+
+    def test_dense_with_str_label(self):
+        data = [(str(i), ",".join([str(i * 0.5), "yes" if i % 2 else "no", str(i)])) for i in range(20)]
+        data.append(("20", "NA,yes,1"))
+        table = session.parallelize(data, include_key=True, partition=4)
+        table.schema = {"header": "x0,y,x1", "sid": "id"}
+        transformer = DenseFeatureTransformer(DataTransformParam(with_label=True, label_name="y", label_type="str"))
+        result = dict(transformer.read_data(table).collect())
+        self.assertEqual(transformer.header, ["x0", "x1"])
+        for key, value in data[:-1]:
+            x0, label, x1 = value.split(",")
+            self.assertEqual(result[key].label, label)
+            self.assertTrue(np.array_equal(result[key].features, [float(x0), float(x1)]))
+        self.assertEqual(result["20"].label, "yes")
+        self.assertTrue(np.isnan(result["20"].features[0]))
+        self.assertEqual(result["20"].features[1], 1)
+
+    def test_dense_with_float_label_int_features(self):
+        data = [(str(i), ",".join([str(i * 0.5), str(i), str(i * 2)])) for i in range(20)]
+        table = session.parallelize(data, include_key=True, partition=4)
+        table.schema = {"header": "y,x0,x1", "sid": "id"}
+        transformer = DenseFeatureTransformer(DataTransformParam(with_label=True, label_name="y",
+                                                                 label_type="float", data_type="int"))
+        result = dict(transformer.read_data(table).collect())
+        for key, value in data:
+            label, x0, x1 = value.split(",")
+            self.assertEqual(result[key].label, float(label))
+            self.assertTrue(np.array_equal(result[key].features, [int(x0), int(x1)]))
+
+    def test_dense_without_label(self):
+        transformer = DenseFeatureTransformer(DataTransformParam())
+        result = dict(transformer.read_data(self.table).collect())
+        for key, value in self.data[:-1]:
+            inst = result[key]
+            self.assertIsNone(inst.label)
+            self.assertTrue(np.array_equal(inst.features, np.array(value.split(","), dtype=float)))
+
+    def test_sparse_output_format(self):
+        transformer = DenseFeatureTransformer(DataTransformParam(with_label=True, label_name="y",
+                                                                 output_format="sparse"))
+        result = dict(transformer.read_data(self.table).collect())
+        features = result["3"].features
+        self.assertEqual(features.shape, 5)
+        self.assertEqual(len(features.sparse_vec), 4)
+        self.assertEqual(features.get_data(2), 3.0)
+
+    def test_features_shape_mismatch(self):
+        table = session.parallelize([("a", "1,2,3")], include_key=True, partition=1)
+        table.schema = {"header": "y,x0", "sid": "id"}
+        transformer = DenseFeatureTransformer(DataTransformParam(with_label=True, label_name="y"))
+        with self.assertRaises(Exception):
+            transformer.read_data(table).collect()
+
+    def tearDown(self):
+        session.stop()
+
+
+if __name__ == '__main__':
+    unittest.main()